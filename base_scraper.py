@@ -4,13 +4,27 @@ Playwright-basierte Scraping-Engine mit Anti-Detection und Rate-Limiting
 """
 
 import asyncio
+import copy
 import time
 import random
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from datetime import datetime
-from playwright.async_api import async_playwright, Page, Browser
+from typing import Dict, List, Optional, Any, Tuple, AsyncIterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+from browser_profile import BrowserProfile
+from memory_watchdog import MemoryWatchdog
+from tracing import TRACER, traced
+from metrics import (
+    PAGES_FETCHED, RESPONSE_BYTES, PAGE_LOAD_SECONDS, RETRIES, BROWSER_RESTARTS, CONSENT_CLICKS,
+    EXTRACTION_FAILURES, TABLE_ROWS
+)
+from extraction import (
+    TABLE_ROWS_SCRIPT, TABLE_RECORDS_SCRIPT, TABLES_SCRIPT, ALL_PRESENT_SCRIPT, TableRecords, js_args,
+    extract_tables_from_html, extract_links_from_html
+)
 import logging
 
 logging.basicConfig(
@@ -33,8 +47,12 @@ class RateLimiter:
         self.requests_per_minute = requests_per_minute
         self.min_delay = 60 / requests_per_minute
         self.last_request_time = 0
+        self.blocked_until = 0
 
     async def wait(self):
+        if self.blocked_until > time.time():
+            await asyncio.sleep(self.blocked_until - time.time())
+
         current_time = time.time()
         time_since_last = current_time - self.last_request_time
 
@@ -44,46 +62,278 @@ class RateLimiter:
 
         self.last_request_time = time.time()
 
+    async def acquire(self, url: str):
+        """Reserve a request slot for url (the fixed limiter only spaces requests)."""
+        await self.wait()
+
+    def concurrency_limit(self, url: str) -> int:
+        """Requests (and match pipelines) allowed in parallel for url's host right now."""
+        return 1
+
+    async def release(self, url: str, status: Optional[int] = None, latency: Optional[float] = None,
+                      retry_after: Optional[str] = None):
+        """Report the outcome of a request started with acquire()."""
+        if status in (429, 503):
+            self.blocked_until = time.time() + self.min_delay
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current limits per host for instrumentation output."""
+        return {}
+
+    def describe(self) -> str:
+        return ", ".join(
+            f"{host}: concurrency={state['concurrency']} rate={state['rate_per_min']}/min"
+            for host, state in self.snapshot().items()
+        ) or "fixed rate limiter"
+
+class ThrottledError(Exception):
+    """Server answered with 429/503 - retry after the limiter backs off, no browser restart needed."""
+    pass
+
+class PageLostError(Exception):
+    """A worker page (or its whole context) closed or crashed - the page's owner replaces it and retries."""
+    pass
+
+def page_lost(page: Optional[Page], error: Exception) -> bool:
+    """True if error came from a page that is gone (closed, crashed, context shut down) rather than from the site."""
+    message = str(error)
+    return page is not None and (page.is_closed() or 'crash' in message.lower() or 'has been closed' in message)
+
+@dataclass
+class HostBudget:
+    rate: float                      # requests per second
+    concurrency: float
+    in_flight: int = 0
+    last_request: float = 0.0
+    blocked_until: float = 0.0
+    latency_ewma: Optional[float] = None
+    successes: int = 0
+    throttled: int = 0
+    errors: int = 0
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self.concurrency))
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    AIMD-Regler pro Host: Rate und Parallelität steigen additiv bei schnellen Antworten
+    und werden bei HTTP 429/503, Timeouts oder hoher Latenz multiplikativ reduziert.
+    Retry-After Header blockieren den Host bis zum angegebenen Zeitpunkt.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, requests_per_minute: int = 10, max_requests_per_minute: int = 60,
+                 initial_concurrency: int = 1, max_concurrency: int = 4,
+                 rate_increase: float = 1.0, concurrency_increase: float = 0.25,
+                 decrease_factor: float = 0.5, latency_threshold: float = 15.0):
+        super().__init__(requests_per_minute)
+        self.initial_rate = requests_per_minute / 60
+        self.max_rate = max_requests_per_minute / 60
+        self.min_rate = min(self.initial_rate, 1 / 60)
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.rate_increase = rate_increase / 60  # additive step in requests/minute
+        self.concurrency_increase = concurrency_increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.hosts: Dict[str, HostBudget] = {}
+
+    def _budget(self, url: str) -> HostBudget:
+        host = urlparse(url).netloc or url
+        if host not in self.hosts:
+            self.hosts[host] = HostBudget(rate=self.initial_rate, concurrency=self.initial_concurrency)
+        return self.hosts[host]
+
+    async def wait(self):
+        # Legacy callers without URL share one anonymous budget
+        await self.acquire("")
+        await self.release("", status=200)
+
+    async def acquire(self, url: str):
+        budget = self._budget(url)
+        async with budget.condition:
+            await budget.condition.wait_for(lambda: budget.in_flight < budget.limit)
+            budget.in_flight += 1
+
+        try:
+            while True:
+                now = time.monotonic()
+                ready_at = max(budget.blocked_until, budget.last_request + 1 / budget.rate)
+                if now >= ready_at:
+                    break
+                await asyncio.sleep(ready_at - now)
+        except BaseException:
+            # Cancelled while pacing: the caller never gets the slot, so it can't release it either
+            async with budget.condition:
+                budget.in_flight = max(0, budget.in_flight - 1)
+                budget.condition.notify_all()
+            raise
+        budget.last_request = time.monotonic()
+
+    def concurrency_limit(self, url: str) -> int:
+        return self._budget(url).limit
+
+    async def release(self, url: str, status: Optional[int] = None, latency: Optional[float] = None,
+                      retry_after: Optional[str] = None):
+        budget = self._budget(url)
+        self._record(budget, status, latency, retry_after)
+        async with budget.condition:
+            budget.in_flight = max(0, budget.in_flight - 1)
+            budget.condition.notify_all()
+
+    def _record(self, budget: HostBudget, status: Optional[int], latency: Optional[float], retry_after: Optional[str]):
+        if latency is not None:
+            budget.latency_ewma = latency if budget.latency_ewma is None else 0.8 * budget.latency_ewma + 0.2 * latency
+
+        if status in self.THROTTLE_STATUSES:
+            budget.throttled += 1
+            self._decrease(budget)
+            delay = self._parse_retry_after(retry_after)
+            if delay is None:
+                delay = 1 / budget.rate
+            budget.blocked_until = max(budget.blocked_until, time.monotonic() + delay)
+            logger.warning(f"Throttled (HTTP {status}), backing off {delay:.1f}s: {self._format(budget)}")
+        elif status is None or status >= 500:
+            budget.errors += 1
+            self._decrease(budget)
+        elif latency is not None and latency > self.latency_threshold:
+            # Slow but successful answer - server is getting busy, ease off
+            budget.successes += 1
+            self._decrease(budget)
+        else:
+            budget.successes += 1
+            budget.rate = min(self.max_rate, budget.rate + self.rate_increase)
+            budget.concurrency = min(self.max_concurrency, budget.concurrency + self.concurrency_increase / budget.concurrency)
+
+    def _decrease(self, budget: HostBudget):
+        budget.rate = max(self.min_rate, budget.rate * self.decrease_factor)
+        budget.concurrency = max(1.0, budget.concurrency * self.decrease_factor)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _format(budget: HostBudget) -> str:
+        return f"concurrency={budget.limit} rate={budget.rate * 60:.1f}/min"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        return {
+            host: {
+                "concurrency": budget.limit,
+                "rate_per_min": round(budget.rate * 60, 1),
+                "in_flight": budget.in_flight,
+                "latency_ewma": round(budget.latency_ewma, 2) if budget.latency_ewma is not None else None,
+                "blocked_for": round(max(0.0, budget.blocked_until - now), 1),
+                "successes": budget.successes,
+                "throttled": budget.throttled,
+                "errors": budget.errors
+            }
+            for host, budget in self.hosts.items() if host
+        }
+
+def _named_selectors(selectors) -> Dict[str, str]:
+    return selectors if isinstance(selectors, dict) else {selector: selector for selector in selectors}
+
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor'
+]
+
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+async def launch_browser(playwright, headless: bool = True) -> Browser:
+    """Chromium with the anti-detection flags used by every scraper."""
+    return await playwright.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
 class BaseScraper(ABC):
     def __init__(self, rate_limiter: RateLimiter, headless: bool = True, max_retries: int = 3):
         self.rate_limiter = rate_limiter
         self.headless = headless
         self.max_retries = max_retries
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.playwright = None
+        self.shared_browser: Optional[Browser] = None  # set via use_shared_browser()
+        self.storage_state: Optional[Dict[str, Any]] = None  # cookies/localStorage for new contexts
+        self.profile: Optional[BrowserProfile] = None  # set via use_persistent_profile()
+        self.memory_watchdog: Optional[MemoryWatchdog] = None  # set via use_memory_watchdog()
+        self.current_url: Optional[str] = None  # URL currently shown in self.page
+        self.snapshots: Dict[str, 'PageSnapshot'] = {}
+        self.team_page_rest: Optional[Tuple[str, Dict[int, ScrapeResult]]] = None  # see team_page_part()
         self.processed_teams = set()  # Track which teams we've successfully processed
 
+    def use_shared_browser(self, browser: Browser):
+        """Run inside an existing browser: initialize/close only create and drop this scraper's context."""
+        self.shared_browser = browser
+
+    def use_persistent_profile(self, profile: BrowserProfile):
+        """Launch with an on-disk profile so cookies and the HTTP cache survive restarts and runs."""
+        self.profile = profile
+
+    def use_memory_watchdog(self, watchdog: MemoryWatchdog):
+        """Sample memory at phase boundaries and recycle the browser context when it grows past the limit."""
+        self.memory_watchdog = watchdog
+
     async def initialize_browser(self):
-        if not self.playwright:
+        if self.shared_browser:
+            # Orchestrated run: the browser belongs to the caller, this scraper only owns its context
+            self.browser = self.shared_browser
+        elif not self.playwright:
             self.playwright = await async_playwright().start()
 
-        self.browser = await self.playwright.chromium.launch(
-            headless=self.headless,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor'
-            ]
-        )
+        if self.profile and not self.shared_browser:
+            # Persistent context: cached static assets are revalidated instead of downloaded again
+            self.profile.prepare()
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.profile.path,
+                headless=self.headless,
+                args=BROWSER_ARGS + self.profile.launch_args(),
+                **CONTEXT_OPTIONS
+            )
+            self.browser = self.context.browser
+        else:
+            if not self.shared_browser:
+                self.browser = await launch_browser(self.playwright, self.headless)
+            self.context = await self.browser.new_context(storage_state=self.storage_state, **CONTEXT_OPTIONS)
+
+        self.page = await self.new_page()
 
-        context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        logger.info(f"{self.__class__.__name__}: Browser initialized")
 
-        self.page = await context.new_page()
-        self.page.set_default_timeout(45000)  # Increased timeout to 45 seconds
+    async def new_page(self) -> Page:
+        """Open an additional page in the shared context (shares cookies/consent with self.page)."""
+        page = await self.context.new_page()
+        page.set_default_timeout(45000)  # Increased timeout to 45 seconds
 
-        await self.page.add_init_script("""
+        await page.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined
             });
         """)
-
-        logger.info(f"{self.__class__.__name__}: Browser initialized")
+        return page
 
     async def close_browser(self):
         try:
@@ -94,47 +344,128 @@ class BaseScraper(ABC):
             logger.warning(f"Error closing page: {e}")
 
         try:
-            if self.browser:
+            if self.shared_browser:
+                if self.context:
+                    # Keep cookies/consent so the next context on the shared browser starts warm
+                    self.storage_state = await self.context.storage_state()
+                    await self.context.close()
+            elif self.profile and self.context:
+                # Closing the persistent context shuts Chromium down and flushes the disk cache
+                await self.context.close()
+            elif self.browser:
                 await self.browser.close()
-                self.browser = None
+            self.browser = None
+            self.context = None
+            self.current_url = None
         except Exception as e:
             logger.warning(f"Error closing browser: {e}")
 
         logger.info(f"{self.__class__.__name__}: Browser closed")
 
+    @traced("restart_browser", cat="browser")
     async def restart_browser(self):
         """Restart browser when timeouts or other issues occur."""
         logger.info(f"{self.__class__.__name__}: Restarting browser due to timeout...")
+        BROWSER_RESTARTS.inc(scraper=self.__class__.__name__)
         await self.close_browser()
         await asyncio.sleep(2)  # Brief pause before restart
         await self.initialize_browser()
         logger.info(f"{self.__class__.__name__}: Browser restarted successfully")
 
-    async def navigate_to_url(self, url: str, wait_for_selector: Optional[str] = None, retry_count: int = 0):
-        await self.rate_limiter.wait()
+    async def memory_checkpoint(self, phase: str, **info) -> bool:
+        """Memory sample at a phase boundary; True if the watchdog asks for a context recycle."""
+        if not self.memory_watchdog:
+            return False
+        # The tracemalloc snapshot takes a while on a large heap - keep it off the event loop
+        sample = await asyncio.to_thread(self.memory_watchdog.sample, f"{self.__class__.__name__}:{phase}", **info)
+        if sample.get('action', '').startswith('gc'):
+            # Kept page HTML is the largest thing the scraper itself holds on to
+            self.snapshots.clear()
+        return self.memory_watchdog.needs_recycle(sample)
+
+    @traced("recycle_context", cat="browser")
+    async def recycle_context(self):
+        """Close and reopen the browser context (own browser: the whole browser) to hand its memory back; cookies carry over."""
+        logger.info(f"{self.__class__.__name__}: Recycling browser context to release memory")
+        if self.context and not self.profile:
+            self.storage_state = await self.context.storage_state()
+        await self.close_browser()
+        await self.initialize_browser()
+        if self.memory_watchdog:
+            self.memory_watchdog.record_recycle(self.__class__.__name__)
+            await asyncio.to_thread(self.memory_watchdog.sample, f"{self.__class__.__name__}:after_recycle")
+
+    @traced("navigate_to_url", cat="browser", arg_names=("url", "retry_count"))
+    async def navigate_to_url(self, url: str, wait_for_selector: Optional[str] = None, retry_count: int = 0,
+                              page: Optional[Page] = None):
+        """Load url in page (default self.page); returns the document response (None for same-document loads)."""
+        page = page or self.page
+        if page is self.page:
+            self.current_url = None
+        await self.rate_limiter.acquire(url)
 
         try:
             logger.info(f"Navigating to: {url}")
-            await self.page.goto(url, wait_until='domcontentloaded', timeout=60000)
+            status = None
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                if response:
+                    status = response.status
+                    retry_after = response.headers.get('retry-after')
+            finally:
+                elapsed = time.monotonic() - started
+                await self.rate_limiter.release(url, status, elapsed, retry_after)
+                await self._record_fetch(url, response if status is not None else None, elapsed)
+
+            if status in AdaptiveRateLimiter.THROTTLE_STATUSES:
+                raise ThrottledError(f"HTTP {status} for {url}")
 
             # Handle cookie consent popups that block content
-            await self._handle_cookie_consent()
+            await self._handle_cookie_consent(page)
 
             if wait_for_selector:
-                await self.page.wait_for_selector(wait_for_selector, timeout=90000)  # 90s timeout for slow pages
+                await page.wait_for_selector(wait_for_selector, timeout=90000)  # 90s timeout for slow pages
 
             await asyncio.sleep(random.uniform(1, 2))
+            if page is self.page:
+                self.current_url = url
+            return response
         except Exception as e:
+            if page is not self.page and page_lost(page, e):
+                # Retrying on a dead worker page is pointless, and restarting the shared context
+                # would kill the other workers' pages - the worker replaces its own page
+                raise PageLostError(f"Page lost while loading {url}: {e}") from e
             if retry_count < self.max_retries:
                 logger.warning(f"Navigation failed (attempt {retry_count + 1}/{self.max_retries + 1}): {e}")
-                await self.restart_browser()
-                return await self.navigate_to_url(url, wait_for_selector, retry_count + 1)
+                RETRIES.inc(scraper=self.__class__.__name__, operation="navigate")
+                # Throttling is handled by the limiter's back-off; worker pages are retried as they are
+                if not isinstance(e, ThrottledError) and page is self.page:
+                    await self.restart_browser()
+                    page = self.page
+                return await self.navigate_to_url(url, wait_for_selector, retry_count + 1, page)
             else:
                 logger.error(f"Navigation failed after {self.max_retries + 1} attempts: {e}")
                 raise
 
-    async def _handle_cookie_consent(self):
+    async def _record_fetch(self, url: str, response, elapsed: float):
+        """Page, byte and load-time metrics of one navigation (response None = failed before a response)."""
+        scraper = self.__class__.__name__
+        host = urlparse(url).netloc
+        PAGES_FETCHED.inc(scraper=scraper, host=host, status=response.status if response else "error")
+        PAGE_LOAD_SECONDS.observe(elapsed, host=host)
+        if response:
+            try:
+                sizes = await response.request.sizes()
+                RESPONSE_BYTES.inc(sizes['responseBodySize'] + sizes['responseHeadersSize'], scraper=scraper, host=host)
+            except Exception:
+                pass  # Sizes are unavailable for cached/aborted responses
+
+    @traced("cookie_consent", cat="browser")
+    async def _handle_cookie_consent(self, page: Optional[Page] = None):
         """Handle various cookie consent popups that might block page content."""
+        page = page or self.page
         try:
             # Wait a moment for any popups to appear
             await asyncio.sleep(1)
@@ -158,10 +489,11 @@ class BaseScraper(ABC):
             for selector in consent_selectors:
                 try:
                     # Look for popup button (don't wait long)
-                    button = await self.page.wait_for_selector(selector, timeout=2000)
+                    button = await page.wait_for_selector(selector, timeout=2000)
                     if button:
                         logger.info(f"Found cookie consent button: {selector}")
                         await button.click()
+                        CONSENT_CLICKS.inc(scraper=self.__class__.__name__, action="accept")
                         logger.info("✅ Clicked cookie consent button")
                         await asyncio.sleep(1)  # Wait for popup to dismiss
                         return
@@ -179,10 +511,11 @@ class BaseScraper(ABC):
 
             for selector in close_selectors:
                 try:
-                    button = await self.page.wait_for_selector(selector, timeout=1000)
+                    button = await page.wait_for_selector(selector, timeout=1000)
                     if button:
                         logger.info(f"Found close button: {selector}")
                         await button.click()
+                        CONSENT_CLICKS.inc(scraper=self.__class__.__name__, action="close")
                         await asyncio.sleep(1)
                         return
                 except:
@@ -193,42 +526,107 @@ class BaseScraper(ABC):
             logger.debug(f"Cookie consent handling finished: {e}")
             pass
 
-    async def extract_table_data(self, table_selector: str) -> List[Dict[str, Any]]:
+    async def traced_evaluate(self, page: Page, name: str, script: str, arg: Any = None):
+        """page.evaluate inside an "evaluate:<name>" trace span (plain evaluate when tracing is off)."""
+        with TRACER.span(f"evaluate:{name}", cat="evaluate"):
+            return await page.evaluate(script, arg)
+
+    async def extract_table_data(self, table_selector: str, payload: str = "rows", typed: bool = False):
+        """
+        Extract a data-stat table. Cells are the trimmed text ("" when blank); typed=True parses
+        numbers in the browser instead (1,234 / 45.2% / −3 -> float, blank -> None).
+
+        payload="rows" returns a list of row dicts, "records" a TableRecords (header + value
+        arrays, lazy dict view per row) and "columns" a dict of column lists. The compact
+        modes send every data-stat key only once over CDP, which matters for large tables.
+        """
         try:
             await self.page.wait_for_selector(table_selector, timeout=10000)
         except Exception as e:
             logger.warning(f"Table {table_selector} not found: {e}")
-            return []
+            EXTRACTION_FAILURES.inc(scraper=self.__class__.__name__, operation="missing_table")
+            return [] if payload == "rows" else TableRecords([], []) if payload == "records" else {}
+
+        # Cells are read (and with typed=True parsed) in the browser by the shared runtime (extraction.py)
+        if payload == "rows":
+            with TRACER.span("evaluate:table_rows", cat="evaluate", selector=table_selector):
+                table_data = await self.page.evaluate(TABLE_ROWS_SCRIPT, js_args(typed, selector=table_selector))
+            logger.info(f"Extracted {len(table_data)} rows from {table_selector}")
+            TABLE_ROWS.observe(len(table_data), scraper=self.__class__.__name__)
+            return table_data
+
+        with TRACER.span("evaluate:table_records", cat="evaluate", selector=table_selector):
+            records = await self.page.evaluate(TABLE_RECORDS_SCRIPT, js_args(typed, selector=table_selector))
+        table_data = TableRecords(records['header'], records['rows'], records.get('missing'))
+        TABLE_ROWS.observe(len(table_data), scraper=self.__class__.__name__)
+        logger.info(f"Extracted {len(table_data)} rows x {len(table_data.header)} columns from {table_selector}")
+        return table_data.to_columns() if payload == "columns" else table_data
+
+    async def extract_tables(self, selectors, timeout: int = 10000, payload: str = "rows",
+                             typed: bool = False) -> Dict[str, Any]:
+        """
+        Extract several tables of the loaded page in one evaluate call (cell types as in extract_table_data).
+
+        selectors is a list of CSS selectors or a dict name -> selector; the result uses the
+        same keys. All tables share one wait of at most `timeout` ms; tables still missing
+        after that come back empty instead of costing a separate timeout each.
+        """
+        named = _named_selectors(selectors)
+        selector_list = list(dict.fromkeys(named.values()))
 
-        table_data = await self.page.evaluate(f"""
-            () => {{
-                const table = document.querySelector('{table_selector}');
-                if (!table) return [];
-
-                const headers = Array.from(table.querySelectorAll('thead th')).map(th => {{
-                    return th.getAttribute('data-stat') || th.textContent.trim();
-                }});
-
-                const rows = Array.from(table.querySelectorAll('tbody tr')).map(row => {{
-                    const cells = Array.from(row.querySelectorAll('td, th'));
-                    const rowData = {{}};
-
-                    cells.forEach((cell) => {{
-                        const stat = cell.getAttribute('data-stat');
-                        if (stat) {{
-                            rowData[stat] = cell.textContent.trim();
-                        }}
-                    }});
-
-                    return rowData;
-                }});
-
-                return rows.filter(row => Object.keys(row).length > 0);
-            }}
-        """)
+        try:
+            with TRACER.span("wait_for_tables", cat="browser", tables=len(selector_list)):
+                await self.page.wait_for_function(ALL_PRESENT_SCRIPT, arg=selector_list, timeout=timeout)
+        except Exception:
+            # Partial availability: extract whatever is there
+            pass
 
-        logger.info(f"Extracted {len(table_data)} rows from {table_selector}")
-        return table_data
+        with TRACER.span("evaluate:tables", cat="evaluate", tables=len(selector_list)):
+            raw = await self.page.evaluate(
+                TABLES_SCRIPT,
+                js_args(typed, selectors=selector_list, compact=payload != "rows")
+            )
+        return self._shape_tables(named, raw, payload)
+
+    def _shape_tables(self, named: Dict[str, str], raw: Dict[str, Any], payload: str) -> Dict[str, Any]:
+        """Turn a TABLES_SCRIPT result (live or offline) into the requested payload per name."""
+        tables = {}
+        missing = []
+        scraper = self.__class__.__name__
+        for name, selector in named.items():
+            data = raw.get(selector)
+            if data is None:
+                missing.append(selector)
+                EXTRACTION_FAILURES.inc(scraper=scraper, operation="missing_table")
+            else:
+                TABLE_ROWS.observe(len(data if payload == "rows" else data['rows']), scraper=scraper)
+            if payload == "rows":
+                tables[name] = data or []
+            else:
+                records = TableRecords(data['header'], data['rows'], data.get('missing')) if data else TableRecords([], [])
+                tables[name] = records.to_columns() if payload == "columns" else records
+
+        if missing:
+            logger.warning(f"Tables not found: {', '.join(missing)}")
+        logger.info(f"Extracted {len(named) - len(missing)}/{len(named)} tables in one pass")
+        return tables
+
+    async def load_page(self, url: str, wait_for_selector: Optional[str] = None, keep_html: bool = False) -> 'PageSnapshot':
+        """
+        Load url once and return a PageSnapshot for running several extractors against it.
+        A snapshot taken earlier is reused while the page still shows it or its HTML was kept.
+        """
+        snapshot = self.snapshots.get(url)
+        if snapshot and (snapshot.is_live() or snapshot.html is not None):
+            logger.info(f"Reusing loaded page: {url}")
+            return snapshot
+
+        await self.navigate_to_url(url, wait_for_selector)
+        snapshot = PageSnapshot(self, url, self.page)
+        if keep_html:
+            snapshot.html = await self.page.content()
+        self.snapshots[url] = snapshot
+        return snapshot
 
     async def extract_links(self, link_selector: str, base_url: str) -> List[str]:
         links = await self.page.evaluate("""
@@ -259,8 +657,56 @@ class BaseScraper(ABC):
     async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
         pass
 
+    async def scrape_team_page(self, team_url: str) -> Tuple[ScrapeResult, ScrapeResult]:
+        """
+        Team stats and player stats of one team. Scrapers whose two results come from the
+        same team page override this to load the page once and extract both in one pass.
+        """
+        team_stats = await self.scrape_team_stats(team_url)
+        player_stats = await self.scrape_player_stats(team_url)
+        return team_stats, player_stats
+
+    async def team_page_part(self, team_url: str, part: int) -> ScrapeResult:
+        """
+        One result of scrape_team_page (0 = team stats, 1 = player stats) for scrapers that
+        implement scrape_team_stats/scrape_player_stats on top of it. The other result of a
+        successful load is kept until it is asked for, so calling both for one team loads the
+        team page once. The kept result gets its own copy of the rows: both results are built from
+        the same tables, and a caller editing one must not change the other.
+        """
+        if self.team_page_rest and self.team_page_rest[0] == team_url and part in self.team_page_rest[1]:
+            rest = self.team_page_rest[1]
+            result = rest.pop(part)
+            if not rest:
+                self.team_page_rest = None
+            return result
+
+        results = await self.scrape_team_page(team_url)
+        self.team_page_rest = None
+        if all(result.success for result in results):
+            self.team_page_rest = (team_url, {i: replace(result, data=copy.deepcopy(result.data))
+                                              for i, result in enumerate(results) if i != part})
+        return results[part]
+
+    async def get_team_name(self) -> str:
+        """Team name from the <h1> of a sports-reference team page."""
+        return await self.page.evaluate("""
+            () => {
+                const title = document.querySelector('h1')?.textContent || '';
+                return title.split(' 2024')[0].trim();
+            }
+        """)
+
     async def scrape_all(self) -> List[ScrapeResult]:
-        results = []
+        return [result async for result in self.iter_results()]
+
+    async def iter_results(self) -> AsyncIterator[ScrapeResult]:
+        """
+        Yield each ScrapeResult as soon as it is produced: standings first, then team and player
+        stats per team. The next team is only scraped once the consumer asks for more results.
+        Leaving the loop early closes the browser.
+        """
+        produced = 0
         browser_restart_count = 0
         max_browser_restarts = 5
 
@@ -269,7 +715,10 @@ class BaseScraper(ABC):
 
             # Scrape league standings with retry logic
             standings = await self._scrape_with_retry(self.scrape_league_standings, "league_standings")
-            results.append(standings)
+            produced += 1
+            yield standings
+            if await self.memory_checkpoint("league_standings"):
+                await self.recycle_context()
 
             if standings.success and standings.data and len(standings.data) > 0 and 'team_urls' in standings.data[0]:
                 team_urls = standings.data[0]['team_urls']
@@ -285,21 +734,9 @@ class BaseScraper(ABC):
 
                     logger.info(f"Processing team {i+1}/{total_teams}: {team_id}")
 
-                    # Process team stats with retry logic
+                    # Process team + player stats (one team page visit) with retry logic
                     try:
-                        team_stats = await self._scrape_team_with_retry(team_url, "team_stats")
-                        results.append(team_stats)
-
-                        player_stats = await self._scrape_team_with_retry(team_url, "player_stats")
-                        results.append(player_stats)
-
-                        # Mark team as processed only if both operations succeeded
-                        if team_stats.success and player_stats.success:
-                            self.processed_teams.add(team_id)
-                            logger.info(f"✅ Successfully processed team: {team_id}")
-                        else:
-                            logger.warning(f"⚠️  Partial success for team: {team_id}")
-
+                        team_stats, player_stats = await self._scrape_team_page_with_retry(team_url)
                     except Exception as e:
                         if "timeout" in str(e).lower() and browser_restart_count < max_browser_restarts:
                             logger.warning(f"Global timeout detected, restarting browser ({browser_restart_count + 1}/{max_browser_restarts})")
@@ -310,40 +747,55 @@ class BaseScraper(ABC):
                         else:
                             logger.error(f"Failed to process team {team_id}: {e}")
                             # Add failed results
-                            results.append(ScrapeResult(
+                            produced += 2
+                            yield ScrapeResult(
                                 sport=self.__class__.__name__.replace("Scraper", ""),
                                 data_type="team_stats",
                                 data=[],
                                 timestamp=datetime.now(),
                                 success=False,
                                 error_message=f"Team stats failed: {str(e)}"
-                            ))
-                            results.append(ScrapeResult(
+                            )
+                            yield ScrapeResult(
                                 sport=self.__class__.__name__.replace("Scraper", ""),
                                 data_type="player_stats",
                                 data=[],
                                 timestamp=datetime.now(),
                                 success=False,
                                 error_message=f"Player stats failed: {str(e)}"
-                            ))
+                            )
+                            continue
+
+                    # Mark team as processed only if both operations succeeded
+                    if team_stats.success and player_stats.success:
+                        self.processed_teams.add(team_id)
+                        logger.info(f"✅ Successfully processed team: {team_id}")
+                    else:
+                        logger.warning(f"⚠️  Partial success for team: {team_id}")
+
+                    produced += 2
+                    yield team_stats
+                    yield player_stats
+
+                    if await self.memory_checkpoint("team", team=team_id, results=produced):
+                        await self.recycle_context()
 
                 logger.info(f"✅ Completed processing all teams. Processed: {len(self.processed_teams)}/{total_teams}")
+                await self.memory_checkpoint("teams_done", results=produced)
 
         except Exception as e:
             logger.error(f"Critical scraping error: {e}", exc_info=True)
-            results.append(ScrapeResult(
+            yield ScrapeResult(
                 sport=self.__class__.__name__.replace("Scraper", ""),
                 data_type="error",
                 data=[],
                 timestamp=datetime.now(),
                 success=False,
                 error_message=str(e)
-            ))
+            )
         finally:
             await self.close_browser()
 
-        return results
-
     def _extract_team_id(self, team_url: str) -> str:
         """Extract a unique team identifier from the team URL."""
         try:
@@ -364,15 +816,19 @@ class BaseScraper(ABC):
                 result = await scrape_method()
                 if result.success:
                     return result
-                elif attempt < self.max_retries:
+                EXTRACTION_FAILURES.inc(scraper=self.__class__.__name__, operation=operation_name)
+                if attempt < self.max_retries:
                     logger.warning(f"Retry {attempt + 1}/{self.max_retries} for {operation_name}: {result.error_message}")
+                    RETRIES.inc(scraper=self.__class__.__name__, operation=operation_name)
                     await self.restart_browser()
                 else:
                     logger.error(f"Final attempt failed for {operation_name}: {result.error_message}")
                     return result
             except Exception as e:
+                EXTRACTION_FAILURES.inc(scraper=self.__class__.__name__, operation=operation_name)
                 if attempt < self.max_retries:
                     logger.warning(f"Exception on attempt {attempt + 1}/{self.max_retries + 1} for {operation_name}: {e}")
+                    RETRIES.inc(scraper=self.__class__.__name__, operation=operation_name)
                     await self.restart_browser()
                 else:
                     logger.error(f"Final attempt failed for {operation_name}: {e}")
@@ -385,37 +841,83 @@ class BaseScraper(ABC):
                         error_message=str(e)
                     )
 
-    async def _scrape_team_with_retry(self, team_url: str, operation_type: str):
-        """Retry wrapper specifically for team-based operations."""
+    async def _scrape_team_page_with_retry(self, team_url: str) -> Tuple[ScrapeResult, ScrapeResult]:
+        """Retry wrapper for the combined team page visit."""
         for attempt in range(self.max_retries + 1):
             try:
-                if operation_type == "team_stats":
-                    result = await self.scrape_team_stats(team_url)
-                elif operation_type == "player_stats":
-                    result = await self.scrape_player_stats(team_url)
-                else:
-                    raise ValueError(f"Unknown operation type: {operation_type}")
+                team_stats, player_stats = await self.scrape_team_page(team_url)
 
-                if result.success:
-                    return result
-                elif attempt < self.max_retries:
-                    logger.warning(f"Retry {attempt + 1}/{self.max_retries} for {operation_type} on {team_url}: {result.error_message}")
+                if team_stats.success and player_stats.success:
+                    return team_stats, player_stats
+                error_message = team_stats.error_message or player_stats.error_message
+                EXTRACTION_FAILURES.inc(scraper=self.__class__.__name__, operation="team_page")
+                if attempt < self.max_retries:
+                    logger.warning(f"Retry {attempt + 1}/{self.max_retries} for team page {team_url}: {error_message}")
+                    RETRIES.inc(scraper=self.__class__.__name__, operation="team_page")
                     await self.restart_browser()
                 else:
-                    logger.error(f"Final attempt failed for {operation_type} on {team_url}: {result.error_message}")
-                    return result
+                    logger.error(f"Final attempt failed for team page {team_url}: {error_message}")
+                    return team_stats, player_stats
 
             except Exception as e:
+                EXTRACTION_FAILURES.inc(scraper=self.__class__.__name__, operation="team_page")
                 if attempt < self.max_retries:
-                    logger.warning(f"Exception on attempt {attempt + 1}/{self.max_retries + 1} for {operation_type} on {team_url}: {e}")
+                    logger.warning(f"Exception on attempt {attempt + 1}/{self.max_retries + 1} for team page {team_url}: {e}")
+                    RETRIES.inc(scraper=self.__class__.__name__, operation="team_page")
                     await self.restart_browser()
                 else:
-                    logger.error(f"Final attempt failed for {operation_type} on {team_url}: {e}")
-                    return ScrapeResult(
-                        sport=self.__class__.__name__.replace("Scraper", ""),
-                        data_type=operation_type,
-                        data=[],
-                        timestamp=datetime.now(),
-                        success=False,
-                        error_message=str(e)
-                    )
\ No newline at end of file
+                    logger.error(f"Final attempt failed for team page {team_url}: {e}")
+                    return tuple(
+                        ScrapeResult(
+                            sport=self.__class__.__name__.replace("Scraper", ""),
+                            data_type=operation_type,
+                            data=[],
+                            timestamp=datetime.now(),
+                            success=False,
+                            error_message=str(e)
+                        )
+                        for operation_type in ("team_stats", "player_stats")
+                    )
+
+class PageSnapshot:
+    """
+    One loaded page shared by several extractors. While the scraper's page still shows it,
+    extraction runs against the live DOM; otherwise against the HTML kept at load time.
+    """
+
+    def __init__(self, scraper: BaseScraper, url: str, page: Page, html: Optional[str] = None):
+        self.scraper = scraper
+        self.url = url
+        self.page = page
+        self.html = html
+        self.loaded_at = datetime.now()
+
+    def is_live(self) -> bool:
+        return self.scraper.page is self.page and self.scraper.current_url == self.url
+
+    async def _ensure_available(self):
+        if not self.is_live() and self.html is None:
+            # Neither DOM nor HTML left (navigated away or browser restarted) - load again
+            await self.scraper.navigate_to_url(self.url)
+            self.page = self.scraper.page
+            self.loaded_at = datetime.now()
+
+    async def extract_tables(self, selectors, timeout: int = 10000, payload: str = "rows",
+                             typed: bool = False) -> Dict[str, Any]:
+        await self._ensure_available()
+        if self.is_live():
+            return await self.scraper.extract_tables(selectors, timeout, payload, typed)
+
+        named = _named_selectors(selectors)
+        raw = extract_tables_from_html(self.html, list(dict.fromkeys(named.values())),
+                                       compact=payload != "rows", typed=typed)
+        return self.scraper._shape_tables(named, raw, payload)
+
+    async def extract_table(self, selector: str, payload: str = "rows", typed: bool = False):
+        return (await self.extract_tables([selector], payload=payload, typed=typed))[selector]
+
+    async def extract_links(self, link_selector: str, base_url: str) -> List[str]:
+        await self._ensure_available()
+        if self.is_live():
+            return await self.scraper.extract_links(link_selector, base_url)
+        return list(set(extract_links_from_html(self.html, link_selector, base_url)))
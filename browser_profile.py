@@ -0,0 +1,132 @@
+"""
+Browser Profile - persistentes Chromium-Profil mit Disk-Cache zwischen Läufen
+Statische Assets (JS/CSS-Bundles, Fonts) werden nach Neustarts nur noch revalidiert statt neu geladen
+"""
+
+import os
+import shutil
+import socket
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_ROOT = "browser_profile"
+
+# Left behind by a crashed Chromium - they block the next launch with the same profile
+LOCK_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+
+# Pure caches inside the profile; safe to trim, Chromium rebuilds them on demand
+CACHE_DIRS = ('DiskCache', 'Default/Code Cache', 'Default/GPUCache', 'Default/Service Worker/CacheStorage',
+              'GrShaderCache', 'ShaderCache')
+
+@dataclass
+class BrowserProfile:
+    """
+    On-disk Chromium profile for launch_persistent_context.
+
+    The HTTP cache lives in <path>/DiskCache and is capped by Chromium itself (cache_size_mb).
+    prepare() runs before every launch: it clears stale lock files and trims the cache
+    directories, oldest files first, once the whole profile grows beyond max_profile_mb.
+    One profile can only be used by one browser at a time.
+    """
+    path: str
+    cache_size_mb: int = 512
+    max_profile_mb: int = 1024
+
+    @classmethod
+    def for_scraper(cls, name: str, root: str = DEFAULT_PROFILE_ROOT, **kwargs) -> 'BrowserProfile':
+        return cls(str(Path(root) / name), **kwargs)
+
+    @property
+    def cache_dir(self) -> Path:
+        return Path(self.path) / 'DiskCache'
+
+    def launch_args(self) -> List[str]:
+        return [
+            f'--disk-cache-dir={self.cache_dir.resolve()}',
+            f'--disk-cache-size={self.cache_size_mb * 1024 * 1024}'
+        ]
+
+    def prepare(self):
+        Path(self.path).mkdir(parents=True, exist_ok=True)
+        self._remove_stale_locks()
+        self.enforce_limits()
+
+    def _remove_stale_locks(self):
+        lock = Path(self.path) / 'SingletonLock'
+        if lock.is_symlink():
+            # Chromium writes "<hostname>-<pid>" as the link target
+            host, _, pid = os.readlink(lock).rpartition('-')
+            if host == socket.gethostname() and pid.isdigit() and _process_alive(int(pid)):
+                raise RuntimeError(f"Browser profile {self.path} is in use by process {pid}")
+
+        for name in LOCK_FILES:
+            path = Path(self.path) / name
+            if path.is_symlink() or path.exists():
+                path.unlink()
+                logger.info(f"Removed stale profile lock {path}")
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in _files(Path(self.path)))
+
+    def enforce_limits(self):
+        limit = self.max_profile_mb * 1024 * 1024
+        total = self.size_bytes()
+        if total <= limit:
+            return
+
+        # Trim to 80% so the next runs don't hit the limit again right away
+        target = int(limit * 0.8)
+        cache_files = []
+        for name in CACHE_DIRS:
+            cache_files.extend(_files(Path(self.path) / name))
+        cache_files.sort(key=lambda f: f[2])
+
+        removed = 0
+        for path, size, _ in cache_files:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                continue
+
+        logger.info(f"Browser profile {self.path}: removed {removed} cache files, now {total / 1024 / 1024:.0f} MB")
+
+    def clear_cache(self):
+        for name in CACHE_DIRS:
+            shutil.rmtree(Path(self.path) / name, ignore_errors=True)
+        logger.info(f"Cleared browser cache in {self.path}")
+
+def _files(root: Path) -> List[Tuple[Path, int, float]]:
+    """(path, size, last access) for every regular file below root."""
+    files = []
+    if not root.exists():
+        return files
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            try:
+                stat = path.lstat()
+            except OSError:
+                continue
+            if path.is_file() and not path.is_symlink():
+                files.append((path, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+    return files
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        # Windows: signal 0 isn't supported, assume the lock is stale
+        return False
+    return True
@@ -0,0 +1,318 @@
+"""
+Browser Service - langlebiger Browser-Daemon für wiederholte Scrape-Läufe
+Hält Chromium und die Cookie-/Consent-States pro Scraper warm und nimmt Jobs über einen lokalen Socket an.
+Protokoll: eine JSON-Zeile pro Job, jedes Ergebnis kommt als JSON-Zeile zurück, sobald es vorliegt.
+
+Usage:
+    python browser_service.py
+    python browser_service.py --port 8765 --headless False
+    BROWSER_SERVICE_TOKEN=... python browser_service.py --host 0.0.0.0
+    python main.py --attach 127.0.0.1:8765 --sports nfl nba
+    python main_match_scraper.py --attach 127.0.0.1:8765
+    python final_test.py --attach 127.0.0.1:8765
+"""
+
+import asyncio
+import argparse
+import hmac
+import ipaddress
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
+from playwright.async_api import async_playwright
+from base_scraper import ScrapeResult, AdaptiveRateLimiter, launch_browser
+from bundesliga_match_scraper import BundesligaMatchScraper
+from ndjson_stream import encode_message, result_to_dict, result_from_dict
+from metrics import METRICS, start_exporters
+from log_pipeline import setup_logging
+from main import (
+    AVAILABLE_SCRAPERS, DEFAULT_SERVICE_PORT, attach_scraper, emit, scrape_sport, scrape_stathead_all, run_concurrently
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Shared secret of service and clients; required when the service listens beyond loopback
+TOKEN_ENV = 'BROWSER_SERVICE_TOKEN'
+
+# Job name of the match-by-match scraper (main_match_scraper.py, final_test.py, extended_test.py)
+MATCH_JOB = 'bundesliga_match'
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # '' or '0.0.0.0'-style wildcards and host names may reach other machines
+        return False
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """'HOST:PORT' (either part optional) of an --attach argument."""
+    host, _, port = address.partition(':')
+    return host or '127.0.0.1', int(port or DEFAULT_SERVICE_PORT)
+
+async def scrape_matches(rate_limiter, headless, browser=None, storage_states=None, on_result=None,
+                         match_urls: Optional[List[Dict[str, Any]]] = None, schedule_only: bool = False):
+    """
+    Match-by-match job: one "match" result per match as soon as it is extracted (the whole season,
+    or only match_urls), or with schedule_only a single "schedule" result with the match list.
+    """
+    scraper = BundesligaMatchScraper(rate_limiter, headless)
+    attach_scraper(scraper, browser, storage_states)
+    results = []
+    try:
+        await scraper.initialize_browser()
+        if schedule_only:
+            schedule = ScrapeResult(sport="Bundesliga", data_type="schedule", data=await scraper.get_match_urls(),
+                                    timestamp=datetime.now(), success=True)
+            results.append(schedule)
+            await emit(on_result, schedule)
+        else:
+            async for match_data in scraper.iter_matches(match_urls):
+                result = ScrapeResult(sport="Bundesliga", data_type="match", data=[match_data],
+                                      timestamp=datetime.now(), success=True)
+                results.append(result)
+                await emit(on_result, result)
+    except ConnectionError:
+        # The client went away (raised by on_result) - nobody left to report the failure to
+        raise
+    except Exception as e:
+        logger.error(f"Error in match job: {e}", exc_info=True)
+        failed = ScrapeResult(sport="Bundesliga", data_type="match_by_match", data=[], timestamp=datetime.now(),
+                              success=False, error_message=str(e))
+        results.append(failed)
+        await emit(on_result, failed)
+    finally:
+        await scraper.close_browser()
+        if storage_states is not None and scraper.storage_state:
+            storage_states[BundesligaMatchScraper.__name__] = scraper.storage_state
+    return results
+
+class BrowserService:
+    """
+    Keeps one Chromium running between jobs. Every job gets fresh contexts on that browser,
+    seeded with the cookies the same scraper class left behind (consent banners stay dismissed),
+    and all jobs share one per-host AdaptiveRateLimiter.
+
+    With a token every job has to carry it. Listening on anything but a loopback address
+    requires one, since a job drives the shared browser and its logged-in sessions.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_SERVICE_PORT, headless: bool = True,
+                 requests_per_minute: int = 10, token: Optional[str] = None):
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host or 'all interfaces'} without a token (set {TOKEN_ENV})")
+        self.token = token
+        self.host = host
+        self.port = port
+        self.headless = headless
+        self.rate_limiter = AdaptiveRateLimiter(requests_per_minute=requests_per_minute)
+        self.storage_states: Dict[str, Dict[str, Any]] = {}
+        self.playwright = None
+        self.browser = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._browser_lock = asyncio.Lock()
+        self.jobs_served = 0
+
+    async def start(self):
+        self.playwright = await async_playwright().start()
+        await self._ensure_browser()
+        self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        logger.info(f"Browser service listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        logger.info("Browser service stopped")
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self.browser and self.browser.is_connected():
+                return
+            if self.browser:
+                logger.warning("Shared browser disconnected, relaunching")
+            self.browser = await launch_browser(self.playwright, self.headless)
+            logger.info("Shared browser launched")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                writer.write(encode_message({'type': 'error', 'message': f"Invalid job: {e}"}))
+                return
+
+            if self.token and not hmac.compare_digest(str(job.get('token') or '').encode('utf-8'),
+                                                      self.token.encode('utf-8')):
+                logger.warning("Rejected job with a missing or wrong token")
+                writer.write(encode_message({'type': 'error', 'message': "Missing or wrong token"}))
+                return
+
+            sports = job.get('sports') or list(AVAILABLE_SCRAPERS)
+            unknown = [sport for sport in sports if sport not in AVAILABLE_SCRAPERS and sport != MATCH_JOB]
+            if unknown:
+                writer.write(encode_message({'type': 'error', 'message': f"Unknown sports: {', '.join(unknown)}"}))
+                return
+
+            await self._ensure_browser()
+            self.jobs_served += 1
+            logger.info(f"Job {self.jobs_served}: {', '.join(sports)}{' + stathead' if job.get('stathead') else ''}")
+
+            send_lock = asyncio.Lock()
+
+            async def send(message):
+                # Sports finish results concurrently; one drain at a time keeps backpressure per line
+                async with send_lock:
+                    writer.write(encode_message(message))
+                    await writer.drain()
+
+            def sender(name):
+                return lambda result: send({'type': 'result', 'name': name, 'result': result_to_dict(result)})
+
+            jobs = {
+                sport: scrape_matches(self.rate_limiter, self.headless, self.browser, self.storage_states,
+                                      sender(sport), job.get('match_urls'), bool(job.get('schedule_only')))
+                if sport == MATCH_JOB else
+                scrape_sport(AVAILABLE_SCRAPERS[sport], self.rate_limiter, self.headless,
+                             self.browser, self.storage_states, sender(sport))
+                for sport in sports
+            }
+            if job.get('stathead'):
+                jobs['stathead'] = scrape_stathead_all(self.rate_limiter, self.headless, self.browser, self.storage_states,
+                                                       sender('stathead'))
+
+            async def on_complete(name, results):
+                await send({'type': 'sport_done', 'name': name, 'count': len(results)})
+
+            await run_concurrently(jobs, on_complete)
+            writer.write(encode_message({'type': 'done', 'limits': self.rate_limiter.snapshot()}))
+        except ConnectionError:
+            # run_concurrently has cancelled the sports that were still running
+            logger.warning("Client disconnected before the job finished - job cancelled")
+        except Exception as e:
+            logger.error(f"Error running job: {e}", exc_info=True)
+            writer.write(encode_message({'type': 'error', 'message': str(e)}))
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+async def submit_job(sports: List[str], stathead: bool = False, host: str = '127.0.0.1',
+                     port: int = DEFAULT_SERVICE_PORT, token: Optional[str] = None,
+                     **options) -> AsyncIterator[Tuple[str, ScrapeResult]]:
+    """
+    Send a job to a running BrowserService and yield (sport, result) as soon as the service
+    produced each result. options go into the job as-is (match_urls/schedule_only of MATCH_JOB);
+    the token defaults to the BROWSER_SERVICE_TOKEN environment variable.
+    """
+    token = token if token is not None else os.getenv(TOKEN_ENV)
+    # Result lines can carry whole season tables - lift the default 64 KiB line limit
+    reader, writer = await asyncio.open_connection(host, port, limit=64 * 1024 * 1024)
+    try:
+        job = {'sports': sports, 'stathead': stathead, **options}
+        if token:
+            job['token'] = token
+        writer.write(encode_message(job))
+        await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Browser service closed the connection before the job finished")
+            message = json.loads(line)
+
+            if message['type'] == 'result':
+                yield message['name'], result_from_dict(message['result'])
+            elif message['type'] == 'sport_done':
+                logger.info(f"{message['name']} finished on the browser service with {message['count']} results")
+            elif message['type'] == 'error':
+                raise RuntimeError(f"Browser service error: {message['message']}")
+            elif message['type'] == 'done':
+                return
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+class AttachedMatchScraper:
+    """
+    Client-side stand-in for the BundesligaMatchScraper calls of the test scripts: get_match_urls()
+    and scrape_match_stats() run as MATCH_JOB jobs on a browser service instead of a local browser.
+    """
+
+    def __init__(self, address: str, token: Optional[str] = None):
+        self.host, self.port = parse_address(address)
+        self.token = token
+        self.schedule: Dict[str, Dict[str, Any]] = {}
+
+    async def _results(self, **options) -> List[ScrapeResult]:
+        return [result async for _, result in submit_job([MATCH_JOB], False, self.host, self.port, self.token, **options)]
+
+    async def get_match_urls(self) -> List[Dict[str, Any]]:
+        results = await self._results(schedule_only=True)
+        if not results or not results[0].success:
+            raise RuntimeError(f"Schedule job failed: {results[0].error_message if results else 'no result'}")
+        matches = results[0].data
+        self.schedule = {match['url']: match for match in matches}
+        return matches
+
+    async def scrape_match_stats(self, match_url: str, home_team: str, away_team: str, matchday: int,
+                                 **kwargs) -> Optional[Dict[str, Any]]:
+        # The full schedule row (date, scores) lets the service plan the match like a local run
+        match_info = self.schedule.get(match_url) or {
+            'url': match_url, 'home_team': home_team, 'away_team': away_team, 'matchday': matchday
+        }
+        for result in await self._results(match_urls=[match_info]):
+            if result.success and result.data:
+                return result.data[0]
+        return None
+
+async def main():
+    parser = argparse.ArgumentParser(description='Long-running browser service for the multi-sport scrapers')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Address to listen on (default: 127.0.0.1; anything else requires a token)')
+    parser.add_argument('--token', type=str, default=os.getenv(TOKEN_ENV),
+                        help=f'Token every job has to send (default: ${TOKEN_ENV}); clients read ${TOKEN_ENV}')
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVICE_PORT,
+                        help=f'Port to listen on (default: {DEFAULT_SERVICE_PORT})')
+    parser.add_argument('--headless', type=str, default='True',
+                        help='Run browser in headless mode (default: True)')
+    parser.add_argument('--rate-limit', type=int, default=10,
+                        help='Starting requests per minute per host (default: 10)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics of all jobs on http://127.0.0.1:PORT/metrics')
+    args = parser.parse_args()
+    if not args.token and not is_loopback(args.host):
+        parser.error(f"--host {args.host} is reachable from other machines: set --token or {TOKEN_ENV}")
+
+    stop_metrics = start_exporters(METRICS, port=args.metrics_port)
+    service = BrowserService(args.host, args.port, args.headless.lower() == 'true', args.rate_limit, args.token)
+    await service.start()
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+        stop_metrics()
+
+if __name__ == "__main__":
+    setup_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -3,23 +3,53 @@ Enhanced Bundesliga Match-by-Match Scraper
 Scrapes individual match data from FBRef + Kicker.de table positions
 """
 
-from base_scraper import BaseScraper, ScrapeResult, RateLimiter
+from base_scraper import BaseScraper, ScrapeResult, RateLimiter, PageLostError, page_lost
 from website_analysis import BUNDESLIGA_STRUCTURE
+from standings import parse_score, positions_before_matchdays
+from match_index import MatchIndex
+from revalidation import RevalidationScheduler, stats_digest, changed_stats
+from cache_policy import DEFAULT_POLICY, ResultCache
+from tracing import TRACER, traced
+from metrics import QUEUE_DEPTH, MATCHES_COMPLETED, MATCH_THROUGHPUT, PAGES_FETCHED, RESPONSE_BYTES
+from player_capture import PlayerMatchDataset, PLAYER_ROWS_SCRIPT
+from extraction import TEAM_TOTALS_SCRIPT, js_args
+from stat_record import TeamStats, TEAM_STATS_SCHEMA
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
+from playwright.async_api import Page
 import logging
 import pandas as pd
 import asyncio
+import time
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
 class BundesligaMatchScraper(BaseScraper):
-    def __init__(self, rate_limiter: RateLimiter, headless: bool = True):
+    def __init__(self, rate_limiter: RateLimiter, headless: bool = True, kicker_cross_check: bool = False,
+                 match_index_path: str = "match_index.json", capture_players: bool = False,
+                 player_data_dir: str = "player_data", result_cache_dir: str = "result_cache"):
         super().__init__(rate_limiter, headless)
         self.base_url = BUNDESLIGA_STRUCTURE["base_url"]
         self.league_url = BUNDESLIGA_STRUCTURE["league_url"]
         self.config = BUNDESLIGA_STRUCTURE
 
+        # Table positions are computed locally from the schedule results (standings.py).
+        # Kicker.de is only loaded as an optional cross-check, once per matchday.
+        self.kicker_cross_check = kicker_cross_check
+        self.positions_before_matchday: Dict[int, Dict[str, int]] = {}
+        self._kicker_checked_matchdays = set()
+
+        # Persisted schedule (all columns + scrape status), served from disk while fresh
+        self.match_index = MatchIndex(match_index_path, policy=DEFAULT_POLICY)
+
+        # Extracted match stats and Kicker tables; finished/historic ones are never loaded again
+        self.result_cache = ResultCache(result_cache_dir, DEFAULT_POLICY)
+
+        # Optional: keep every player row of the loaded match pages (no extra requests)
+        self.capture_players = capture_players
+        self.player_data_dir = player_data_dir
+
         # Die 6 FBRef Stat-Tabs die extrahiert werden sollen
         self.stat_tabs = [
             'summary',          # Summary
@@ -252,6 +282,9 @@ class BundesligaMatchScraper(BaseScraper):
             'Won%': 'aerials_won_pct'
         }
 
+        # Fixed column order for the known stats; unknown stats are appended on first sight
+        TEAM_STATS_SCHEMA.register_many(self.parameter_mapping.values())
+
         # Team name mapping for consistency (includes Kicker.de variants with (M, P), (N), etc.)
         self.team_name_mapping = {
             # FBRef names
@@ -283,8 +316,57 @@ class BundesligaMatchScraper(BaseScraper):
             'Wolfsburg': 'Wolfsburg'  # Sometimes without "VfL"
         }
 
+        # fbref schedule names whose short form differs from the team_name_mapping values above
+        # (the names Kicker.de positions are keyed by); all other fbref names already match
+        self.fbref_team_names = {
+            'Eint Frankfurt': 'Frankfurt',
+            'Mainz 05': 'Mainz',
+            'RB Leipzig': 'Leipzig',
+            'Holstein Kiel': 'Kiel',
+            'Mönchengladbach': 'Gladbach',
+            "M'Gladbach": 'Gladbach'
+        }
+
+    async def get_table_positions(self, matchday: int) -> Dict[str, int]:
+        """Table positions before matchday, computed from the schedule loaded by get_match_urls()"""
+
+        if not self.positions_before_matchday:
+            logger.warning("No schedule results loaded - call get_match_urls() first to compute table positions")
+            return {}
+
+        positions = self.positions_before_matchday.get(matchday, {})
+
+        if self.kicker_cross_check and matchday not in self._kicker_checked_matchdays:
+            self._kicker_checked_matchdays.add(matchday)
+            await self._cross_check_with_kicker(matchday, positions)
+
+        return positions
+
+    async def _cross_check_with_kicker(self, matchday: int, positions: Dict[str, int]):
+        """Compare computed positions with Kicker.de and log differences (informational only)"""
+        kicker_positions = await self.get_kicker_table_positions(matchday)
+        if not kicker_positions:
+            return
+        mismatches = []
+        unmatched = []
+        for team, position in positions.items():
+            kicker_position = kicker_positions.get(self.fbref_team_names.get(team, team))
+            if kicker_position is None:
+                unmatched.append(team)
+            elif kicker_position != position:
+                mismatches.append(f"{team}: {position} (Kicker: {kicker_position})")
+
+        if unmatched:
+            logger.warning(f"No Kicker.de position for {', '.join(unmatched)} - add the names to fbref_team_names")
+
+        if mismatches:
+            logger.warning(f"Table positions before matchday {matchday} differ from Kicker.de: {', '.join(mismatches)}")
+        elif not unmatched:
+            logger.info(f"Table positions before matchday {matchday} match Kicker.de")
+
+    @traced("kicker_table_positions", cat="kicker", arg_names=("matchday",))
     async def get_kicker_table_positions(self, matchday: int) -> Dict[str, int]:
-        """Fetch table positions from Kicker.de for a specific matchday using Playwright"""
+        """Fetch table positions from Kicker.de for a specific matchday using Playwright (cross-check only)"""
 
         # Before matchday 1, all teams are at position 1
         if matchday <= 1:
@@ -293,10 +375,15 @@ class BundesligaMatchScraper(BaseScraper):
         # For other matchdays, get table after previous matchday
         previous_matchday = matchday - 1
         url = f"https://www.kicker.de/bundesliga/tabelle/2024-25/{previous_matchday}"
+        cache_key = f"kicker_2024-25_{previous_matchday}"
+        cached = self.result_cache.get(cache_key, url)
+        if cached:
+            return cached
 
         try:
-            # Create a new browser context for Kicker.de
-            kicker_page = await self.browser.new_page()
+            # Short-lived page in the scraper's context (Browser.new_page would open a fresh context
+            # per matchday - and there is no Browser object on a persistent profile)
+            kicker_page = await self.new_page()
 
             try:
                 await kicker_page.goto(url, wait_until='domcontentloaded')
@@ -313,7 +400,7 @@ class BundesligaMatchScraper(BaseScraper):
                     pass  # No cookie dialog or already accepted
 
                 # Extract table positions using Playwright
-                positions = await kicker_page.evaluate('''
+                positions = await self.traced_evaluate(kicker_page, "kicker_table", '''
                     () => {
                         const positions = {};
                         const tableRows = document.querySelectorAll('table.kick__table--ranking tbody tr');
@@ -363,6 +450,10 @@ class BundesligaMatchScraper(BaseScraper):
                         mapped_positions[clean_name] = position
 
                 logger.info(f"Kicker table positions for matchday {previous_matchday}: {mapped_positions}")
+                if mapped_positions:
+                    # Final only if the matchday was already complete when the table was loaded
+                    self.result_cache.put(cache_key, url, mapped_positions,
+                                          complete=self.match_index.matchday_complete(previous_matchday))
                 return mapped_positions
 
             finally:
@@ -370,19 +461,26 @@ class BundesligaMatchScraper(BaseScraper):
 
         except Exception as e:
             logger.error(f"Error fetching Kicker table for matchday {matchday}: {e}")
-            # Return default positions if failed
-            return {team: 1 for team in self.team_name_mapping.values()}
+            return {}
 
-    async def get_match_urls(self) -> List[Dict[str, Any]]:
-        """Navigate to Bundesliga fixtures and extract all match URLs"""
+    @traced("get_match_urls")
+    async def get_match_urls(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """Navigate to Bundesliga fixtures and extract all match URLs (served from the match index when fresh)"""
+
+        # Bundesliga 2024-25 Scores & Fixtures page (Kunde: 306 Spiele aus 2024-25)
+        full_url = f"{self.base_url}/en/comps/20/2024-2025/schedule/2024-2025-Bundesliga-Scores-and-Fixtures"
+
+        if not force_refresh and self.match_index.is_fresh(full_url):
+            match_links = self.match_index.matches()
+            self.positions_before_matchday = positions_before_matchdays(match_links)
+            logger.info(f"Found {len(match_links)} matches for the season (match index, no page load)")
+            return match_links
 
         try:
-            # Navigate to Bundesliga 2024-25 Scores & Fixtures page (Kunde: 306 Spiele aus 2024-25)
-            full_url = f"{self.base_url}/en/comps/20/2024-2025/schedule/2024-2025-Bundesliga-Scores-and-Fixtures"
             await self.navigate_to_url(full_url, wait_for_selector="table.stats_table")
 
             # Get all match links for the season
-            match_links = await self.page.evaluate('''
+            match_links = await self.traced_evaluate(self.page, "schedule", '''
                 () => {
                     const matches = [];
                     const matchRows = document.querySelectorAll('table.stats_table tbody tr');
@@ -398,6 +496,13 @@ class BundesligaMatchScraper(BaseScraper):
                                 // Fix: Use 'gameweek' instead of 'round' - 'round' contains "Bundesliga", 'gameweek' contains matchday number
                                 const gameweekCell = row.querySelector('td[data-stat="gameweek"]');
                                 const gameweekText = gameweekCell ? gameweekCell.textContent.trim() : '';
+                                const scoreText = scoreCell.textContent.trim();
+
+                                // Keep every schedule column (venue, attendance, xG, referee, ...)
+                                const columns = {};
+                                row.querySelectorAll('[data-stat]').forEach(cell => {
+                                    columns[cell.getAttribute('data-stat')] = cell.textContent.trim();
+                                });
 
                                 // Only process matches with valid gameweek (filters out DFB-Pokal and other competitions)
                                 if (dateCell && homeTeamCell && awayTeamCell && gameweekText) {
@@ -409,7 +514,9 @@ class BundesligaMatchScraper(BaseScraper):
                                             home_team: homeTeamCell.textContent.trim(),
                                             away_team: awayTeamCell.textContent.trim(),
                                             round: gameweekText,
-                                            matchday: matchday
+                                            matchday: matchday,
+                                            score: scoreText,
+                                            columns: columns
                                         });
                                     }
                                 }
@@ -421,6 +528,13 @@ class BundesligaMatchScraper(BaseScraper):
                 }
             ''')
 
+            for match in match_links:
+                score = parse_score(match.get('score'))
+                match['home_score'], match['away_score'] = score if score else (None, None)
+
+            self.positions_before_matchday = positions_before_matchdays(match_links)
+            self.match_index.update_from_schedule(match_links, full_url)
+
             logger.info(f"Found {len(match_links)} matches for the season")
             return match_links
 
@@ -428,26 +542,35 @@ class BundesligaMatchScraper(BaseScraper):
             logger.error(f"Error getting match URLs: {e}")
             return []
 
-    async def scrape_match_stats(self, match_url: str, home_team: str, away_team: str, matchday: int) -> Dict[str, Any]:
-        """Scrape detailed stats for a single match"""
+    @traced("scrape_match_stats", arg_names=("match_url", "matchday"))
+    async def scrape_match_stats(self, match_url: str, home_team: str, away_team: str, matchday: int,
+                                 page: Optional[Page] = None) -> Dict[str, Any]:
+        """Scrape detailed stats for a single match (a lost worker page raises PageLostError)"""
 
+        worker_page = page
+        fingerprint = None
         try:
             # Don't use wait_for_selector here - cookie consent needs to be handled first
-            await self.navigate_to_url(match_url)
+            response = await self.navigate_to_url(match_url, page=page)
+            # Resolve after navigation: a browser restart during retries replaces self.page
+            page = page or self.page
+            # Baseline for later revalidation, hashed from the raw HTML while the tables render
+            fingerprint = asyncio.create_task(self._record_fingerprint(match_url, response))
 
             # Wait for stats tables to load (they are loaded dynamically after page load)
             # FBRef loads stats tables via JavaScript after the initial page render
-            await asyncio.sleep(8)
+            with TRACER.span("wait_for_stats_tables", cat="browser"):
+                await asyncio.sleep(8)
 
-            # Wait specifically for keeper stats tables to appear (good indicator that all stats are loaded)
-            try:
-                await self.page.wait_for_selector('table[id^="keeper_stats_"]', timeout=10000)
-            except Exception as e:
-                logger.warning(f"Timeout waiting for keeper stats tables: {e}")
+                # Wait specifically for keeper stats tables to appear (good indicator that all stats are loaded)
+                try:
+                    await page.wait_for_selector('table[id^="keeper_stats_"]', timeout=10000)
+                except Exception as e:
+                    logger.warning(f"Timeout waiting for keeper stats tables: {e}")
 
             # Extract team IDs from the page
             # Try both player stats tables (stats_*_summary) and keeper tables (keeper_stats_*)
-            team_ids = await self.page.evaluate('''
+            team_ids = await self.traced_evaluate(page, "team_ids", '''
                 () => {
                     const teamIds = [];
 
@@ -482,10 +605,10 @@ class BundesligaMatchScraper(BaseScraper):
                 return {}
 
             # Get table positions before this match
-            table_positions = await self.get_kicker_table_positions(matchday)
+            table_positions = await self.get_table_positions(matchday)
 
             # Extract possession from match stats table (customer requirement: "Ballbesitz ist oben aber nicht in den Tabellen")
-            possession_data = await self.page.evaluate('''
+            possession_data = await self.traced_evaluate(page, "possession", '''
                 () => {
                     // Find the row with "Possession" header in the table
                     const rows = document.querySelectorAll('tr');
@@ -516,10 +639,10 @@ class BundesligaMatchScraper(BaseScraper):
                 'home_team': home_team,
                 'away_team': away_team,
                 'matchday': matchday,
-                'home_team_stats': {'possession': possession_data.get('home_possession')},
-                'away_team_stats': {'possession': possession_data.get('away_possession')},
-                'home_team_position': table_positions.get(self.team_name_mapping.get(home_team, home_team), 1),
-                'away_team_position': table_positions.get(self.team_name_mapping.get(away_team, away_team), 1)
+                'home_team_stats': TeamStats({'possession': possession_data.get('home_possession')}),
+                'away_team_stats': TeamStats({'possession': possession_data.get('away_possession')}),
+                'home_team_position': table_positions.get(home_team),
+                'away_team_position': table_positions.get(away_team)
             }
 
             # Define the stat tables we want to scrape (6 player stats tabs + goalkeeper)
@@ -536,7 +659,7 @@ class BundesligaMatchScraper(BaseScraper):
             for i, team_id in enumerate(team_ids[:2]):
                 team_key = 'home_team_stats' if i == 0 else 'away_team_stats'
                 # Initialize with existing data (possession) instead of empty dict
-                team_stats = match_data.get(team_key, {})
+                team_stats = match_data.get(team_key) or TeamStats()
 
                 for table_type, tab_name in stat_tables:
                     # Goalkeeper stats use different table ID and extraction logic
@@ -549,98 +672,191 @@ class BundesligaMatchScraper(BaseScraper):
                     # FBRef loads all 6 player stat tables + goalkeeper table on page load
 
                     # Extract data: Team totals for player stats, goalkeeper row for keeper stats
-                    table_data = await self.page.evaluate(f'''
-                        () => {{
-                            const table = document.querySelector('#{table_id}');
-                            if (!table) {{
-                                console.log('ERROR: Table #{table_id} not found!');
-                                return {{}};
-                            }}
-                            console.log('SUCCESS: Found table #{table_id}');
-
-                            const rows = table.querySelectorAll('tbody tr[data-row]');
-                            if (rows.length === 0) {{
-                                console.log('ERROR: No rows found in table #{table_id}');
-                                return {{}};
-                            }}
-
-                            let dataRow = null;
-                            const isKeeperTable = '{table_type}' === 'keeper';
-
-                            if (isKeeperTable) {{
-                                // For goalkeeper stats: Take first row (the goalkeeper)
-                                dataRow = rows[0];
-                                console.log('Found goalkeeper stats row');
-                            }} else {{
-                                // For player stats: Find team totals in tfoot
-                                // FBRef uses <tfoot> element for team totals (not "16 Players" text)
-                                // The team totals row is in <tfoot><tr> with data-stat attributes
-                                const tfoot = table.querySelector('tfoot');
-                                if (tfoot) {{
-                                    // Get the first <tr> in tfoot with data-stat cells
-                                    const tfootRow = tfoot.querySelector('tr');
-                                    if (tfootRow && tfootRow.querySelectorAll('[data-stat]').length > 0) {{
-                                        dataRow = tfootRow;
-                                        console.log('Found team totals row in tfoot');
-                                    }}
-                                }}
-
-                                if (!dataRow) {{
-                                    // Fallback: use last row in tbody if no tfoot
-                                    dataRow = rows[rows.length - 1];
-                                    console.log('Using last tbody row as fallback');
-                                }}
-                            }}
-
-                            if (!dataRow) return {{}};
-
-                            const cells = dataRow.querySelectorAll('td, th');
-
-                            const rowData = {{}};
-                            cells.forEach((cell) => {{
-                                // Get data-stat directly from the cell in tfoot (not from thead!)
-                                const dataStat = cell.getAttribute('data-stat');
-                                const cellText = cell.textContent.trim();
-
-                                if (dataStat && cellText && dataStat !== 'player') {{
-                                    rowData[dataStat] = cellText;
-                                }}
-                            }});
-
-                            return rowData;
-                        }}
-                    ''')
+                    # (values arrive already typed from the shared extraction runtime)
+                    table_data = await self.traced_evaluate(
+                        page, f"team_totals:{table_type}", TEAM_TOTALS_SCRIPT,
+                        js_args(typed=True, tableId=table_id, isKeeper=table_type == 'keeper')
+                    )
 
                     # Store ALL parameters directly from FBRef (no mapping filter!)
                     # This ensures we capture ALL available data from all 6 tabs + goalkeeper
                     if table_data:
                         logger.info(f"Extracted {len(table_data)} parameters from {tab_name}")
                         for fbref_param, value in table_data.items():
-                            if value and value != '':
-                                # CRITICAL FIX: Don't overwrite existing parameters!
-                                # Different tabs may have same parameter names (e.g. "goals" in Summary AND Passing)
-                                # Keep the FIRST value (usually from earlier/more important tab)
-                                if fbref_param not in team_stats:
-                                    try:
-                                        # Remove commas and convert to float if possible
-                                        clean_value = value.replace(',', '')
-                                        if clean_value.replace('.', '').replace('-', '').isdigit():
-                                            team_stats[fbref_param] = float(clean_value)
-                                        else:
-                                            team_stats[fbref_param] = value
-                                    except:
-                                        team_stats[fbref_param] = value
+                            # CRITICAL FIX: Don't overwrite existing parameters!
+                            # Different tabs may have same parameter names (e.g. "goals" in Summary AND Passing)
+                            # Keep the FIRST value (usually from earlier/more important tab)
+                            if fbref_param not in team_stats:
+                                team_stats[fbref_param] = value
                     else:
                         logger.warning(f"No data extracted from {tab_name} for table #{table_id}")
 
                 # Move this OUTSIDE the table loop for efficiency
                 match_data[team_key] = team_stats
 
+            if self.capture_players:
+                match_data['player_data_path'] = await self._capture_player_rows(page, match_url, team_ids[:2], stat_tables)
+
+            await fingerprint
             return match_data
 
+        except PageLostError:
+            raise
         except Exception as e:
+            if worker_page is not None and page_lost(worker_page, e):
+                # The worker page died mid-extraction - the worker retries the match on a new page
+                raise PageLostError(f"Page lost while scraping {match_url}: {e}") from e
             logger.error(f"Error scraping match {match_url}: {e}")
             return {}
+        finally:
+            if fingerprint is not None and not fingerprint.done():
+                # Early return or error: no revalidation baseline for a page we could not extract
+                fingerprint.cancel()
+                await asyncio.gather(fingerprint, return_exceptions=True)
+
+    @staticmethod
+    def _played_at(match_info: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return datetime.strptime(match_info.get('date') or '', '%Y-%m-%d')
+        except ValueError:
+            return None
+
+    def _cached_match(self, match_id: Optional[str], match_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not match_id:
+            return None
+        cached = self.result_cache.get(f"match_{match_id}", match_info['url'])
+        if not cached or (self.capture_players and not cached.get('player_data_path')):
+            return None
+        cached['home_team_stats'] = TeamStats(cached.get('home_team_stats'))
+        cached['away_team_stats'] = TeamStats(cached.get('away_team_stats'))
+        return cached
+
+    def _cache_match(self, match_data: Dict[str, Any]):
+        # Only finished matches are worth keeping; upcoming ones have no stats yet
+        if not match_data.get('match_id') or match_data.get('home_score') is None:
+            return
+        data = dict(match_data)
+        data['home_team_stats'] = dict(match_data.get('home_team_stats') or {})
+        data['away_team_stats'] = dict(match_data.get('away_team_stats') or {})
+        self.result_cache.put(f"match_{match_data['match_id']}", match_data['url'], data,
+                              finished=True, played_at=self._played_at(match_data))
+
+    async def _record_fingerprint(self, match_url: str, response):
+        """Store ETag/Last-Modified and the per-column stats digest of the served match page"""
+        match_id = MatchIndex.match_id_from_url(match_url)
+        if not response or not match_id:
+            return
+        try:
+            with TRACER.span("fingerprint", cat="revalidation", match_id=match_id):
+                digest = await asyncio.to_thread(stats_digest, await response.text())
+            self.match_index.record_fingerprint(
+                match_id, digest, response.headers.get('etag'), response.headers.get('last-modified')
+            )
+        except Exception as e:
+            logger.warning(f"Could not fingerprint {match_url}: {e}")
+
+    @traced("revalidate_matches")
+    async def revalidate_matches(self) -> List[Dict[str, Any]]:
+        """
+        Re-check recently played matches for fbref stat corrections (1, 3 and 7 days after the game).
+        Uses a conditional request when the page sent validators, otherwise compares the per-column
+        stats digest; only matches whose stats moved are extracted again. Returns the re-extracted matches.
+        """
+        scheduler = RevalidationScheduler(self.match_index)
+        due = scheduler.due()
+        logger.info(f"Revalidation: {len(due)} matches due")
+
+        updated = []
+        for entry in due:
+            match_id = entry['match_id']
+            url = entry['url']
+
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+            await self.rate_limiter.acquire(url)
+            status = None
+            retry_after = None
+            body = None
+            started = time.monotonic()
+            try:
+                # Plain HTTP through the browser context (same cookies), no rendering
+                response = await self.context.request.get(url, headers=headers)
+                status = response.status
+                retry_after = response.headers.get('retry-after')
+                body = await response.text() if status == 200 else None
+            except Exception as e:
+                logger.warning(f"Revalidation request failed for {url}: {e}")
+                continue
+            finally:
+                await self.rate_limiter.release(url, status, time.monotonic() - started, retry_after)
+                host = urlparse(url).netloc
+                PAGES_FETCHED.inc(scraper=self.__class__.__name__, host=host, status=status or "error")
+                if body:
+                    RESPONSE_BYTES.inc(len(body.encode('utf-8')), scraper=self.__class__.__name__, host=host)
+
+            if status == 304:
+                logger.info(f"{entry['home_team']} vs {entry['away_team']}: not modified")
+            elif status == 200:
+                digest = await asyncio.to_thread(stats_digest, body)
+                changes = changed_stats(entry.get('stats_digest'), digest)
+                if changes:
+                    moved = "; ".join(f"{table_id}: {', '.join(stats)}" for table_id, stats in changes.items())
+                    logger.info(f"{entry['home_team']} vs {entry['away_team']}: stats changed - {moved}")
+                    match_data = await self.scrape_match_stats(url, entry['home_team'], entry['away_team'], entry['matchday'])
+                    if match_data:
+                        match_data['match_id'] = match_id
+                        match_data['date'] = entry.get('date')
+                        match_data['home_score'] = entry.get('home_score')
+                        match_data['away_score'] = entry.get('away_score')
+                        match_data['changed_stats'] = changes
+                        updated.append(match_data)
+                        self._cache_match(match_data)
+                    else:
+                        # Keep the old baseline so the next run tries again
+                        continue
+                else:
+                    self.match_index.record_fingerprint(
+                        match_id, digest, response.headers.get('etag'), response.headers.get('last-modified')
+                    )
+            else:
+                logger.warning(f"Revalidation of {url} returned HTTP {status}, retrying next run")
+                continue
+
+            scheduler.record_check(match_id)
+
+        self.match_index.save()
+        logger.info(f"Revalidation done: {len(updated)} of {len(due)} matches had corrected stats")
+        return updated
+
+    async def _capture_player_rows(self, page: Page, match_url: str, team_ids: List[str], stat_tables) -> Optional[str]:
+        """Store all player rows of the already loaded match page as a columnar dataset"""
+        try:
+            table_ids = {}
+            for i, team_id in enumerate(team_ids):
+                side = 'home' if i == 0 else 'away'
+                for table_type, _ in stat_tables:
+                    table_id = f"keeper_stats_{team_id}" if table_type == 'keeper' else f"stats_{team_id}_{table_type}"
+                    table_ids[table_id] = (team_id, side)
+
+            rows_by_table = await self.traced_evaluate(page, "player_rows", PLAYER_ROWS_SCRIPT,
+                                                       js_args(typed=True, tableIds=list(table_ids)))
+
+            dataset = PlayerMatchDataset(MatchIndex.match_id_from_url(match_url) or team_ids[0], match_url)
+            for table_id, rows in rows_by_table.items():
+                team_id, side = table_ids[table_id]
+                dataset.add_table(team_id, side, rows)
+
+            file_path = dataset.save(self.player_data_dir)
+            logger.info(f"Captured {len(dataset)} players -> {file_path}")
+            return file_path
+
+        except Exception as e:
+            logger.warning(f"Player capture failed for {match_url}: {e}")
+            return None
 
     async def scrape_league_standings(self) -> ScrapeResult:
         """For match mode, we scrape all matches instead of just standings"""
@@ -654,44 +870,215 @@ class BundesligaMatchScraper(BaseScraper):
         """For match mode, we scrape all matches instead of just player stats"""
         return await self.scrape_all_matches()
 
-    async def scrape_all_matches(self) -> ScrapeResult:
-        """Scrape all Bundesliga matches for the season"""
+    async def iter_matches(self, match_urls: Optional[List[Dict[str, Any]]] = None,
+                           buffer: int = 8) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield each match record as soon as it is extracted (or read from the result cache), in
+        completion order. The browser must be initialized. At most `buffer` finished records wait
+        for the consumer; beyond that the workers pause, so a slow exporter or writer throttles
+        the crawl instead of piling up records. Leaving the loop early stops the workers.
+        """
+        if match_urls is None:
+            match_urls = await self.get_match_urls()
+            await self.memory_checkpoint("schedule", matches=len(match_urls))
+
+        if not match_urls:
+            raise Exception("No match URLs found")
+
+        # The match index plans the work: pending/failed matches are scraped right away, matches
+        # it marks as scraped come from the result cache (and are only scraped again if expired)
+        pending_ids = {entry['match_id'] for entry in self.match_index.pending()}
+        planned = sum(1 for match_info in match_urls
+                      if MatchIndex.match_id_from_url(match_info['url']) in pending_ids)
+        logger.info(f"Plan: {planned} of {len(match_urls)} matches pending in the match index, "
+                    f"{len(match_urls) - planned} expected in the result cache")
+
+        # Pace is set by the rate limiter: with an AdaptiveRateLimiter the number of
+        # active workers and the request rate follow the server's responses (AIMD).
+        # A fixed RateLimiter grants one slot at a time, i.e. sequential scraping.
+        match_queue = asyncio.Queue()
+        for match_info in match_urls:
+            match_queue.put_nowait(match_info)
+        finished: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+
+        completed = 0
+        yielded = 0
+        from_cache = 0
+        # Up to max_concurrency workers exist, but only as many as the host's current limit
+        # work on a match at a time - after a 429 the extra pipelines stay idle
+        max_workers = getattr(self.rate_limiter, 'max_concurrency', 1)
+        limit_url = match_urls[0]['url']
+        scraper_name = self.__class__.__name__
+        QUEUE_DEPTH.set(match_queue.qsize(), scraper=scraper_name, queue="matches")
+
+        # Context restarts (memory watchdog, dead context) pause the queue until no match is in flight
+        resume = asyncio.Event()
+        resume.set()
+        in_flight = 0
+        attempts: Dict[str, int] = {}
+
+        async def drain_and_reset(reset):
+            """Run reset() - which closes every page of the context - once no worker is inside a match."""
+            if not resume.is_set():
+                await resume.wait()  # Another worker is already resetting
+                return
+            resume.clear()
+            try:
+                while in_flight:
+                    await asyncio.sleep(0.2)
+                await reset()
+            finally:
+                resume.set()
 
-        logger.info("Starting Bundesliga match-by-match scraping...")
+        async def checkpoint():
+            if not resume.is_set():
+                return  # Another worker is already resetting
+            if await self.memory_checkpoint("matches", completed=completed, queued=match_queue.qsize()):
+                await drain_and_reset(self.recycle_context)
 
-        try:
-            # Get all match URLs
-            match_urls = await self.get_match_urls()
+        async def fresh_page(page: Optional[Page]) -> Page:
+            """Replace a worker's page; only if the context itself is gone is it restarted, after draining."""
+            if page is not None and not page.is_closed():
+                try:
+                    await page.close()
+                except Exception:
+                    pass  # Crashed page
+            try:
+                return await self.new_page()
+            except Exception as e:
+                logger.warning(f"Browser context lost ({e}), restarting it once no match is in flight")
+                await drain_and_reset(self.restart_browser)
+                return await self.new_page()
+
+        async def worker(worker_id: int):
+            nonlocal completed, from_cache, in_flight
+            # Own track per worker in the trace
+            TRACER.set_lane(f"worker-{worker_id}")
+            # Every worker has its own page in the shared context, so a failing page is
+            # replaced without touching the pages the other workers are using
+            page = None
+            try:
+                while not match_queue.empty():
+                    await resume.wait()
+                    if in_flight >= self.rate_limiter.concurrency_limit(limit_url):
+                        await asyncio.sleep(0.2)
+                        continue
+                    if page is None or page.is_closed():
+                        # Closed by a context reset (or never opened) - check resume again after the await
+                        page = await fresh_page(page)
+                        continue
+                    if match_queue.empty():
+                        break
+                    # Counted before the next await, so no context reset can start under this match
+                    in_flight += 1
+                    match_info = match_queue.get_nowait()
+                    TRACER.counter("match_queue", depth=match_queue.qsize())
+                    QUEUE_DEPTH.set(match_queue.qsize(), scraper=scraper_name, queue="matches")
+                    match_id = MatchIndex.match_id_from_url(match_info['url'])
+
+                    lost = None
+                    try:
+                        # Parent span of the navigation/extraction spans, so the trace can be searched by match
+                        with TRACER.span("match", cat="match", match_id=match_id, matchday=match_info['matchday']):
+                            # Finished matches outside the correction window come from the cache
+                            match_data = None if match_id in pending_ids else self._cached_match(match_id, match_info)
+                            source = "cache" if match_data else "scraped"
+                            if match_data:
+                                from_cache += 1
+                            else:
+                                match_data = await self.scrape_match_stats(
+                                    match_info['url'],
+                                    match_info['home_team'],
+                                    match_info['away_team'],
+                                    match_info['matchday'],
+                                    page=page
+                                )
+                    except PageLostError as e:
+                        lost = e
+                    finally:
+                        in_flight -= 1
+
+                    if lost is not None:
+                        attempts[match_info['url']] = attempts.get(match_info['url'], 0) + 1
+                        page = await fresh_page(page)
+                        if attempts[match_info['url']] <= self.max_retries:
+                            # Not the match's fault - back into the queue, no failure recorded
+                            logger.warning(f"{lost} - requeueing ({attempts[match_info['url']]}/{self.max_retries})")
+                            match_queue.put_nowait(match_info)
+                            continue
+                        match_data = {}
 
-            if not match_urls:
-                raise Exception("No match URLs found")
+                    if match_data:
+                        match_data['match_id'] = match_id
+                        match_data['date'] = match_info['date']
+                        match_data['home_score'] = match_info['home_score']
+                        match_data['away_score'] = match_info['away_score']
+                        self.match_index.mark_scraped(match_id)
+                        self._cache_match(match_data)
+                    else:
+                        self.match_index.mark_failed(match_id, str(lost) if lost else "No data extracted")
+                        source = "failed"
+
+                    completed += 1
+                    MATCHES_COMPLETED.inc(scraper=scraper_name, source=source)
+                    MATCH_THROUGHPUT.mark(scraper=scraper_name)
+                    if completed % 10 == 0 or completed == len(match_urls):
+                        logger.info(f"Progress {completed}/{len(match_urls)} matches | limits: {self.rate_limiter.describe()}")
+                        self.match_index.save()
+                        if self.memory_watchdog and completed < len(match_urls):
+                            await checkpoint()
 
-            all_match_data = []
+                    if match_data:
+                        # Blocks while the consumer is `buffer` records behind
+                        await finished.put(match_data)
+            finally:
+                if page is not None and not page.is_closed():
+                    await page.close()
+
+        async def run_workers():
+            worker_results = await asyncio.gather(*(worker(worker_id) for worker_id in range(max_workers)),
+                                                  return_exceptions=True)
+            for worker_result in worker_results:
+                if isinstance(worker_result, Exception):
+                    logger.warning(f"Match worker stopped early: {worker_result}")
+            await finished.put(None)  # End of stream
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            while True:
+                match_data = await finished.get()
+                if match_data is None:
+                    break
+                yielded += 1
+                yield match_data
+        finally:
+            if not runner.done():
+                # Consumer left early - stop the workers
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+            self.match_index.save()
 
-            # Process matches in batches to avoid overwhelming the server
-            batch_size = 5
-            for i in range(0, len(match_urls), batch_size):
-                batch = match_urls[i:i + batch_size]
+        logger.info(f"{from_cache} of {len(match_urls)} matches served from the result cache")
+        await self.memory_checkpoint("matches_done", matches=yielded)
 
-                logger.info(f"Processing batch {i//batch_size + 1}/{(len(match_urls) + batch_size - 1)//batch_size}")
+    @traced("scrape_all_matches")
+    async def scrape_all_matches(self) -> ScrapeResult:
+        """Scrape all Bundesliga matches for the season"""
 
-                for match_info in batch:
-                    match_data = await self.scrape_match_stats(
-                        match_info['url'],
-                        match_info['home_team'],
-                        match_info['away_team'],
-                        match_info['matchday']
-                    )
+        logger.info("Starting Bundesliga match-by-match scraping...")
 
-                    if match_data:
-                        all_match_data.append(match_data)
+        try:
+            # Get all match URLs
+            match_urls = await self.get_match_urls()
+            await self.memory_checkpoint("schedule", matches=len(match_urls))
 
-                    # Rate limiting
-                    await asyncio.sleep(2)
+            scraped = [match_data async for match_data in self.iter_matches(match_urls)]
 
-                # Longer pause between batches
-                if i + batch_size < len(match_urls):
-                    await asyncio.sleep(5)
+            # Keep schedule order regardless of which worker finished first
+            schedule_order = {MatchIndex.match_id_from_url(match_info['url']): index
+                              for index, match_info in enumerate(match_urls)}
+            all_match_data = sorted(scraped, key=lambda match_data: schedule_order[match_data['match_id']])
+            logger.info(f"Final limits: {self.rate_limiter.snapshot()}")
 
             return ScrapeResult(
                 sport="Bundesliga",
@@ -712,6 +1099,57 @@ class BundesligaMatchScraper(BaseScraper):
                 error_message=str(e)
             )
 
+    async def scrape_revalidations(self) -> ScrapeResult:
+        """Revalidation run instead of a full crawl: refresh the schedule, re-check due matches only"""
+        try:
+            await self.initialize_browser()
+            await self.get_match_urls()
+            updated = await self.revalidate_matches()
+            return ScrapeResult(
+                sport="Bundesliga",
+                data_type="match_revalidation",
+                data=updated,
+                timestamp=datetime.now(),
+                success=True
+            )
+        except Exception as e:
+            logger.error(f"Error in match revalidation: {e}", exc_info=True)
+            return ScrapeResult(
+                sport="Bundesliga",
+                data_type="match_revalidation",
+                data=[],
+                timestamp=datetime.now(),
+                success=False,
+                error_message=str(e)
+            )
+        finally:
+            await self.close_browser()
+
+    async def iter_results(self) -> AsyncIterator[ScrapeResult]:
+        """One ScrapeResult (data_type "match", a single record) per match as soon as it is extracted"""
+        try:
+            await self.initialize_browser()
+            async for match_data in self.iter_matches():
+                yield ScrapeResult(
+                    sport="Bundesliga",
+                    data_type="match",
+                    data=[match_data],
+                    timestamp=datetime.now(),
+                    success=True
+                )
+        except Exception as e:
+            logger.error(f"Error in match-by-match scraping: {e}", exc_info=True)
+            yield ScrapeResult(
+                sport="Bundesliga",
+                data_type="match_by_match",
+                data=[],
+                timestamp=datetime.now(),
+                success=False,
+                error_message=str(e)
+            )
+        finally:
+            await self.close_browser()
+
     async def scrape_all(self) -> List[ScrapeResult]:
         """Main scraping method"""
         results = []
@@ -6,7 +6,7 @@ Scrapes Bundesliga 2024-2025 Season Data
 from base_scraper import BaseScraper, ScrapeResult, RateLimiter
 from website_analysis import BUNDESLIGA_STRUCTURE
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,11 +23,12 @@ class BundesligaScraper(BaseScraper):
 
         try:
             full_url = f"{self.base_url}{self.league_url}"
-            await self.navigate_to_url(full_url, wait_for_selector="table#results2024-2025201_overall")
+            # Same page as scrape_all_team_stats_from_main_page - loaded once via the snapshot
+            page = await self.load_page(full_url, wait_for_selector="table#results2024-2025201_overall")
 
-            standings_data = await self.extract_table_data("table#results2024-2025201_overall")
+            standings_data = await page.extract_table("table#results2024-2025201_overall")
 
-            team_links = await self.extract_links(
+            team_links = await page.extract_links(
                 self.config["css_selectors"]["team_links"],
                 self.base_url
             )
@@ -63,7 +64,7 @@ class BundesligaScraper(BaseScraper):
 
         try:
             full_url = f"{self.base_url}{self.league_url}"
-            await self.navigate_to_url(full_url, wait_for_selector="table#results2024-2025201_overall")
+            page = await self.load_page(full_url, wait_for_selector="table#results2024-2025201_overall")
 
             # Alle 12 Tabellen-IDs die auf der Hauptseite verfügbar sind
             table_configs = {
@@ -84,24 +85,22 @@ class BundesligaScraper(BaseScraper):
             all_tables = {}
             season = "2024-2025"
 
-            for table_name, table_id in table_configs.items():
-                try:
-                    logger.info(f"Extracting table: {table_name} (#{table_id})")
-                    table_data = await self.extract_table_data(f"table#{table_id}")
-
-                    if table_data:
-                        # Füge Season Information zu jeder Zeile hinzu
-                        for row in table_data:
-                            row['season'] = season
-                            row['table_source'] = table_name
+            # Alle Tabellen in einem Durchlauf extrahieren (ein gemeinsamer Wait statt 12 Timeouts)
+            extracted = await page.extract_tables(
+                {table_name: f"table#{table_id}" for table_name, table_id in table_configs.items()}
+            )
 
-                        all_tables[table_name] = table_data
-                        logger.info(f"Successfully extracted {len(table_data)} rows from {table_name}")
-                    else:
-                        logger.warning(f"No data found for table {table_name} (#{table_id})")
+            for table_name, table_data in extracted.items():
+                if table_data:
+                    # Füge Season Information zu jeder Zeile hinzu
+                    for row in table_data:
+                        row['season'] = season
+                        row['table_source'] = table_name
 
-                except Exception as e:
-                    logger.warning(f"Could not extract {table_name} (#{table_id}): {e}")
+                    all_tables[table_name] = table_data
+                    logger.info(f"Successfully extracted {len(table_data)} rows from {table_name}")
+                else:
+                    logger.warning(f"No data found for table {table_name} (#{table_configs[table_name]})")
 
             result_data = [{
                 "season": season,
@@ -130,30 +129,30 @@ class BundesligaScraper(BaseScraper):
                 error_message=str(e)
             )
 
-    async def scrape_all(self) -> List[ScrapeResult]:
+    async def iter_results(self) -> AsyncIterator[ScrapeResult]:
         """Überschreibt die Standard-Methode um alle Team-Stats von der Hauptseite zu scrapen"""
-        results = []
+        produced = 0
 
         try:
             await self.initialize_browser()
 
             # Scrape die Bundesliga-Tabelle für Links
             standings = await self.scrape_league_standings()
-            results.append(standings)
+            produced += 1
+            yield standings
 
             # Scrape alle Team-Statistiken direkt von der Hauptseite (anstatt einzelne Team-Seiten zu besuchen)
             all_team_stats = await self.scrape_all_team_stats_from_main_page()
-            results.append(all_team_stats)
+            produced += 1
+            yield all_team_stats
 
-            logger.info(f"✅ Bundesliga scraping completed with {len(results)} result sets")
+            logger.info(f"✅ Bundesliga scraping completed with {produced} result sets")
 
         except Exception as e:
             logger.error(f"Error in Bundesliga scrape_all: {e}", exc_info=True)
         finally:
             await self.close_browser()
 
-        return results
-
     async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
         """Dummy-Implementierung - wird nicht mehr verwendet"""
         logger.warning("scrape_team_stats is deprecated - use scrape_all_team_stats_from_main_page instead")
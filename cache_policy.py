@@ -0,0 +1,159 @@
+"""
+Cache Policy - Cache-Lebensdauer pro URL-Typ und Zustand
+Abgeschlossene Spiele, Spieltage und Saisons ändern sich nicht mehr: sie bekommen eine unendliche TTL
+und werden nie erneut geladen. Laufende Inhalte (Spielplan, aktuelle Tabelle) werden regelmäßig erneuert.
+"""
+
+import gzip
+import json
+import re
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Any, Callable
+from urllib.parse import urlparse
+from revalidation import REVALIDATION_DAYS
+
+logger = logging.getLogger(__name__)
+
+KIND_FIXTURES = "fixtures"
+KIND_MATCH = "match"
+KIND_STANDINGS = "standings"
+KIND_TEAM = "team"
+KIND_STATHEAD_QUERY = "stathead_query"
+KIND_TINY_URL = "tiny_url"
+KIND_OTHER = "other"
+
+STATE_FINAL = "final"        # match past the correction window / page fetched complete - never changes
+STATE_RECENT = "recent"      # finished match inside the fbref stat correction window
+STATE_UPCOMING = "upcoming"  # match without a result yet
+STATE_CURRENT = "current"    # live schedule, current table, everything else
+
+DEFAULT_TTLS = {
+    KIND_FIXTURES: timedelta(hours=12),
+    KIND_MATCH: timedelta(hours=24),
+    KIND_STANDINGS: timedelta(hours=6),
+    KIND_TEAM: timedelta(hours=6),
+    KIND_STATHEAD_QUERY: timedelta(hours=12),
+    KIND_TINY_URL: timedelta(days=7),
+    KIND_OTHER: timedelta(0)
+}
+UPCOMING_MATCH_TTL = timedelta(hours=1)
+
+@dataclass(frozen=True)
+class CachePolicy:
+    kind: str
+    state: str
+    ttl: Optional[timedelta]  # None = immutable
+
+    @property
+    def immutable(self) -> bool:
+        return self.ttl is None
+
+    def is_fresh(self, fetched_at: Optional[datetime], now: Optional[datetime] = None) -> bool:
+        if fetched_at is None:
+            return False
+        if self.ttl is None:
+            return True
+        return (now or datetime.now()) - fetched_at < self.ttl
+
+class CachePolicyEngine:
+    """
+    Classifies URLs by type and state and assigns the TTL.
+
+    The URL only says what a page is (fbref match, schedule, league or squad page, kicker
+    table, Stathead query or short link). Whether it can still change comes from the content:
+    whether a match is finished and when it was played, or whether the matchday/season behind
+    a table or schedule was complete when the page was fetched. Callers store that state with
+    the cached entry (see ResultCache.put); a season in the URL never makes a page final.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, timedelta]] = None,
+                 correction_window: timedelta = timedelta(days=max(REVALIDATION_DAYS)),
+                 now_fn: Callable[[], datetime] = datetime.now):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.correction_window = correction_window
+        self.now_fn = now_fn
+
+    @staticmethod
+    def kind_of(url: str) -> str:
+        parts = urlparse(url)
+        host, path = parts.netloc, parts.path
+        if 'stathead.com' in host:
+            return KIND_TINY_URL if path.startswith('/tiny/') else KIND_STATHEAD_QUERY
+        if 'kicker.de' in host and '/tabelle' in path:
+            return KIND_STANDINGS
+        if '/matches/' in path:
+            return KIND_MATCH
+        if '/schedule/' in path or 'Scores-and-Fixtures' in path:
+            return KIND_FIXTURES
+        if '/squads/' in path or '/teams/' in path:
+            return KIND_TEAM
+        if '/comps/' in path or '/years/' in path or '/leagues/' in path:
+            return KIND_STANDINGS
+        return KIND_OTHER
+
+    def classify(self, url: str, finished: Optional[bool] = None, played_at: Optional[datetime] = None,
+                 complete: Optional[bool] = None) -> CachePolicy:
+        kind = self.kind_of(url)
+
+        if kind == KIND_MATCH:
+            if finished is False:
+                return CachePolicy(kind, STATE_UPCOMING, UPCOMING_MATCH_TTL)
+            if played_at is not None and self.now_fn() - played_at > self.correction_window:
+                return CachePolicy(kind, STATE_FINAL, None)
+            if finished:
+                return CachePolicy(kind, STATE_RECENT, self.ttls[kind])
+            return CachePolicy(kind, STATE_UPCOMING, UPCOMING_MATCH_TTL)
+
+        if kind in (KIND_FIXTURES, KIND_STANDINGS, KIND_TEAM) and complete:
+            return CachePolicy(kind, STATE_FINAL, None)
+
+        return CachePolicy(kind, STATE_CURRENT, self.ttls[kind])
+
+    def is_fresh(self, url: str, fetched_at: Optional[datetime], **state) -> bool:
+        return self.classify(url, **state).is_fresh(fetched_at, self.now_fn())
+
+# Shared by the scrapers and their on-disk caches
+DEFAULT_POLICY = CachePolicyEngine()
+
+class ResultCache:
+    """
+    Extracted page results as <directory>/<key>.json.gz, stored with their URL, fetch time and
+    the content state at fetch time (finished/played_at/complete). get() asks the policy whether
+    the entry is still valid for that stored state, so a table cached before its matchday was
+    complete keeps its TTL.
+    """
+
+    def __init__(self, directory: str = "result_cache", policy: CachePolicyEngine = DEFAULT_POLICY):
+        self.directory = Path(directory)
+        self.policy = policy
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}.json.gz"
+
+    def get(self, key: str, url: str) -> Optional[Any]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cache entry {path}: {e}")
+            return None
+        state = dict(entry.get('state') or {})
+        if state.get('played_at'):
+            state['played_at'] = datetime.fromisoformat(state['played_at'])
+        if not self.policy.is_fresh(url, datetime.fromisoformat(entry['fetched_at']), **state):
+            return None
+        return entry['data']
+
+    def put(self, key: str, url: str, data: Any, finished: Optional[bool] = None,
+            played_at: Optional[datetime] = None, complete: Optional[bool] = None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        state = {'finished': finished, 'played_at': played_at.isoformat() if played_at else None, 'complete': complete}
+        entry = {'url': url, 'fetched_at': datetime.now().isoformat(), 'state': state, 'data': data}
+        with gzip.open(self._path(key), 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
@@ -5,6 +5,7 @@ Testet mehrere Matches über verschiedene Spieltage + Kicker.de Integration
 """
 
 import asyncio
+import argparse
 import sys
 from bundesliga_match_scraper import BundesligaMatchScraper
 from match_excel_exporter import MatchExcelExporter
@@ -12,14 +13,20 @@ from base_scraper import RateLimiter
 import pandas as pd
 from datetime import datetime
 
-async def extended_integration_test():
+async def extended_integration_test(attach: str = None):
     print("=" * 100)
     print("🧪 AUSFÜHRLICHER INTEGRATION TEST - Bundesliga Match Scraper + Kicker.de")
     print("=" * 100)
     print(f"Start: {datetime.now().strftime('%H:%M:%S')}\n")
 
     rate_limiter = RateLimiter(requests_per_minute=10)
-    scraper = BundesligaMatchScraper(rate_limiter)
+    if attach:
+        # Same calls, run as jobs on a browser_service.py (warm browser, shared rate limits)
+        from browser_service import AttachedMatchScraper
+        scraper = AttachedMatchScraper(attach)
+        print(f"🔌 Browser-Service: {attach}")
+    else:
+        scraper = BundesligaMatchScraper(rate_limiter)
 
     # Phase 1: Match URLs laden
     print("📋 PHASE 1: Match URLs laden")
@@ -312,8 +319,13 @@ async def extended_integration_test():
 if __name__ == "__main__":
     import os
 
+    parser = argparse.ArgumentParser(description='Ausführlicher Integrationstest (Match Scraper + Kicker.de)')
+    parser.add_argument('--attach', type=str, default=None, metavar='HOST:PORT',
+                        help='Scrape on a running browser_service.py (token from BROWSER_SERVICE_TOKEN)')
+    args = parser.parse_args()
+
     try:
-        success = asyncio.run(extended_integration_test())
+        success = asyncio.run(extended_integration_test(args.attach))
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️  Test abgebrochen")
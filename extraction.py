@@ -0,0 +1,332 @@
+"""
+Extraction Runtime - gemeinsame Tabellen-Extraktion für alle Scraper
+Mit typed=True werden Zahlen direkt im Browser (bzw. im Offline-Parser) anhand der data-stat Spalte
+geparst: Tausender-Kommas, %, Minuszeichen (auch U+2212) und leere Zellen werden einheitlich behandelt.
+Ohne typed liefern die Skripte wie bisher den getrimmten Zelltext ("" für leere Zellen).
+"""
+
+import re
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, List, Optional, Any
+from bs4 import BeautifulSoup, Comment
+
+# data-stat columns that always stay text, even if they look numeric (e.g. dates, ages "29-120")
+TEXT_STATS = {
+    'player', 'squad', 'team', 'team_name', 'name_display', 'opponent', 'nationality', 'position', 'pos',
+    'age', 'birth_date', 'date', 'date_game', 'dayofweek', 'start_time', 'round', 'gameweek',
+    'home_team', 'away_team', 'score', 'venue', 'referee', 'match_report', 'notes',
+    'last_5', 'top_team_scorers', 'top_keeper', 'college_id', 'awards', 'season', 'lg_id'
+}
+
+NUMBER_PATTERN = re.compile(r'^[+-]?(\d+(\.\d*)?|\.\d+)%?$')
+
+def parse_cell(value: Any, stat: Optional[str] = None, typed: bool = True) -> Any:
+    """
+    Python twin of the browser parser: '1,234' -> 1234.0, '45.2%' -> 45.2, '−3' -> -3.0, '' -> None.
+    With typed=False the trimmed text is returned unchanged ('' stays '').
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = value.strip()
+    if not typed:
+        return text
+    if not text:
+        return None
+    if stat in TEXT_STATS:
+        return text
+    clean = text.replace(',', '').replace('−', '-')
+    if not NUMBER_PATTERN.match(clean):
+        return text
+    return float(clean.rstrip('%'))
+
+# Browser side of parse_cell - expects `textStats` (array of column names) and `typed` in scope
+CELL_PARSER_JS = r'''
+    const textStatSet = new Set(textStats || []);
+    const numberPattern = /^[+-]?(\d+(\.\d*)?|\.\d+)%?$/;
+    const parseCell = (raw, stat) => {
+        const text = raw.trim();
+        if (!typed) return text;
+        if (text === '') return null;
+        if (textStatSet.has(stat)) return text;
+        const clean = text.replace(/,/g, '').replace(/−/g, '-');
+        if (!numberPattern.test(clean)) return text;
+        return parseFloat(clean.replace('%', ''));
+    };
+'''
+
+# Table walkers shared by the single and batch scripts - expect parseCell in scope
+TABLE_HELPERS_JS = '''
+    // Rows as {data-stat: value}
+    const extractRows = (table) => {
+        const rows = Array.from(table.querySelectorAll('tbody tr')).map(row => {
+            const rowData = {};
+            row.querySelectorAll('td, th').forEach(cell => {
+                const stat = cell.getAttribute('data-stat');
+                if (stat) {
+                    rowData[stat] = parseCell(cell.textContent, stat);
+                }
+            });
+            return rowData;
+        });
+        return rows.filter(row => Object.keys(row).length > 0);
+    };
+
+    // Compact variant: one header list plus value arrays per row; [row, column] pairs of cells
+    // a row does not have (holes before its last cell) go to `missing`
+    const extractRecords = (table) => {
+        const header = [];
+        const index = {};
+        const rows = [];
+        const missing = [];
+        table.querySelectorAll('tbody tr').forEach(row => {
+            const values = [];
+            row.querySelectorAll('td, th').forEach(cell => {
+                const stat = cell.getAttribute('data-stat');
+                if (!stat) return;
+                let i = index[stat];
+                if (i === undefined) {
+                    i = header.length;
+                    index[stat] = i;
+                    header.push(stat);
+                }
+                values[i] = parseCell(cell.textContent, stat);
+            });
+            if (values.length === 0) return;
+            for (let i = 0; i < values.length; i++) {
+                if (values[i] === undefined) missing.push([rows.length, i]);
+            }
+            rows.push(Array.from(values, v => v === undefined ? null : v));
+        });
+        return {header, rows, missing};
+    };
+'''
+
+# Rows of a table as {data-stat: value}; args: {selector, textStats, typed}
+TABLE_ROWS_SCRIPT = '''
+    ({selector, textStats, typed}) => {''' + CELL_PARSER_JS + TABLE_HELPERS_JS + '''
+        const table = document.querySelector(selector);
+        return table ? extractRows(table) : [];
+    }
+'''
+
+# Team totals (tfoot) or first keeper row of a match table; args: {tableId, isKeeper, textStats, typed}
+TEAM_TOTALS_SCRIPT = '''
+    ({tableId, isKeeper, textStats, typed}) => {''' + CELL_PARSER_JS + '''
+        const table = document.getElementById(tableId);
+        if (!table) return {};
+
+        const rows = table.querySelectorAll('tbody tr[data-row]');
+        if (rows.length === 0) return {};
+
+        let dataRow = null;
+        if (isKeeper) {
+            // For goalkeeper stats: Take first row (the goalkeeper)
+            dataRow = rows[0];
+        } else {
+            // For player stats: FBRef puts the team totals in <tfoot><tr> with data-stat cells
+            const tfootRow = table.querySelector('tfoot tr');
+            if (tfootRow && tfootRow.querySelectorAll('[data-stat]').length > 0) {
+                dataRow = tfootRow;
+            } else {
+                // Fallback: use last row in tbody if no tfoot
+                dataRow = rows[rows.length - 1];
+            }
+        }
+
+        const rowData = {};
+        dataRow.querySelectorAll('td, th').forEach(cell => {
+            const stat = cell.getAttribute('data-stat');
+            if (stat && stat !== 'player') {
+                const value = parseCell(cell.textContent, stat);
+                if (value !== null && value !== '') rowData[stat] = value;
+            }
+        });
+        return rowData;
+    }
+'''
+
+# Header + value arrays per row; args: {selector, textStats, typed}
+TABLE_RECORDS_SCRIPT = '''
+    ({selector, textStats, typed}) => {''' + CELL_PARSER_JS + TABLE_HELPERS_JS + '''
+        const table = document.querySelector(selector);
+        return table ? extractRecords(table) : {header: [], rows: [], missing: []};
+    }
+'''
+
+# Several tables in one round trip, null for missing ones; args: {selectors, compact, textStats, typed}
+TABLES_SCRIPT = '''
+    ({selectors, compact, textStats, typed}) => {''' + CELL_PARSER_JS + TABLE_HELPERS_JS + '''
+        const result = {};
+        selectors.forEach(selector => {
+            const table = document.querySelector(selector);
+            result[selector] = table ? (compact ? extractRecords(table) : extractRows(table)) : null;
+        });
+        return result;
+    }
+'''
+
+# Resolves once every selector matches; args: selectors
+ALL_PRESENT_SCRIPT = '(selectors) => selectors.every(selector => document.querySelector(selector) !== null)'
+
+# Placeholder for a cell the row does not have (distinct from a blank cell parsed to None)
+_MISSING = object()
+
+class RowView(MutableMapping):
+    """
+    Dict-like view on one row of a TableRecords payload; values are read from the row list on access.
+    Keys are exactly the cells the row has, so `in`, len(), iteration and dict() behave like the row
+    dicts of payload="rows".
+    """
+
+    __slots__ = ('_table', '_values')
+
+    def __init__(self, table: 'TableRecords', values: List[Any]):
+        self._table = table
+        self._values = values
+
+    def _has(self, idx: int) -> bool:
+        return idx < len(self._values) and self._values[idx] is not _MISSING
+
+    def __getitem__(self, name: str) -> Any:
+        idx = self._table.index.get(name)
+        if idx is None or not self._has(idx):
+            raise KeyError(name)
+        return self._values[idx]
+
+    def __setitem__(self, name: str, value: Any):
+        idx = self._table.add_column(name)
+        if idx >= len(self._values):
+            self._values.extend([_MISSING] * (idx + 1 - len(self._values)))
+        self._values[idx] = value
+
+    def __delitem__(self, name: str):
+        idx = self._table.index.get(name)
+        if idx is None or not self._has(idx):
+            raise KeyError(name)
+        self._values[idx] = _MISSING
+
+    def __iter__(self):
+        return (name for idx, name in enumerate(self._table.header) if self._has(idx))
+
+    def __len__(self):
+        return sum(1 for idx in range(len(self._table.header)) if self._has(idx))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class TableRecords(Sequence):
+    """
+    Table as one header plus value lists per row (the TABLE_RECORDS_SCRIPT payload).
+    Indexing and iteration yield RowView objects, so callers that expect row dicts keep working.
+    `missing` lists the [row, column] cells a row does not have; column() reads them as None.
+    """
+
+    def __init__(self, header: List[str], rows: List[List[Any]], missing: Optional[List[List[int]]] = None):
+        self.header = list(header)
+        self.index = {name: i for i, name in enumerate(self.header)}
+        self.rows = rows
+        for row, idx in missing or ():
+            rows[row][idx] = _MISSING
+
+    def add_column(self, name: str) -> int:
+        idx = self.index.get(name)
+        if idx is None:
+            idx = len(self.header)
+            self.header.append(name)
+            self.index[name] = idx
+        return idx
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [RowView(self, values) for values in self.rows[i]]
+        return RowView(self, self.rows[i])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name: str) -> List[Any]:
+        idx = self.index[name]
+        return [values[idx] if idx < len(values) and values[idx] is not _MISSING else None for values in self.rows]
+
+    def to_columns(self) -> Dict[str, List[Any]]:
+        return {name: self.column(name) for name in self.header}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self]
+
+def js_args(typed: bool = False, **kwargs) -> Dict[str, Any]:
+    """
+    Arguments for the scripts above, with the shared text column list. typed=True parses numbers
+    (FBref match tables); the default keeps the plain cell text the sports scrapers always returned.
+    """
+    return {'textStats': sorted(TEXT_STATS), 'typed': typed, **kwargs}
+
+def _find_table(soup: BeautifulSoup, selector: str):
+    table = soup.select_one(selector)
+    if table is not None:
+        return table
+    # sports-reference ships many secondary tables inside HTML comments until scrolled into view
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment) and '<table' in text):
+        table = BeautifulSoup(comment, 'html.parser').select_one(selector)
+        if table is not None:
+            return table
+    return None
+
+def _rows_from_table(table, typed: bool = False) -> List[Dict[str, Any]]:
+    rows = []
+    for row in table.select('tbody tr'):
+        row_data = {}
+        for cell in row.find_all(['td', 'th']):
+            stat = cell.get('data-stat')
+            if stat:
+                row_data[stat] = parse_cell(cell.get_text(), stat, typed)
+        if row_data:
+            rows.append(row_data)
+    return rows
+
+def records_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Row dicts as the TABLE_RECORDS_SCRIPT payload: {header, rows, missing}."""
+    header: List[str] = []
+    index: Dict[str, int] = {}
+    records = []
+    missing = []
+    for row in rows:
+        values = []
+        for stat, value in row.items():
+            idx = index.setdefault(stat, len(header))
+            if idx == len(header):
+                header.append(stat)
+            values.extend([_MISSING] * (idx + 1 - len(values)))
+            values[idx] = value
+        missing.extend([len(records), idx] for idx, value in enumerate(values) if value is _MISSING)
+        records.append([None if value is _MISSING else value for value in values])
+    return {'header': header, 'rows': records, 'missing': missing}
+
+def extract_rows_from_html(html: str, selector: str, typed: bool = False) -> List[Dict[str, Any]]:
+    """Offline equivalent of TABLE_ROWS_SCRIPT for stored page HTML."""
+    table = _find_table(BeautifulSoup(html, 'html.parser'), selector)
+    return _rows_from_table(table, typed) if table is not None else []
+
+def extract_tables_from_html(html: str, selectors: List[str], compact: bool = False,
+                             typed: bool = False) -> Dict[str, Any]:
+    """Offline equivalent of TABLES_SCRIPT: parses the HTML once, None for missing tables."""
+    soup = BeautifulSoup(html, 'html.parser')
+    result = {}
+    for selector in selectors:
+        table = _find_table(soup, selector)
+        if table is None:
+            result[selector] = None
+        elif compact:
+            result[selector] = records_from_rows(_rows_from_table(table, typed))
+        else:
+            result[selector] = _rows_from_table(table, typed)
+    return result
+
+def extract_links_from_html(html: str, selector: str, base_url: str) -> List[str]:
+    """Offline equivalent of BaseScraper.extract_links."""
+    links = []
+    for element in BeautifulSoup(html, 'html.parser').select(selector):
+        href = element.get('href')
+        if href:
+            links.append(href if href.startswith('http') else base_url + href)
+    return links
@@ -11,6 +11,7 @@ Testet ALLE Kundenanforderungen:
 """
 
 import asyncio
+import argparse
 import sys
 import os
 from bundesliga_match_scraper import BundesligaMatchScraper
@@ -18,7 +19,7 @@ from match_excel_exporter import MatchExcelExporter
 from base_scraper import RateLimiter
 import pandas as pd
 
-async def final_test():
+async def final_test(attach: str = None):
     print("=" * 100)
     print("🧪 FINALER KOMPLETTER TEST - BUNDESLIGA MATCH SCRAPER")
     print("=" * 100)
@@ -29,7 +30,13 @@ async def final_test():
     print("-" * 100)
 
     rate_limiter = RateLimiter(requests_per_minute=10)
-    scraper = BundesligaMatchScraper(rate_limiter)
+    if attach:
+        # Same calls, run as jobs on a browser_service.py (warm browser, shared rate limits)
+        from browser_service import AttachedMatchScraper
+        scraper = AttachedMatchScraper(attach)
+        print(f"🔌 Browser-Service: {attach}")
+    else:
+        scraper = BundesligaMatchScraper(rate_limiter)
 
     print("✓ Navigiere zu Bundesliga 2024-25 Scores & Fixtures...")
     matches = await scraper.get_match_urls()
@@ -241,8 +248,13 @@ async def final_test():
     return passed == total
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Finaler Komplett-Test des Bundesliga Match Scrapers')
+    parser.add_argument('--attach', type=str, default=None, metavar='HOST:PORT',
+                        help='Scrape on a running browser_service.py (token from BROWSER_SERVICE_TOKEN)')
+    args = parser.parse_args()
+
     try:
-        success = asyncio.run(final_test())
+        success = asyncio.run(final_test(args.attach))
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️  Test abgebrochen durch Benutzer")
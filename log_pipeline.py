@@ -0,0 +1,151 @@
+"""
+Log Pipeline - nicht-blockierendes Logging für die Scraper
+Log-Records gehen über eine Queue an einen Listener-Thread (Datei/Konsole); der Event-Loop schreibt nie selbst.
+JSON-Zeilen für die Datei, Sampling pro Logger und Rate-Limit für sich wiederholende Meldungen.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Loggers whose INFO/DEBUG output is only kept for every n-th record (1.0 = all, 0.1 = every 10th)
+DEFAULT_SAMPLE_RATES = {
+    'match_excel_exporter.mapping': 0.1
+}
+
+# At most this many records per message template and window; the rest is counted and summarized
+DEFAULT_RATE_LIMIT = (20, 60.0)
+
+# Attributes every LogRecord has - everything else came in via extra={...}
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+# Numbers and fbref IDs vary between otherwise identical messages
+_VARIABLE_PARTS = re.compile(r'\b[0-9a-f]{8}\b|\d+(\.\d+)?')
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields and exception text."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Keeps every n-th INFO/DEBUG record of the configured loggers; warnings and errors always pass."""
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.every = {name: max(1, round(1 / rate)) for name, rate in sample_rates.items() if rate > 0}
+        self.counters: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        every = self.every.get(record.name)
+        if not every or every == 1:
+            return True
+        with self.lock:
+            count = self.counters.get(record.name, 0)
+            self.counters[record.name] = count + 1
+        return count % every == 0
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most max_records records per message template (logger, level, message with
+    numbers/IDs masked) within window seconds. When a new window opens, the first record notes
+    how many similar messages were suppressed in the previous one.
+    """
+
+    def __init__(self, max_records: int = 20, window: float = 60.0):
+        super().__init__()
+        self.max_records = max_records
+        self.window = window
+        self.state: Dict[Tuple[str, int, str], List[float]] = {}  # key -> [window start, count, suppressed]
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        key = (record.name, record.levelno, _VARIABLE_PARTS.sub('#', str(record.msg)))
+        now = time.monotonic()
+        with self.lock:
+            state = self.state.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = int(state[2]) if state else 0
+                self.state[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.max_records:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+class TextFormatter(logging.Formatter):
+    """Classic text lines; notes the suppressed count (JSON output carries it as a field)."""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, 'suppressed', None)
+        return f"{text} (+{suppressed} similar messages suppressed)" if suppressed else text
+
+def setup_logging(log_file: Optional[str] = None, json_file: bool = True, json_console: bool = False,
+                  level: int = logging.INFO, sample_rates: Optional[Dict[str, float]] = None,
+                  rate_limit: Optional[Tuple[int, float]] = DEFAULT_RATE_LIMIT) -> QueueListener:
+    """
+    Route all logging through a queue: callers only enqueue, a listener thread formats and writes
+    to the console and (optionally) log_file. Replaces any handlers configured before.
+    Returns the running listener; it is stopped (and flushed) at interpreter exit.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(DEFAULT_SAMPLE_RATES if sample_rates is None else sample_rates))
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(*rate_limit))
+
+    console = logging.StreamHandler()
+    console.setFormatter(JsonFormatter() if json_console else TextFormatter())
+    handlers = [console]
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter() if json_file else TextFormatter())
+        handlers.append(file_handler)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
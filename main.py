@@ -2,6 +2,7 @@
 Multi-Sport Scraper - Main Orchestrator
 Scrapes Bundesliga, NFL, NBA, NHL, MLB and exports to Excel
 Enhanced with Stathead premium data integration
+Sports run concurrently in one shared browser (one context per sport)
 
 Usage:
     python main.py
@@ -10,10 +11,15 @@ Usage:
     python main.py --sports nfl --stathead
     python main.py --headless False
     python main.py --output custom_stats.xlsx
+    python main.py --attach 127.0.0.1:8765 --sports nfl nba
+    python main.py --sports nfl nba --trace scrape_trace.json
+    python main.py --metrics-textfile /var/lib/node_exporter/textfile/scraper.prom
+    python main.py --sports nfl nba --stream ndjson | my_loader
 """
 
 import asyncio
 import argparse
+import inspect
 import sys
 import os
 from bundesliga_scraper import BundesligaScraper
@@ -21,13 +27,14 @@ from nfl_scraper import NFLScraper
 from nba_nhl_mlb_scrapers import NBAScraper, NHLScraper, MLBScraper
 from stathead_scraper import StatheadBaseballScraper, StatheadBasketballScraper, StatheadNFLScraper, StatheadNHLScraper
 from excel_exporter import ExcelExporter
-from base_scraper import RateLimiter
+from base_scraper import AdaptiveRateLimiter, launch_browser
+from playwright.async_api import async_playwright
+from log_pipeline import setup_logging
+from tracing import TRACER
+from metrics import METRICS, start_exporters
+from ndjson_stream import NdjsonWriter
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 AVAILABLE_SCRAPERS = {
@@ -38,6 +45,8 @@ AVAILABLE_SCRAPERS = {
     "mlb": MLBScraper
 }
 
+DEFAULT_SERVICE_PORT = 8765
+
 STATHEAD_SCRAPERS = {
     "baseball": StatheadBaseballScraper,
     "basketball": StatheadBasketballScraper,
@@ -45,17 +54,38 @@ STATHEAD_SCRAPERS = {
     "nhl": StatheadNHLScraper
 }
 
-async def scrape_sport(scraper_class, rate_limiter, headless):
+def attach_scraper(scraper, browser=None, storage_states=None):
+    """Put a scraper into a shared browser and hand it the cookies its class left there last time."""
+    if browser:
+        scraper.use_shared_browser(browser)
+    if storage_states is not None:
+        scraper.storage_state = storage_states.get(scraper.__class__.__name__)
+
+async def emit(on_result, result):
+    """Hand one result to on_result; coroutine callbacks (e.g. a socket writer that drains) are awaited."""
+    if on_result:
+        outcome = on_result(result)
+        if inspect.isawaitable(outcome):
+            await outcome
+
+async def scrape_sport(scraper_class, rate_limiter, headless, browser=None, storage_states=None, on_result=None):
     scraper = scraper_class(rate_limiter, headless)
+    attach_scraper(scraper, browser, storage_states)
     logger.info(f"\n{'='*60}\nStarting {scraper_class.__name__}\n{'='*60}")
 
-    results = await scraper.scrape_all()
+    results = []
+    async for result in scraper.iter_results():
+        results.append(result)
+        await emit(on_result, result)
+    if storage_states is not None and scraper.storage_state:
+        storage_states[scraper_class.__name__] = scraper.storage_state
 
     logger.info(f"\n{scraper_class.__name__} completed: {len(results)} results")
     return results
 
-async def scrape_stathead_sport(scraper_class, rate_limiter, headless):
+async def scrape_stathead_sport(scraper_class, rate_limiter, headless, browser=None, storage_states=None, on_result=None):
     scraper = scraper_class(rate_limiter, headless)
+    attach_scraper(scraper, browser, storage_states)
     logger.info(f"\n{'='*60}\nStarting Stathead {scraper_class.__name__}\n{'='*60}")
 
     results = []
@@ -64,19 +94,71 @@ async def scrape_stathead_sport(scraper_class, rate_limiter, headless):
 
         standings_result = await scraper.scrape_league_standings()
         results.append(standings_result)
+        await emit(on_result, standings_result)
 
         team_stats_result = await scraper.scrape_team_stats()
         if team_stats_result.success and team_stats_result.data:
             results.append(team_stats_result)
+            await emit(on_result, team_stats_result)
 
+    except ConnectionError:
+        # The browser service client is gone (raised by on_result) - no point in scraping on
+        raise
     except Exception as e:
         logger.error(f"Error in Stathead {scraper_class.__name__}: {e}")
     finally:
         await scraper.close_browser()
+        if storage_states is not None and scraper.storage_state:
+            storage_states[scraper_class.__name__] = scraper.storage_state
 
     logger.info(f"\nStathead {scraper_class.__name__} completed: {len(results)} results")
     return results
 
+async def scrape_stathead_all(rate_limiter, headless, browser=None, storage_states=None, on_result=None):
+    # All Stathead scrapers hit stathead.com with the same account - keep them sequential
+    results = []
+    for sport_name, scraper_class in STATHEAD_SCRAPERS.items():
+        try:
+            results.extend(await scrape_stathead_sport(scraper_class, rate_limiter, headless, browser, storage_states,
+                                                       on_result))
+        except ConnectionError:
+            raise
+        except Exception as e:
+            logger.error(f"Error scraping Stathead {sport_name}: {e}", exc_info=True)
+    return results
+
+async def run_concurrently(jobs: dict, on_complete):
+    """
+    Run the sport coroutines side by side and call on_complete(name, results) as each finishes,
+    so the slowest sport determines the wall time instead of the sum of all.
+
+    on_complete only collects and reports - main() writes the Excel file once at the end with
+    every finished sport, and the browser service streams the results to its client.
+    """
+    async def run(name, job):
+        # Every run is its own task, so every sport gets its own trace lane
+        TRACER.set_lane(name)
+        try:
+            with TRACER.span(f"sport:{name}"):
+                return name, await job
+        except ConnectionError:
+            # Lost the client of a browser service job - the whole job is over, not just this sport
+            raise
+        except Exception as e:
+            logger.error(f"Error scraping {name}: {e}", exc_info=True)
+            return name, []
+
+    tasks = [asyncio.create_task(run(name, job), name=f"sport:{name}") for name, job in jobs.items()]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            name, results = await finished
+            await on_complete(name, results)
+    finally:
+        # A lost client, a failing on_complete or cancellation stops the sports still running
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 async def main():
     parser = argparse.ArgumentParser(description='Multi-Sport Web Scraper with Stathead Integration')
     parser.add_argument('--sports', nargs='+', default=list(AVAILABLE_SCRAPERS.keys()),
@@ -90,48 +172,99 @@ async def main():
                         help='Output Excel filename')
     parser.add_argument('--rate-limit', type=int, default=10,
                         help='Requests per minute (default: 10)')
+    parser.add_argument('--attach', type=str, default=None, metavar='HOST:PORT',
+                        help=f'Submit the job to a running browser_service.py (e.g. 127.0.0.1:{DEFAULT_SERVICE_PORT}; '
+                             f'token from BROWSER_SERVICE_TOKEN)')
+    parser.add_argument('--trace', type=str, default=None, metavar='FILE',
+                        help='Write a Chrome trace of the run (open in ui.perfetto.dev or chrome://tracing)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run')
+    parser.add_argument('--metrics-textfile', type=str, default=None, metavar='FILE',
+                        help='Write Prometheus metrics to FILE for the node-exporter textfile collector')
+    parser.add_argument('--stream', type=str, default=None, choices=['ndjson'],
+                        help='Also write every result as one JSON line as soon as it is scraped (schema: ndjson_stream.py)')
+    parser.add_argument('--stream-file', type=str, default=None, metavar='FILE',
+                        help='Target of --stream (default: stdout; logs go to stderr)')
 
     args = parser.parse_args()
 
     headless = args.headless.lower() == 'true'
-    rate_limiter = RateLimiter(requests_per_minute=args.rate_limit)
+    if args.trace:
+        TRACER.enable()
+    # Per-host budgets: every sport runs on its own site, so they don't share a rate budget
+    rate_limiter = AdaptiveRateLimiter(requests_per_minute=args.rate_limit)
 
     logger.info(f"\n{'='*80}")
     logger.info(f"MULTI-SPORT SCRAPER STARTING")
     logger.info(f"Sports: {', '.join(args.sports)}")
     logger.info(f"Stathead: {args.stathead}")
     logger.info(f"Headless: {headless}")
-    logger.info(f"Rate Limit: {args.rate_limit} req/min")
+    logger.info(f"Rate Limit: {args.rate_limit} req/min per host (adaptive)")
     logger.info(f"{'='*80}\n")
 
-    all_results = []
-
-    # Scrape regular sports data
-    for sport in args.sports:
-        scraper_class = AVAILABLE_SCRAPERS[sport]
-        try:
-            results = await scrape_sport(scraper_class, rate_limiter, headless)
-            all_results.extend(results)
-        except Exception as e:
-            logger.error(f"Error scraping {sport}: {e}", exc_info=True)
-
-    # Scrape Stathead premium data if requested
     if args.stathead:
         if not os.getenv('STATHEAD_USERNAME') or not os.getenv('STATHEAD_PASSWORD'):
             logger.warning("Stathead credentials not found in environment variables")
             logger.info("Set STATHEAD_USERNAME and STATHEAD_PASSWORD or use default credentials")
 
-        for sport_name, scraper_class in STATHEAD_SCRAPERS.items():
+    stream = None
+    if args.stream:
+        stream = NdjsonWriter(args.stream_file, source="main")
+        stream.start(sports=args.sports, stathead=args.stathead)
+
+    all_results = []
+    exporter = ExcelExporter(filename=args.output)
+
+    async def on_complete(name, results):
+        all_results.extend(results)
+        logger.info(f"{name} finished with {len(results)} results ({len(all_results)} total)")
+
+    stop_metrics = start_exporters(METRICS, port=args.metrics_port, textfile=args.metrics_textfile)
+    try:
+        if args.attach:
+            # Thin client: the running browser service scrapes, every result comes back as soon as it is produced
+            from browser_service import submit_job, parse_address
+            async for name, result in submit_job(args.sports, args.stathead, *parse_address(args.attach)):
+                if stream:
+                    stream.write_result(result, name)
+                all_results.append(result)
+        else:
+            playwright = await async_playwright().start()
+            browser = await launch_browser(playwright, headless)
             try:
-                results = await scrape_stathead_sport(scraper_class, rate_limiter, headless)
-                all_results.extend(results)
+                # One shared Chromium, one context per sport
+                def streamer(name):
+                    return (lambda result: stream.write_result(result, name)) if stream else None
+
+                jobs = {
+                    sport: scrape_sport(AVAILABLE_SCRAPERS[sport], rate_limiter, headless, browser,
+                                        on_result=streamer(sport))
+                    for sport in args.sports
+                }
+                if args.stathead:
+                    jobs['stathead'] = scrape_stathead_all(rate_limiter, headless, browser, on_result=streamer('stathead'))
+
+                await run_concurrently(jobs, on_complete)
+            finally:
+                await browser.close()
+                await playwright.stop()
+    finally:
+        # One workbook write with every finished sport - also when a run fails or is interrupted
+        if all_results:
+            try:
+                with TRACER.span("export", cat="export", results=len(all_results)):
+                    await asyncio.to_thread(exporter.export_results, all_results)
             except Exception as e:
-                logger.error(f"Error scraping Stathead {sport_name}: {e}", exc_info=True)
+                logger.error(f"Error exporting results: {e}", exc_info=True)
+        # Attached, failed or interrupted runs still flush metrics, the trace and the stream
+        stop_metrics()
+        if args.trace:
+            TRACER.save(args.trace)
+        if stream:
+            stream.finish(success=bool(all_results) and all(r.success for r in all_results),
+                          successful=sum(1 for r in all_results if r.success), total=len(all_results))
 
     if all_results:
-        exporter = ExcelExporter(filename=args.output)
-        exporter.export_results(all_results)
-
         successful_results = [r for r in all_results if r.success]
         failed_results = [r for r in all_results if not r.success]
 
@@ -153,4 +286,6 @@ async def main():
         logger.error("No results to export")
 
 if __name__ == "__main__":
+    # Only as a script: browser_service.py and main_match_scraper.py import this module with their own logging
+    setup_logging()
     asyncio.run(main())
\ No newline at end of file
@@ -4,18 +4,25 @@ Integrates FBRef match scraping with Kicker.de table positions
 """
 
 import asyncio
+import argparse
 import logging
 import os
 import sys
 from pathlib import Path
 from bundesliga_match_scraper import BundesligaMatchScraper
-from match_excel_exporter import MatchExcelExporter
-from base_scraper import RateLimiter
+from match_excel_exporter import MatchExcelExporter, IncrementalMatchExport, DIRECT_INFO_COLUMNS
+from base_scraper import AdaptiveRateLimiter
+from browser_profile import BrowserProfile
+from log_pipeline import setup_logging as setup_log_pipeline
+from tracing import TRACER
+from metrics import METRICS, start_exporters
+from memory_watchdog import MemoryWatchdog
+from ndjson_stream import NdjsonWriter
 
 # Setup logging with safe file handling for Windows
 def setup_logging():
-    """Setup logging with fallback for permission errors"""
-    handlers = [logging.StreamHandler()]
+    """Setup non-blocking logging (queue + listener thread) with fallback for permission errors"""
+    log_file = None
 
     # Try to create log file in user's home directory or temp directory
     log_paths = [
@@ -28,104 +35,128 @@ def setup_logging():
         try:
             # Test if we can write to this location
             log_path.touch(exist_ok=True)
-            handlers.append(logging.FileHandler(str(log_path)))
-            print(f"📝 Log file: {log_path}")
+            log_file = str(log_path)
+            print(f"📝 Log file: {log_path} (JSON lines)", file=sys.stderr)
             break
         except (PermissionError, OSError):
             continue
     else:
-        print("⚠️  Warning: Could not create log file (permission denied)")
-        print("    Logs will only be shown on screen")
+        print("⚠️  Warning: Could not create log file (permission denied)", file=sys.stderr)
+        print("    Logs will only be shown on screen", file=sys.stderr)
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=handlers
-    )
+    # Console stays human-readable, the file gets one JSON object per line.
+    # Exporter mapping logs are sampled, repetitive per-table messages rate limited.
+    setup_log_pipeline(log_file=log_file, json_file=True)
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
-async def main():
-    """Main function to run the complete match scraping and Excel export"""
+async def main(stream: str = None, stream_file: str = None, persistent_profile: bool = False,
+               revalidate_only: bool = False, trace_file: str = None, metrics_port: int = None,
+               metrics_textfile: str = None, memory_report: str = None, browser_rss_limit_mb: int = 1500,
+               attach: str = None, capture_players: bool = False):
+    """
+    Main function to run the complete match scraping and Excel export. The keyword arguments mirror
+    the command line flags below, so scheduled jobs can call main() directly:
+
+    stream="ndjson": also emit each match live (to stream_file or stdout)
+    persistent_profile: reuse browser_profile/ (cookies + HTTP cache) across restarts and runs
+    revalidate_only: only re-check recently played matches for fbref stat corrections
+    trace_file: Chrome trace of the run, open in ui.perfetto.dev
+    metrics_port / metrics_textfile: Prometheus endpoint on 127.0.0.1 / node-exporter textfile
+    memory_report: Python heap/browser RSS timeline per phase; the browser context is recycled
+        above browser_rss_limit_mb
+    attach: "HOST:PORT" of a running browser_service.py that scrapes the matches instead of a
+        local browser (profile, revalidation and browser recycling are the service's business then)
+    capture_players: also store all player rows per match in player_data/ (local browser only)
+
+    Returns False if any scrape result failed - the matches scraped before and after a failure are
+    still exported, the exit code then tells the scheduler to look at the log.
+    """
 
     logger.info("🚀 Starting Bundesliga Match-by-Match Scraper")
     logger.info("=" * 80)
 
     # Configuration
-    rate_limiter = RateLimiter(requests_per_minute=10)
+    # Starts at 10 req/min with one worker and adapts per host to 429/503, Retry-After and latency
+    rate_limiter = AdaptiveRateLimiter(requests_per_minute=10, max_requests_per_minute=60, max_concurrency=4)
     headless = True  # Set to False for debugging
 
-    try:
-        # Initialize the scraper
-        scraper = BundesligaMatchScraper(rate_limiter, headless)
+    if trace_file:
+        TRACER.enable()
+    stop_metrics = start_exporters(METRICS, port=metrics_port, textfile=metrics_textfile)
+    watchdog = MemoryWatchdog(memory_report, browser_rss_limit_mb=browser_rss_limit_mb).start() if memory_report else None
+    writer = None
+    export = None
+    match_data = []
+    failures = []
 
-        # Run the scraping
+    try:
+        if attach:
+            # The browser service scrapes; every match comes back as soon as it is extracted
+            from browser_service import submit_job, parse_address, MATCH_JOB
+            logger.info(f"🔌 Submitting the match job to the browser service at {attach}")
+            results = (result async for _, result in submit_job([MATCH_JOB], False, *parse_address(attach)))
+        else:
+            # Initialize the scraper
+            scraper = BundesligaMatchScraper(rate_limiter, headless, capture_players=capture_players)
+            if persistent_profile:
+                scraper.use_persistent_profile(BrowserProfile.for_scraper("bundesliga_match", cache_size_mb=512, max_profile_mb=1024))
+            if watchdog:
+                scraper.use_memory_watchdog(watchdog)
+
+            if revalidate_only:
+                logger.info("🔁 Re-checking recently played matches for stat corrections...")
+                result = await scraper.scrape_revalidations()
+                for match in result.data:
+                    logger.info(f"   {match['home_team']} vs {match['away_team']}: {match['changed_stats']}")
+                logger.info(f"✅ Revalidation finished: {len(result.data)} matches with corrected stats")
+                return result.success
+            results = scraper.iter_results()
+
+        # Run the scraping; the workbooks are built alongside in the export thread
         logger.info("📊 Starting match data scraping...")
-        results = await scraper.scrape_all()
-
-        if not results or not results[0].success:
+        export = IncrementalMatchExport(MatchExcelExporter(template_path="Vorlage-Scrapen.xlsx"))
+        if stream == "ndjson":
+            # Every match goes out as one JSON line as soon as it is extracted
+            writer = NdjsonWriter(stream_file, source="main_match_scraper")
+            writer.start(season="2024-25")
+        async for result in results:
+            if not result.success:
+                # Keep going: the matches already collected (and the ones still coming) get exported
+                if writer:
+                    writer.write_result(result)
+                failures.append(result.error_message or "unknown error")
+                logger.error(f"❌ Scraping failed: {failures[-1]}")
+                continue
+            for match in result.data:
+                if writer:
+                    writer.write_match(match)
+                export.add(match)
+                match_data.append(match)
+        if not match_data:
             logger.error("❌ Scraping failed!")
-            return
-
-        match_data = results[0].data
+            return False
+        # Matches arrive in completion order - restore schedule order
+        match_data.sort(key=lambda match: (match.get('matchday') or 0, match.get('date') or ''))
         logger.info(f"✅ Successfully scraped {len(match_data)} matches")
 
-        # Export to Excel (template-based)
+        # Export to Excel (template-based): only positions, open matchdays and the file write are left
         logger.info("📝 Exporting data to Excel (template format)...")
-        exporter = MatchExcelExporter(
-            template_path="Vorlage-Scrapen.xlsx",
-            output_path=f"Bundesliga_Matches_2024_25_{len(match_data)}_games.xlsx"
-        )
-
-        output_file = exporter.export_match_data(match_data)
+        with TRACER.span("export_template", cat="export"):
+            output_file = await asyncio.to_thread(export.finish, f"Bundesliga_Matches_2024_25_{len(match_data)}_games.xlsx")
+        if watchdog:
+            watchdog.sample("export_template", matches=len(match_data))
         logger.info(f"✅ Excel file created (template): {output_file}")
 
-        # ALSO export direct format with ALL FBRef parameters
+        # ALSO export direct format with ALL FBRef parameters (rows were built during the run)
         logger.info("📝 Exporting data to Excel (direct format with all parameters)...")
         direct_output = f"Bundesliga_2024_25_COMPLETE_{len(match_data)}_matches.xlsx"
-
-        # Convert to DataFrame - one row per match
-        rows = []
-        for match in match_data:
-            row = {
-                'matchday': match.get('matchday'),
-                'date': match.get('date'),
-                'home_team': match.get('home_team'),
-                'away_team': match.get('away_team'),
-                'home_score': match.get('home_score'),
-                'away_score': match.get('away_score'),
-                'venue': match.get('venue', 'Home'),
-                'home_position': match.get('home_team_position'),
-                'away_position': match.get('away_team_position'),
-            }
-
-            # Add ALL home team stats with 'home_' prefix
-            home_stats = match.get('home_team_stats', {})
-            for param, value in home_stats.items():
-                row[f'home_{param}'] = value
-
-            # Add ALL away team stats with 'away_' prefix
-            away_stats = match.get('away_team_stats', {})
-            for param, value in away_stats.items():
-                row[f'away_{param}'] = value
-
-            rows.append(row)
-
-        # Create DataFrame
-        import pandas as pd
-        df = pd.DataFrame(rows)
-
-        # Sort columns logically
-        match_info_cols = ['matchday', 'date', 'home_team', 'away_team', 'home_score', 'away_score',
-                           'venue', 'home_position', 'away_position']
-        home_cols = sorted([col for col in df.columns if col.startswith('home_') and col not in match_info_cols])
-        away_cols = sorted([col for col in df.columns if col.startswith('away_') and col not in match_info_cols])
-
-        df = df[match_info_cols + home_cols + away_cols]
-
-        # Export direct format Excel
-        df.to_excel(direct_output, index=False, sheet_name='All Matches', engine='openpyxl')
+        df = await asyncio.to_thread(export.finish_direct, direct_output)
+        home_cols = [col for col in df.columns if col.startswith('home_') and col not in DIRECT_INFO_COLUMNS]
+        away_cols = [col for col in df.columns if col.startswith('away_') and col not in DIRECT_INFO_COLUMNS]
+        if watchdog:
+            watchdog.sample("export_direct", rows=len(df), columns=len(df.columns))
         logger.info(f"✅ Excel file created (direct): {direct_output}")
         logger.info(f"   📊 Total columns: {len(df.columns)} ({len(home_cols)} home + {len(away_cols)} away parameters)")
 
@@ -152,12 +183,28 @@ async def main():
                 logger.info(f"Parameters extracted per team: {stats_count}")
 
         logger.info("=" * 80)
+        if failures:
+            logger.error(f"⚠️  Bundesliga Match Scraping finished with {len(failures)} failed result(s) - "
+                         f"the {len(match_data)} scraped matches were exported")
+            return False
         logger.info("🎉 Bundesliga Match Scraping Completed Successfully!")
         logger.info("=" * 80)
+        return True
 
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}", exc_info=True)
         raise
+    finally:
+        if export:
+            export.close()
+        if writer:
+            writer.finish(success=bool(match_data) and not failures, matches=len(match_data),
+                          failures=len(failures))
+        if watchdog:
+            watchdog.stop()
+        stop_metrics()
+        if trace_file:
+            TRACER.save(trace_file)
 
 if __name__ == "__main__":
     # Check if venv is activated
@@ -168,5 +215,46 @@ if __name__ == "__main__":
         print("source venv/bin/activate")
         sys.exit(1)
 
-    # Run the main function
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Bundesliga Match-by-Match Scraper')
+    parser.add_argument('--stream', type=str, default=None, choices=['ndjson'],
+                        help='Also write every match as one JSON line as soon as it is scraped (schema: ndjson_stream.py)')
+    parser.add_argument('--stream-file', type=str, default=None, metavar='FILE',
+                        help='Target of --stream (default: stdout; logs go to stderr)')
+    parser.add_argument('--persistent-profile', action='store_true',
+                        help='Reuse browser_profile/bundesliga_match/ (cookies + HTTP cache) across restarts and runs')
+    parser.add_argument('--revalidate-only', action='store_true',
+                        help='Only re-check matches played 1, 3 and 7 days ago for fbref stat corrections')
+    parser.add_argument('--trace', type=str, default=None, metavar='FILE',
+                        help='Write a Chrome trace of the run (open in ui.perfetto.dev or chrome://tracing)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics during the run')
+    parser.add_argument('--metrics-textfile', type=str, default=None, metavar='FILE',
+                        help='Write Prometheus metrics to FILE for the node-exporter textfile collector')
+    parser.add_argument('--memory-report', type=str, default=None, metavar='FILE',
+                        help='Write a Python heap/browser RSS timeline per phase to FILE (JSON)')
+    parser.add_argument('--browser-rss-limit-mb', type=int, default=1500,
+                        help='With --memory-report: recycle the browser context above this browser RSS (default: 1500)')
+    parser.add_argument('--attach', type=str, default=None, metavar='HOST:PORT',
+                        help='Scrape on a running browser_service.py instead of launching Chromium '
+                             '(token from BROWSER_SERVICE_TOKEN)')
+    parser.add_argument('--capture-players', action='store_true',
+                        help='Also store all player rows per match in player_data/<match_id>.json.gz')
+    args = parser.parse_args()
+    if args.attach and (args.persistent_profile or args.revalidate_only or args.capture_players):
+        parser.error("--attach runs on the service's browser: --persistent-profile, --revalidate-only "
+                     "and --capture-players need a local one")
+
+    # Run the main function; a failed scrape result exits non-zero after the export
+    success = asyncio.run(main(
+        args.stream, args.stream_file,
+        persistent_profile=args.persistent_profile,
+        revalidate_only=args.revalidate_only,
+        trace_file=args.trace,
+        metrics_port=args.metrics_port,
+        metrics_textfile=args.metrics_textfile,
+        memory_report=args.memory_report,
+        browser_rss_limit_mb=args.browser_rss_limit_mb,
+        attach=args.attach,
+        capture_players=args.capture_players
+    ))
+    sys.exit(0 if success else 1)
\ No newline at end of file
@@ -4,14 +4,20 @@ Creates Excel file with team sheets and home/away aggregations
 """
 
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
 import os
 import requests
 from bs4 import BeautifulSoup
+from standings import positions_before_matchdays
+from stat_record import sum_stats
+from tracing import TRACER
 
 logger = logging.getLogger(__name__)
+# Per-match parameter mapping messages; sampled by log_pipeline, everything else on `logger` is kept
+mapping_logger = logging.getLogger(f"{__name__}.mapping")
 
 class MatchExcelExporter:
     def __init__(self, template_path: str = None, output_path: str = None, filename: str = None):
@@ -70,35 +76,28 @@ class MatchExcelExporter:
         """Export match data to Excel with team sheets and home/away aggregations"""
 
         try:
+            with TRACER.span("fill_missing_positions", cat="export"):
+                self._fill_missing_positions(match_data)
+
             # Load the template to get the parameter structure
-            template_df = pd.read_excel(self.template_path, sheet_name='Gesamt', index_col=0)
-            parameters = template_df.index.tolist()
-
-            # Add Kicker.de position parameters (customer requirement - not in template)
-            kicker_params = [
-                'table_position_before_match',
-                'opponent',
-                'opponent_position',
-                'venue'
-            ]
-            for param in kicker_params:
-                if param not in parameters:
-                    parameters.append(param)
-
-            logger.info(f"Loaded {len(parameters)} parameters from template (including {len(kicker_params)} Kicker.de params)")
+            with TRACER.span("load_template", cat="export"):
+                parameters = self.load_parameters()
 
             # Create Excel writer
             with pd.ExcelWriter(self.output_path, engine='openpyxl') as writer:
 
                 # Create Gesamt sheet (summary/overview)
-                self._create_gesamt_sheet(writer, parameters, match_data)
+                with TRACER.span("sheet:Gesamt", cat="export"):
+                    self._create_gesamt_sheet(writer, parameters, match_data)
 
                 # Create individual team sheets
                 for team in self.teams:
-                    self._create_team_sheet(writer, team, parameters, match_data)
+                    with TRACER.span("sheet:team", cat="export", team=team):
+                        self._create_team_sheet(writer, team, parameters, match_data)
 
                 # Create Home/Away aggregation sheets
-                self._create_home_away_sheets(writer, parameters, match_data)
+                with TRACER.span("sheet:home_away", cat="export"):
+                    self._create_home_away_sheets(writer, parameters, match_data)
 
             logger.info(f"Excel file exported successfully: {self.output_path}")
             return self.output_path
@@ -107,6 +106,32 @@ class MatchExcelExporter:
             logger.error(f"Error exporting to Excel: {e}")
             raise
 
+    def load_parameters(self) -> List[str]:
+        """Parameter rows of the template plus the Kicker.de context rows"""
+        template_df = pd.read_excel(self.template_path, sheet_name='Gesamt', index_col=0)
+        parameters = template_df.index.tolist()
+
+        # Add Kicker.de position parameters (customer requirement - not in template)
+        kicker_params = [
+            'table_position_before_match',
+            'opponent',
+            'opponent_position',
+            'venue'
+        ]
+        for param in kicker_params:
+            if param not in parameters:
+                parameters.append(param)
+
+        logger.info(f"Loaded {len(parameters)} parameters from template (including {len(kicker_params)} Kicker.de params)")
+        return parameters
+
+    @staticmethod
+    def _matchday_sheet(parameters: List[str]) -> pd.DataFrame:
+        """Empty sheet: one row per parameter, one column per matchday"""
+        df = pd.DataFrame(index=parameters, columns=['team'] + list(range(1, 35)))
+        df['team'] = parameters
+        return df
+
     def _create_gesamt_sheet(self, writer, parameters: List[str], match_data: List[Dict[str, Any]]):
         """Create the Gesamt (overview) sheet"""
 
@@ -122,119 +147,110 @@ class MatchExcelExporter:
         """Create individual team sheet with 34 matchdays"""
 
         # Create columns for 34 matchdays
-        columns = ['team'] + list(range(1, 35))
-        df = pd.DataFrame(index=parameters, columns=columns)
-        df['team'] = parameters
+        df = self._matchday_sheet(parameters)
 
         # Fill in match data for this team
         for match in match_data:
             if not match:
                 continue
 
-            home_team = match.get('home_team', '')
-            away_team = match.get('away_team', '')
-            matchday = match.get('matchday', 0)
-
-            # Determine if this team is playing and get their stats
-            team_stats = None
-            team_position = None
-            opponent_position = None
-            is_home = False
-            opponent = None
-
-            if self._normalize_team_name(home_team) == team_name:
-                team_stats = match.get('home_team_stats', {})
-                team_position = match.get('home_team_position', 1)  # From scraper
-                opponent_position = match.get('away_team_position', 1)  # From scraper
-                is_home = True
-                opponent = self._normalize_team_name(away_team)
-            elif self._normalize_team_name(away_team) == team_name:
-                team_stats = match.get('away_team_stats', {})
-                team_position = match.get('away_team_position', 1)  # From scraper
-                opponent_position = match.get('home_team_position', 1)  # From scraper
-                is_home = False
-                opponent = self._normalize_team_name(home_team)
-
-            if team_stats and 1 <= matchday <= 34:
-                # Intelligent parameter mapping
-                mapped_stats = self._map_fbref_to_excel_params(team_stats, parameters)
-
-                # Fill in the mapped stats for this matchday
-                for param, value in mapped_stats.items():
-                    if param in parameters:
-                        df.loc[param, matchday] = value
-
-                # Use table positions from match_data (already fetched by scraper)
-
-                # Add special rows for context data (if they exist in parameters)
-                context_data = {
-                    'table_position_before_match': team_position,
-                    'opponent': opponent,
-                    'opponent_position': opponent_position,
-                    'venue': 'Home' if is_home else 'Away',
-                    'date': match.get('date', ''),
-                    'matchday': matchday
-                }
-
-                for context_key, context_value in context_data.items():
-                    if context_key in parameters:
-                        df.loc[context_key, matchday] = context_value
+            column = self._team_column(team_name, parameters, match)
+            if column:
+                matchday, cells = column
+                for param, value in cells.items():
+                    df.loc[param, matchday] = value
 
         df.to_excel(writer, sheet_name=team_name, index=False)
 
+    def _team_side(self, team_name: str, match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """team_name's view of a match (stats, positions, opponent, venue); None if the team didn't play"""
+        home_team = match.get('home_team', '')
+        away_team = match.get('away_team', '')
+
+        if self._normalize_team_name(home_team) == team_name:
+            return {
+                'team_stats': match.get('home_team_stats', {}),
+                'team_position': match.get('home_team_position'),  # From scraper/standings, blank if unknown
+                'opponent_position': match.get('away_team_position'),
+                'is_home': True,
+                'opponent': self._normalize_team_name(away_team)
+            }
+        if self._normalize_team_name(away_team) == team_name:
+            return {
+                'team_stats': match.get('away_team_stats', {}),
+                'team_position': match.get('away_team_position'),  # From scraper/standings, blank if unknown
+                'opponent_position': match.get('home_team_position'),
+                'is_home': False,
+                'opponent': self._normalize_team_name(home_team)
+            }
+        return None
+
+    def _team_column(self, team_name: str, parameters: List[str], match: Dict[str, Any]) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(matchday, {parameter: value}) of one match for team_name's sheet; None if there is nothing to fill"""
+        matchday = match.get('matchday', 0)
+        side = self._team_side(team_name, match)
+        if not side or not side['team_stats'] or not 1 <= matchday <= 34:
+            return None
+
+        # Intelligent parameter mapping
+        mapped_stats = self._map_fbref_to_excel_params(side['team_stats'], parameters)
+        cells = {param: value for param, value in mapped_stats.items() if param in parameters}
+
+        # Add special rows for context data (if they exist in parameters)
+        context_data = {
+            'table_position_before_match': side['team_position'],
+            'opponent': side['opponent'],
+            'opponent_position': side['opponent_position'],
+            'venue': 'Home' if side['is_home'] else 'Away',
+            'date': match.get('date', ''),
+            'matchday': matchday
+        }
+
+        for context_key, context_value in context_data.items():
+            if context_key in parameters:
+                cells[context_key] = context_value
+
+        return matchday, cells
+
     def _create_home_away_sheets(self, writer, parameters: List[str], match_data: List[Dict[str, Any]]):
         """Create Home and Away aggregation sheets"""
 
-        # Prepare data structure for home/away aggregation
-        columns = ['team'] + list(range(1, 35))
-
         # Home sheet - aggregated stats for all home teams per matchday
-        home_df = pd.DataFrame(index=parameters, columns=columns)
-        home_df['team'] = parameters
+        home_df = self._matchday_sheet(parameters)
 
         # Away sheet - aggregated stats for all away teams per matchday
-        away_df = pd.DataFrame(index=parameters, columns=columns)
-        away_df['team'] = parameters
+        away_df = self._matchday_sheet(parameters)
+
+        # Group once by matchday, then sum the numeric stats column-wise
+        matches_by_matchday = {}
+        for match in match_data:
+            if match and match.get('matchday'):
+                matches_by_matchday.setdefault(match['matchday'], []).append(match)
 
-        # Aggregate data by matchday
+        parameter_set = set(parameters)
         for matchday in range(1, 35):
-            home_matchday_stats = {}
-            away_matchday_stats = {}
-
-            for match in match_data:
-                if not match or match.get('matchday') != matchday:
-                    continue
-
-                home_stats = match.get('home_team_stats', {})
-                away_stats = match.get('away_team_stats', {})
-
-                # Aggregate home team stats
-                for param, value in home_stats.items():
-                    if param in parameters:
-                        if param not in home_matchday_stats:
-                            home_matchday_stats[param] = []
-                        if isinstance(value, (int, float)):
-                            home_matchday_stats[param].append(value)
-
-                # Aggregate away team stats
-                for param, value in away_stats.items():
-                    if param in parameters:
-                        if param not in away_matchday_stats:
-                            away_matchday_stats[param] = []
-                        if isinstance(value, (int, float)):
-                            away_matchday_stats[param].append(value)
-
-            # Calculate aggregated values (sum for most stats)
-            for param in parameters:
-                if param in home_matchday_stats and home_matchday_stats[param]:
-                    home_df.loc[param, matchday] = sum(home_matchday_stats[param])
-
-                if param in away_matchday_stats and away_matchday_stats[param]:
-                    away_df.loc[param, matchday] = sum(away_matchday_stats[param])
+            matches = matches_by_matchday.get(matchday, [])
+            if matches:
+                self._fill_home_away_column(home_df, away_df, matchday, matches, parameter_set)
 
         home_df.to_excel(writer, sheet_name='Heim', index=False)
         away_df.to_excel(writer, sheet_name='Auswärts', index=False)
 
+    @staticmethod
+    def _fill_home_away_column(home_df: pd.DataFrame, away_df: pd.DataFrame, matchday: int,
+                               matches: List[Dict[str, Any]], parameter_set: set):
+        """Summed home and away stats of one matchday"""
+        home_totals = sum_stats([match.get('home_team_stats') for match in matches])
+        away_totals = sum_stats([match.get('away_team_stats') for match in matches])
+
+        for param, value in home_totals.items():
+            if param in parameter_set:
+                home_df.loc[param, matchday] = value
+
+        for param, value in away_totals.items():
+            if param in parameter_set:
+                away_df.loc[param, matchday] = value
+
     def _normalize_team_name(self, team_name: str) -> str:
         """Normalize team names to match the Excel template format"""
 
@@ -261,8 +277,22 @@ class MatchExcelExporter:
 
         return team_mapping.get(team_name, team_name)
 
+    def _fill_missing_positions(self, match_data: List[Dict[str, Any]]):
+        """Compute table positions from the match results for matches scraped without them"""
+        matches = [m for m in match_data if m and m.get('matchday')]
+        if all(m.get('home_team_position') and m.get('away_team_position') for m in matches):
+            return
+
+        positions = positions_before_matchdays(matches)
+        for match in matches:
+            table = positions.get(match['matchday'], {})
+            if not match.get('home_team_position'):
+                match['home_team_position'] = table.get(match.get('home_team'))
+            if not match.get('away_team_position'):
+                match['away_team_position'] = table.get(match.get('away_team'))
+
     def get_kicker_table_positions(self, matchday: int) -> Dict[str, int]:
-        """Get table positions from Kicker.de before specified matchday"""
+        """Get table positions from Kicker.de before specified matchday (cross-check only, see standings.py)"""
 
         if matchday in self._table_positions_cache:
             return self._table_positions_cache[matchday]
@@ -320,10 +350,7 @@ class MatchExcelExporter:
 
         except Exception as e:
             logger.error(f"Error fetching Kicker.de positions for matchday {matchday}: {e}")
-            # Fallback: sequential positions
-            fallback = {team: i+1 for i, team in enumerate(self.teams)}
-            self._table_positions_cache[matchday] = fallback
-            return fallback
+            return {}
 
     def _map_fbref_to_excel_params(self, fbref_stats: Dict[str, Any], excel_params: List[str]) -> Dict[str, Any]:
         """
@@ -382,9 +409,9 @@ class MatchExcelExporter:
                 mapped_stats[fbref_param] = fbref_value
                 direct_mapped_count += 1
 
-        logger.info(f"Direct 1:1 mapping: {direct_mapped_count}/{len(fbref_stats)} parameters mapped")
-        logger.debug(f"FBRef parameters: {sorted(fbref_stats.keys())}")
-        logger.debug(f"Excel parameters (first 50): {sorted(excel_params)[:50]}")
+        mapping_logger.info(f"Direct 1:1 mapping: {direct_mapped_count}/{len(fbref_stats)} parameters mapped")
+        mapping_logger.debug(f"FBRef parameters: {sorted(fbref_stats.keys())}")
+        mapping_logger.debug(f"Excel parameters (first 50): {sorted(excel_params)[:50]}")
 
         # SECOND: Apply manual mapping rules (for parameters with different names)
         manual_mapped_count = 0
@@ -395,7 +422,7 @@ class MatchExcelExporter:
                     mapped_stats[excel_param] = fbref_stats[fbref_param]
                     manual_mapped_count += 1
 
-        logger.info(f"Manual mapping: {manual_mapped_count} additional parameters mapped")
+        mapping_logger.info(f"Manual mapping: {manual_mapped_count} additional parameters mapped")
 
         # THIRD: fuzzy matching for remaining unmapped parameters
         for fbref_key, fbref_value in fbref_stats.items():
@@ -406,7 +433,7 @@ class MatchExcelExporter:
             for excel_param in excel_params:
                 if self._params_similar(fbref_key, excel_param):
                     mapped_stats[excel_param] = fbref_value
-                    logger.debug(f"Fuzzy mapped: {fbref_key} -> {excel_param}")
+                    mapping_logger.debug(f"Fuzzy mapped: {fbref_key} -> {excel_param}")
                     break
 
         return mapped_stats
@@ -438,4 +465,178 @@ class MatchExcelExporter:
         p1_normalized = abbrev_mapping.get(p1, p1)
         p2_normalized = abbrev_mapping.get(p2, p2)
 
-        return p1_normalized == p2_normalized
\ No newline at end of file
+        return p1_normalized == p2_normalized
+
+# Match info columns of the direct export, followed by home_*/away_* stats
+DIRECT_INFO_COLUMNS = ['matchday', 'date', 'home_team', 'away_team', 'home_score', 'away_score',
+                       'venue', 'home_position', 'away_position']
+
+def direct_row(match: Dict[str, Any]) -> Dict[str, Any]:
+    """One row of the direct export: match info plus ALL FBRef stats of both teams"""
+    row = {
+        'matchday': match.get('matchday'),
+        'date': match.get('date'),
+        'home_team': match.get('home_team'),
+        'away_team': match.get('away_team'),
+        'home_score': match.get('home_score'),
+        'away_score': match.get('away_score'),
+        'venue': match.get('venue', 'Home'),
+        'home_position': match.get('home_team_position'),
+        'away_position': match.get('away_team_position'),
+    }
+
+    # Add ALL home team stats with 'home_' prefix
+    home_stats = match.get('home_team_stats', {})
+    for param, value in home_stats.items():
+        row[f'home_{param}'] = value
+
+    # Add ALL away team stats with 'away_' prefix
+    away_stats = match.get('away_team_stats', {})
+    for param, value in away_stats.items():
+        row[f'away_{param}'] = value
+
+    return row
+
+def export_direct(rows: List[Dict[str, Any]], output_path: str) -> pd.DataFrame:
+    """Write the direct format (one row per match, all parameters) and return the DataFrame"""
+    df = pd.DataFrame(rows)
+
+    # Sort columns logically
+    home_cols = sorted([col for col in df.columns if col.startswith('home_') and col not in DIRECT_INFO_COLUMNS])
+    away_cols = sorted([col for col in df.columns if col.startswith('away_') and col not in DIRECT_INFO_COLUMNS])
+
+    df = df[DIRECT_INFO_COLUMNS + home_cols + away_cols]
+    df.to_excel(output_path, index=False, sheet_name='All Matches', engine='openpyxl')
+    return df
+
+class IncrementalMatchExport:
+    """
+    Builds both workbooks while scraping is still running. add() hands each match record to one
+    export thread, which maps its stats into the two team sheet columns and the direct-export row
+    right away; once all matches of a matchday are in, that matchday's Heim/Auswärts columns are
+    summed too. finish() is left with filling in table positions missing from the records, the
+    matchdays that never completed and writing the file.
+    """
+
+    def __init__(self, exporter: MatchExcelExporter, matches_per_matchday: Optional[int] = None):
+        self.exporter = exporter
+        self.matches_per_matchday = matches_per_matchday or len(exporter.teams) // 2
+        # A single thread keeps the sheets consistent without locks and the event loop free;
+        # its spans get their own trace lane instead of landing on "main"
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='excel-export',
+                                           initializer=TRACER.set_lane, initargs=('excel-export',))
+        self.pending = []
+        self.matches: List[Dict[str, Any]] = []
+        self.direct_rows: List[Dict[str, Any]] = []
+        self.by_matchday: Dict[int, List[Dict[str, Any]]] = {}
+        self.completed_matchdays = set()
+        self.pending.append(self.executor.submit(self._prepare))
+
+    def _prepare(self):
+        with TRACER.span("load_template", cat="export"):
+            self.parameters = self.exporter.load_parameters()
+        self.parameter_set = set(self.parameters)
+        self.team_sheets = {team: self.exporter._matchday_sheet(self.parameters) for team in self.exporter.teams}
+        self.home_df = self.exporter._matchday_sheet(self.parameters)
+        self.away_df = self.exporter._matchday_sheet(self.parameters)
+
+    def add(self, match: Dict[str, Any]):
+        """Queue one match record without waiting; the record must not be changed afterwards."""
+        self.pending.append(self.executor.submit(self._ingest, match))
+
+    def _ingest(self, match: Dict[str, Any]):
+        with TRACER.span("ingest_match", cat="export", match_id=match.get('match_id'), matchday=match.get('matchday')):
+            self.matches.append(match)
+            self.direct_rows.append(direct_row(match))
+
+            for team in {self.exporter._normalize_team_name(match.get('home_team', '')),
+                         self.exporter._normalize_team_name(match.get('away_team', ''))}:
+                if team in self.team_sheets:
+                    self._fill_team_column(team, match)
+
+            matchday = match.get('matchday')
+            if matchday:
+                matches = self.by_matchday.setdefault(matchday, [])
+                matches.append(match)
+                if len(matches) == self.matches_per_matchday:
+                    self._complete_matchday(matchday)
+
+    def _fill_team_column(self, team: str, match: Dict[str, Any]):
+        column = self.exporter._team_column(team, self.parameters, match)
+        if column:
+            matchday, cells = column
+            df = self.team_sheets[team]
+            for param, value in cells.items():
+                df.loc[param, matchday] = value
+
+    def _complete_matchday(self, matchday: int):
+        if 1 <= matchday <= 34:
+            self.exporter._fill_home_away_column(self.home_df, self.away_df, matchday,
+                                                 self.by_matchday[matchday], self.parameter_set)
+        self.completed_matchdays.add(matchday)
+        logger.info(f"Export: matchday {matchday} materialized ({len(self.completed_matchdays)} complete)")
+
+    def _wait(self):
+        pending, self.pending = self.pending, []
+        for future in pending:
+            future.result()  # Re-raises the first error of the export thread
+
+    def finish(self, output_path: str) -> str:
+        """Complete and write the template workbook (call from a worker thread, e.g. asyncio.to_thread)."""
+        self._wait()
+        self.exporter.output_path = output_path
+        try:
+            with TRACER.span("fill_missing_positions", cat="export"):
+                missing = [index for index, match in enumerate(self.matches)
+                           if not match.get('home_team_position') or not match.get('away_team_position')]
+                # Schedule order, as in a full export (team order decides ties before matchday 1)
+                self.exporter._fill_missing_positions(
+                    sorted(self.matches, key=lambda match: (match.get('matchday') or 0, match.get('date') or '')))
+                # Only the position cells and direct rows of those matches change
+                for index in missing:
+                    self._fill_position_cells(self.matches[index])
+                    self.direct_rows[index] = direct_row(self.matches[index])
+
+            for matchday in sorted(set(self.by_matchday) - self.completed_matchdays):
+                self._complete_matchday(matchday)
+
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                with TRACER.span("sheet:Gesamt", cat="export"):
+                    self.exporter._create_gesamt_sheet(writer, self.parameters, self.matches)
+                with TRACER.span("sheet:team", cat="export"):
+                    for team in self.exporter.teams:
+                        self.team_sheets[team].to_excel(writer, sheet_name=team, index=False)
+                with TRACER.span("sheet:home_away", cat="export"):
+                    self.home_df.to_excel(writer, sheet_name='Heim', index=False)
+                    self.away_df.to_excel(writer, sheet_name='Auswärts', index=False)
+
+            logger.info(f"Excel file exported successfully: {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.error(f"Error exporting to Excel: {e}")
+            raise
+
+    def _fill_position_cells(self, match: Dict[str, Any]):
+        matchday = match.get('matchday', 0)
+        for team in (self.exporter._normalize_team_name(match.get('home_team', '')),
+                     self.exporter._normalize_team_name(match.get('away_team', ''))):
+            side = self.exporter._team_side(team, match)
+            if team not in self.team_sheets or not side or not side['team_stats'] or not 1 <= matchday <= 34:
+                continue
+            df = self.team_sheets[team]
+            if 'table_position_before_match' in self.parameter_set:
+                df.loc['table_position_before_match', matchday] = side['team_position']
+            if 'opponent_position' in self.parameter_set:
+                df.loc['opponent_position', matchday] = side['opponent_position']
+
+    def finish_direct(self, output_path: str) -> pd.DataFrame:
+        """Write the direct format from the rows built during the run (positions as filled by finish())."""
+        self._wait()
+        # Rows arrived in completion order
+        rows = sorted(self.direct_rows, key=lambda row: (row['matchday'] or 0, row['date'] or ''))
+        with TRACER.span("export_direct", cat="export", matches=len(rows)):
+            return export_direct(rows, output_path)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
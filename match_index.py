@@ -0,0 +1,145 @@
+"""
+Match Index - persistenter Spielplan-Index für den Bundesliga Match Scraper
+Speichert alle Spalten der Scores & Fixtures Tabelle pro FBRef Match-ID inkl. Scrape-Status
+"""
+
+import json
+import os
+import re
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+MATCH_ID_PATTERN = re.compile(r'/matches/([a-f0-9]+)')
+
+STATUS_PENDING = "pending"
+STATUS_SCRAPED = "scraped"
+STATUS_FAILED = "failed"
+
+class MatchIndex:
+    """
+    JSON-backed index of the season schedule keyed by fbref match ID.
+
+    Each entry keeps every schedule column (score, venue, attendance, xG, referee, ...)
+    under 'columns', the fields the scraper plans with (url, date, teams, matchday,
+    scores) and the scrape status with the timestamp of the last successful scrape.
+    """
+
+    def __init__(self, path: str = "match_index.json", max_age_hours: float = 12, policy=None):
+        self.path = Path(path)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.policy = policy  # optional CachePolicyEngine: a schedule fetched complete never expires
+        self.source_url: Optional[str] = None
+        self.updated_at: Optional[datetime] = None
+        self.complete_at_update = False  # every result was in when the schedule was last fetched
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    @staticmethod
+    def match_id_from_url(url: str) -> Optional[str]:
+        match = MATCH_ID_PATTERN.search(url or '')
+        return match.group(1) if match else None
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.source_url = data.get('source_url')
+            self.updated_at = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None
+            self.entries = data.get('matches', {})
+            self.complete_at_update = data.get('complete', False)
+            logger.info(f"Loaded match index with {len(self.entries)} matches from {self.path}")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read match index {self.path}, rebuilding: {e}")
+            self.entries = {}
+            self.updated_at = None
+
+    def save(self):
+        data = {
+            'source_url': self.source_url,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'complete': self.complete_at_update,
+            'matches': self.entries
+        }
+        # Write to a temp file first so an interrupted run never leaves a broken index
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, source_url: Optional[str] = None) -> bool:
+        if not self.entries or not self.updated_at:
+            return False
+        if source_url and source_url != self.source_url:
+            return False
+        if self.policy:
+            return self.policy.is_fresh(self.source_url, self.updated_at, complete=self.complete_at_update)
+        return datetime.now() - self.updated_at < self.max_age
+
+    def season_complete(self) -> bool:
+        return bool(self.entries) and all(entry.get('score') for entry in self.entries.values())
+
+    def matchday_complete(self, matchday: int) -> bool:
+        games = [entry for entry in self.entries.values() if entry.get('matchday') == matchday]
+        return bool(games) and all(entry.get('score') for entry in games)
+
+    def update_from_schedule(self, matches: List[Dict[str, Any]], source_url: str):
+        """Merge freshly parsed schedule rows; scrape status survives unless the result changed."""
+        added = changed = 0
+        for match in matches:
+            match_id = self.match_id_from_url(match.get('url'))
+            if not match_id:
+                continue
+
+            entry = self.entries.get(match_id)
+            if entry is None:
+                entry = {'scrape_status': STATUS_PENDING, 'last_scraped_at': None, 'error': None}
+                self.entries[match_id] = entry
+                added += 1
+            elif entry.get('score') != match.get('score'):
+                # Result appeared or was corrected - stats have to be scraped again
+                entry['scrape_status'] = STATUS_PENDING
+                changed += 1
+
+            entry.update(match)
+            entry['match_id'] = match_id
+
+        self.source_url = source_url
+        self.updated_at = datetime.now()
+        self.complete_at_update = self.season_complete()
+        self.save()
+        logger.info(f"Match index updated: {len(self.entries)} matches ({added} new, {changed} changed results)")
+
+    def matches(self) -> List[Dict[str, Any]]:
+        """All indexed matches in schedule order."""
+        return sorted(self.entries.values(), key=lambda m: (m.get('matchday') or 0, m.get('date') or ''))
+
+    def pending(self) -> List[Dict[str, Any]]:
+        return [m for m in self.matches() if m.get('scrape_status') != STATUS_SCRAPED]
+
+    def mark_scraped(self, match_id: str):
+        entry = self.entries.get(match_id)
+        if entry is not None:
+            entry['scrape_status'] = STATUS_SCRAPED
+            entry['last_scraped_at'] = datetime.now().isoformat()
+            entry['error'] = None
+
+    def mark_failed(self, match_id: str, error: str = None):
+        entry = self.entries.get(match_id)
+        if entry is not None:
+            entry['scrape_status'] = STATUS_FAILED
+            entry['error'] = error
+
+    def record_fingerprint(self, match_id: str, stats_digest: Dict[str, Dict[str, str]],
+                           etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Validators of the last scraped/checked version of the match page (see revalidation.py)."""
+        entry = self.entries.get(match_id)
+        if entry is not None:
+            entry['stats_digest'] = stats_digest
+            entry['etag'] = etag
+            entry['last_modified'] = last_modified
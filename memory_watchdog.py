@@ -0,0 +1,225 @@
+"""
+Memory Watchdog - Speicherverbrauch pro Pipeline-Phase
+Misst an Phasengrenzen den Python-Heap (tracemalloc, größte Allokationsstellen) und den RSS der
+Browser-Prozesse, schreibt eine Zeitleiste als JSON-Report und fordert beim Überschreiten der
+Grenzwerte ein Recycling des Browser-Kontexts an.
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from metrics import METRICS
+from tracing import TRACER
+
+try:
+    import psutil  # optional, needed for browser RSS outside Linux
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Chromium helper processes (renderer, gpu, zygote) and the headless shell
+BROWSER_PROCESS_NAMES = ('chrom', 'headless_shell')
+
+MEMORY_BYTES = METRICS.gauge('scraper_memory_bytes', 'Memory at the last phase boundary', ('kind',))
+CONTEXT_RECYCLES = METRICS.counter('scraper_context_recycles_total', 'Browser contexts recycled by the memory watchdog',
+                                   ('scraper',))
+
+def _process_table() -> Dict[int, Dict[str, Any]]:
+    """pid -> {ppid, name, rss} for all visible processes (psutil or /proc), empty if neither is available."""
+    processes = {}
+    if psutil:
+        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'memory_info']):
+            info = proc.info
+            if info['memory_info']:
+                processes[info['pid']] = {'ppid': info['ppid'], 'name': info['name'] or '', 'rss': info['memory_info'].rss}
+        return processes
+    if not os.path.isdir('/proc'):
+        return processes
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            with open(f'/proc/{entry}/statm', 'r') as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue  # Process exited while scanning
+        # comm may contain spaces, it is wrapped in the outermost parentheses
+        name = stat[stat.find('(') + 1:stat.rfind(')')]
+        ppid = int(stat[stat.rfind(')') + 2:].split()[1])
+        processes[int(entry)] = {'ppid': ppid, 'name': name, 'rss': rss_pages * page_size}
+    return processes
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """
+    RSS of this process and of its child processes, split into Chromium and the rest (Playwright
+    driver). RSS is summed per process, so pages shared between Chromium processes count more than once.
+    """
+    processes = _process_table()
+    own = processes.get(os.getpid())
+    if not own:
+        return {'python_rss': None, 'browser_rss': None, 'driver_rss': None, 'browser_processes': 0}
+
+    children: Dict[int, List[int]] = {}
+    for pid, info in processes.items():
+        children.setdefault(info['ppid'], []).append(pid)
+    descendants = []
+    stack = list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        descendants.append(pid)
+        stack.extend(children.get(pid, []))
+
+    browser = [pid for pid in descendants if any(part in processes[pid]['name'].lower() for part in BROWSER_PROCESS_NAMES)]
+    return {
+        'python_rss': own['rss'],
+        'browser_rss': sum(processes[pid]['rss'] for pid in browser),
+        'driver_rss': sum(processes[pid]['rss'] for pid in descendants if pid not in browser),
+        'browser_processes': len(browser)
+    }
+
+class MemoryWatchdog:
+    """
+    Samples memory at phase boundaries (sample()) and keeps the timeline for the report.
+
+    Each sample holds the traced Python heap with its top allocation sites and the growth since
+    the previous sample, plus process RSS. needs_recycle() turns a browser RSS above the limit
+    into a recycle request (at most once per min_recycle_interval); a Python heap above its limit
+    triggers a gc pass, since only the caller can drop its own data.
+    """
+
+    def __init__(self, report_path: Optional[str] = "memory_report.json", browser_rss_limit_mb: float = 1500,
+                 python_limit_mb: float = 1024, top_n: int = 10, trace_frames: int = 1,
+                 min_recycle_interval: float = 60.0):
+        self.report_path = report_path
+        self.browser_rss_limit = browser_rss_limit_mb * MB
+        self.python_limit = python_limit_mb * MB
+        self.top_n = top_n
+        self.trace_frames = trace_frames
+        self.min_recycle_interval = min_recycle_interval
+        self.samples: List[Dict[str, Any]] = []
+        self.started_at = datetime.now()
+        self._origin = time.monotonic()
+        self._last_recycle = None
+        self._previous_snapshot = None
+        self._started_tracing = False
+
+    def start(self) -> 'MemoryWatchdog':
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracing = True
+        return self
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>')
+        ))
+
+    @staticmethod
+    def _where(stat) -> str:
+        frame = stat.traceback[0]
+        return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+    def sample(self, phase: str, **info) -> Dict[str, Any]:
+        """Record one point of the timeline; info (e.g. matches=120) is stored with it."""
+        if not tracemalloc.is_tracing():
+            self.start()
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        sample = {
+            'phase': phase,
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_s': round(time.monotonic() - self._origin, 1),
+            'python_heap': current,
+            'python_heap_peak': peak,
+            **process_memory(),
+            'top': [
+                {'where': self._where(stat), 'size': stat.size, 'count': stat.count}
+                for stat in snapshot.statistics('lineno')[:self.top_n]
+            ],
+            'info': info
+        }
+        if self._previous_snapshot is not None:
+            growth = [stat for stat in snapshot.compare_to(self._previous_snapshot, 'lineno') if stat.size_diff > 0]
+            sample['growth'] = [
+                {'where': self._where(stat), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in growth[:self.top_n]
+            ]
+        self._previous_snapshot = snapshot
+
+        if current > self.python_limit:
+            collected = gc.collect()
+            sample['action'] = f"gc ({collected} objects)"
+            logger.warning(f"Python heap {current / MB:.0f} MB over the {self.python_limit / MB:.0f} MB limit at {phase}")
+
+        self.samples.append(sample)
+        self._publish(sample)
+        return sample
+
+    def _publish(self, sample: Dict[str, Any]):
+        browser_rss = sample['browser_rss']
+        logger.info(
+            f"Memory at {sample['phase']}: Python heap {sample['python_heap'] / MB:.0f} MB"
+            f" (peak {sample['python_heap_peak'] / MB:.0f} MB)"
+            + (f", process {sample['python_rss'] / MB:.0f} MB" if sample['python_rss'] else '')
+            + (f", browser {browser_rss / MB:.0f} MB in {sample['browser_processes']} processes" if browser_rss is not None else '')
+        )
+        for kind in ('python_heap', 'python_rss', 'browser_rss', 'driver_rss'):
+            if sample[kind] is not None:
+                MEMORY_BYTES.set(sample[kind], kind=kind)
+        TRACER.counter('memory_mb', **{kind: round(sample[kind] / MB, 1) for kind in ('python_heap', 'browser_rss')
+                                        if sample[kind] is not None})
+
+    def needs_recycle(self, sample: Dict[str, Any]) -> bool:
+        browser_rss = sample.get('browser_rss')
+        if browser_rss is None or browser_rss <= self.browser_rss_limit:
+            return False
+        if self._last_recycle is not None and time.monotonic() - self._last_recycle < self.min_recycle_interval:
+            return False
+        return True
+
+    def record_recycle(self, scraper: str):
+        self._last_recycle = time.monotonic()
+        if self.samples:
+            self.samples[-1]['action'] = 'recycle_context'
+        CONTEXT_RECYCLES.inc(scraper=scraper)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'limits': {'browser_rss': self.browser_rss_limit, 'python_heap': self.python_limit},
+            'recycles': sum(1 for sample in self.samples if sample.get('action') == 'recycle_context'),
+            'samples': self.samples
+        }
+
+    def save(self) -> Optional[str]:
+        if not self.report_path:
+            return None
+        tmp_path = f"{self.report_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=1)
+        os.replace(tmp_path, self.report_path)
+        logger.info(f"Memory report with {len(self.samples)} samples written to {self.report_path}")
+        return self.report_path
+
+    def stop(self):
+        self.save()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
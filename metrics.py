@@ -0,0 +1,252 @@
+"""
+Metrics - Laufzeit-Kennzahlen der Scraper im Prometheus-Textformat
+Zähler, Gauges und Histogramme pro Host/Scraper; Ausgabe als HTTP-Endpunkt (/metrics)
+oder als Textfile für den node-exporter (textfile collector).
+"""
+
+import os
+import threading
+import time
+import logging
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Buckets for page load times (seconds) and extracted rows per table
+SECONDS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+ROWS_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 250, 500, 1000, 5000)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], lock: threading.Lock):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.lock = lock
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}'] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}'
+                for key, value in sorted(self.values.items())]
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels, lock, buckets):
+        super().__init__(name, help_text, labels, lock)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.series: Dict[Tuple[str, ...], List[float]] = {}  # key -> [count per bucket..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            series = self.series.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series):
+                le = ('le', _format_value(bound))
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {_format_value(count)}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(series[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {_format_value(series[-1])}')
+        return lines
+
+class MetricsRegistry:
+    """Holds all metrics of the process; render() produces the Prometheus text exposition format."""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self.lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self.metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels, self.lock))
+
+    def gauge(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels, self.lock))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=SECONDS_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, self.lock, buckets))
+
+    def render(self) -> str:
+        with self.lock:
+            lines = [line for metric in self.metrics.values() for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Atomic write, so the node-exporter never reads a half-written file."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+class ThroughputMeter:
+    """Events per minute over a sliding window (e.g. matches/minute), fed into a gauge."""
+
+    def __init__(self, gauge: Gauge, window: float = 300.0):
+        self.gauge = gauge
+        self.window = window
+        self.events: Dict[Tuple[str, ...], deque] = {}
+
+    def mark(self, **labels):
+        now = time.monotonic()
+        events = self.events.setdefault(self.gauge._key(labels), deque())
+        events.append(now)
+        while events and now - events[0] > self.window:
+            events.popleft()
+        # Until the window is full, divide by the time actually covered (at least one minute)
+        span = min(max(now - events[0], 60.0), self.window)
+        self.gauge.set(round(len(events) * 60.0 / span, 2), **labels)
+
+class TextfileExporter:
+    """Rewrites the textfile every interval seconds from a daemon thread; stop() writes a final snapshot."""
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-textfile', daemon=True)
+
+    def start(self) -> 'TextfileExporter':
+        self._thread.start()
+        logger.info(f"Writing metrics to {self.path} every {self.interval:.0f}s")
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self.registry.write_textfile(self.path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics textfile {self.path}: {e}")
+
+    def stop(self):
+        self._stop.set()
+        self._write()
+
+def serve_http(registry: MetricsRegistry, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread; call shutdown() on the returned server to stop."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes every few seconds would flood the log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info(f"Metrics endpoint: http://{host}:{port}/metrics")
+    return server
+
+def start_exporters(registry: MetricsRegistry, port: Optional[int] = None, textfile: Optional[str] = None,
+                    interval: float = 15.0):
+    """Start the configured outputs; returns a stop() that shuts them down and writes the final textfile."""
+    server = serve_http(registry, port) if port else None
+    exporter = TextfileExporter(registry, textfile, interval).start() if textfile else None
+
+    def stop():
+        if server:
+            server.shutdown()
+        if exporter:
+            exporter.stop()
+    return stop
+
+# Process-wide registry and the metrics every scraper reports (wired into BaseScraper)
+METRICS = MetricsRegistry()
+
+PAGES_FETCHED = METRICS.counter('scraper_pages_fetched_total', 'Document navigations by host and HTTP status',
+                                ('scraper', 'host', 'status'))
+RESPONSE_BYTES = METRICS.counter('scraper_response_bytes_total', 'Document response bytes (body + headers) by host',
+                                 ('scraper', 'host'))
+PAGE_LOAD_SECONDS = METRICS.histogram('scraper_page_load_seconds', 'Time until the document response arrived',
+                                      ('host',), SECONDS_BUCKETS)
+RETRIES = METRICS.counter('scraper_retries_total', 'Retried navigations and scrape operations',
+                          ('scraper', 'operation'))
+BROWSER_RESTARTS = METRICS.counter('scraper_browser_restarts_total', 'Calls to restart_browser', ('scraper',))
+CONSENT_CLICKS = METRICS.counter('scraper_consent_clicks_total', 'Clicked cookie consent / close buttons',
+                                 ('scraper', 'action'))
+EXTRACTION_FAILURES = METRICS.counter('scraper_extraction_failures_total',
+                                      'Missing tables and failed scrape operations', ('scraper', 'operation'))
+TABLE_ROWS = METRICS.histogram('scraper_table_rows', 'Rows per extracted table', ('scraper',), ROWS_BUCKETS)
+QUEUE_DEPTH = METRICS.gauge('scraper_queue_depth', 'Work items waiting in a scraper queue', ('scraper', 'queue'))
+MATCHES_COMPLETED = METRICS.counter('scraper_matches_completed_total', 'Processed matches by source',
+                                    ('scraper', 'source'))
+MATCHES_PER_MINUTE = METRICS.gauge('scraper_matches_per_minute', 'Processed matches per minute (5 min window)',
+                                   ('scraper',))
+MATCH_THROUGHPUT = ThroughputMeter(MATCHES_PER_MINUTE)
@@ -6,7 +6,6 @@ Scrapes 2024-2025 Season Data for Basketball, Hockey, Baseball
 from base_scraper import BaseScraper, ScrapeResult, RateLimiter
 from website_analysis import NBA_STRUCTURE, NHL_STRUCTURE, MLB_STRUCTURE
 from datetime import datetime
-import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,8 +22,8 @@ class NBAScraper(BaseScraper):
             full_url = f"{self.base_url}{self.league_url}"
             await self.navigate_to_url(full_url, wait_for_selector="table#confs_standings_E")
 
-            east_standings = await self.extract_table_data("table#confs_standings_E")
-            west_standings = await self.extract_table_data("table#confs_standings_W")
+            tables = await self.extract_tables({"east": "table#confs_standings_E", "west": "table#confs_standings_W"})
+            east_standings, west_standings = tables["east"], tables["west"]
             team_links = await self.extract_links(self.config["css_selectors"]["team_links"], self.base_url)
 
             return ScrapeResult(
@@ -36,102 +35,58 @@ class NBAScraper(BaseScraper):
             logger.error(f"NBA standings error: {e}")
             return ScrapeResult(sport="NBA", data_type="standings", data=[], timestamp=datetime.now(), success=False, error_message=str(e))
 
-    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+    async def scrape_team_page(self, team_url: str):
+        """Roster and per-game stats come from the same team page - load it once for both results"""
         try:
             await self.navigate_to_url(team_url, wait_for_selector="table")
+            team_name = await self.get_team_name()
 
-            # Wait a bit for page to fully load
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            # Extract tables with better error handling
-            roster = await self.extract_table_data("table#roster")
-            stats = await self.extract_table_data("table#per_game")
+            tables = await self.extract_tables({"roster": "table#roster", "per_game": "table#per_game"}, payload="records")
+            roster, per_game = tables["roster"], tables["per_game"]
 
             # Add team and season info
-            for row in roster:
-                row['team'] = team_name
-                row['season'] = '2024-25'
-            for row in stats:
-                row['team'] = team_name
-                row['season'] = '2024-25'
-
-            logger.info(f"✅ NBA team stats successful for {team_name}: {len(roster)} roster, {len(stats)} stats")
-            return ScrapeResult(
-                sport="NBA",
-                data_type="team_stats",
-                data=[{"roster": roster, "stats": stats}],
-                timestamp=datetime.now(),
-                success=True
+            for table in (roster, per_game):
+                for row in table:
+                    row['team'] = team_name
+                    row['season'] = '2024-25'
+            # ScrapeResult data stays plain row dicts; the compact payload only shrinks the page transfer
+            roster, per_game = roster.to_dicts(), per_game.to_dicts()
+
+            logger.info(f"✅ NBA team page successful for {team_name}: {len(roster)} roster, {len(per_game)} players")
+            return (
+                ScrapeResult(
+                    sport="NBA",
+                    data_type="team_stats",
+                    data=[{"roster": roster, "stats": per_game}],
+                    timestamp=datetime.now(),
+                    success=True
+                ),
+                ScrapeResult(
+                    sport="NBA",
+                    data_type="player_stats",
+                    data=[{"players": per_game}],
+                    timestamp=datetime.now(),
+                    success=True
+                )
             )
 
         except Exception as e:
             error_msg = str(e)
             if "timeout" in error_msg.lower():
-                logger.warning(f"NBA team stats timeout for {team_url}: {e}")
+                logger.warning(f"NBA team page timeout for {team_url}: {e}")
             else:
-                logger.error(f"NBA team stats error for {team_url}: {e}")
-
-            return ScrapeResult(
-                sport="NBA",
-                data_type="team_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
-            )
-
-    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
-        try:
-            await self.navigate_to_url(team_url, wait_for_selector="table#per_game")
-
-            # Wait a bit for page to fully load
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
+                logger.error(f"NBA team page error for {team_url}: {e}")
 
-            player_stats = await self.extract_table_data("table#per_game")
-
-            # Add team and season info
-            for player in player_stats:
-                player['team'] = team_name
-                player['season'] = '2024-25'
-
-            logger.info(f"✅ NBA player stats successful for {team_name}: {len(player_stats)} players")
-            return ScrapeResult(
-                sport="NBA",
-                data_type="player_stats",
-                data=[{"players": player_stats}],
-                timestamp=datetime.now(),
-                success=True
+            return tuple(
+                ScrapeResult(sport="NBA", data_type=data_type, data=[], timestamp=datetime.now(), success=False, error_message=error_msg)
+                for data_type in ("team_stats", "player_stats")
             )
 
-        except Exception as e:
-            error_msg = str(e)
-            if "timeout" in error_msg.lower():
-                logger.warning(f"NBA player stats timeout for {team_url}: {e}")
-            else:
-                logger.error(f"NBA player stats error for {team_url}: {e}")
+    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 0)
 
-            return ScrapeResult(
-                sport="NBA",
-                data_type="player_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
-            )
+    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 1)
 
 class NHLScraper(BaseScraper):
     def __init__(self, rate_limiter: RateLimiter, headless: bool = True):
@@ -145,8 +100,8 @@ class NHLScraper(BaseScraper):
             full_url = f"{self.base_url}{self.league_url}"
             await self.navigate_to_url(full_url, wait_for_selector="table#standings_EAS")
 
-            east_standings = await self.extract_table_data("table#standings_EAS")
-            west_standings = await self.extract_table_data("table#standings_WES")
+            tables = await self.extract_tables({"east": "table#standings_EAS", "west": "table#standings_WES"})
+            east_standings, west_standings = tables["east"], tables["west"]
             team_links = await self.extract_links(self.config["css_selectors"]["team_links"], self.base_url)
 
             return ScrapeResult(
@@ -158,100 +113,60 @@ class NHLScraper(BaseScraper):
             logger.error(f"NHL standings error: {e}")
             return ScrapeResult(sport="NHL", data_type="standings", data=[], timestamp=datetime.now(), success=False, error_message=str(e))
 
-    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+    async def scrape_team_page(self, team_url: str):
+        """Roster, skaters and goalies come from the same team page - load it once for both results"""
         try:
             await self.navigate_to_url(team_url, wait_for_selector="table")
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            roster = await self.extract_table_data("table#roster")
-            skaters = await self.extract_table_data("table#skaters")
-            goalies = await self.extract_table_data("table#goalies")
-
-            for row in roster:
-                row['team'] = team_name
-                row['season'] = '2024-25'
-            for row in skaters:
-                row['team'] = team_name
-                row['season'] = '2024-25'
-            for row in goalies:
-                row['team'] = team_name
-                row['season'] = '2024-25'
-
-            logger.info(f"✅ NHL team stats successful for {team_name}: {len(roster)} roster, {len(skaters)} skaters, {len(goalies)} goalies")
-            return ScrapeResult(
-                sport="NHL",
-                data_type="team_stats",
-                data=[{"roster": roster, "skaters": skaters, "goalies": goalies}],
-                timestamp=datetime.now(),
-                success=True
-            )
-
-        except Exception as e:
-            error_msg = str(e)
-            if "timeout" in error_msg.lower():
-                logger.warning(f"NHL team stats timeout for {team_url}: {e}")
-            else:
-                logger.error(f"NHL team stats error for {team_url}: {e}")
+            team_name = await self.get_team_name()
 
-            return ScrapeResult(
-                sport="NHL",
-                data_type="team_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
+            tables = await self.extract_tables(
+                {"roster": "table#roster", "skaters": "table#skaters", "goalies": "table#goalies"}, payload="records"
             )
-
-    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
-        try:
-            await self.navigate_to_url(team_url, wait_for_selector="table#skaters")
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            player_stats = await self.extract_table_data("table#skaters")
-
-            for player in player_stats:
-                player['team'] = team_name
-                player['season'] = '2024-25'
-
-            logger.info(f"✅ NHL player stats successful for {team_name}: {len(player_stats)} players")
-            return ScrapeResult(
-                sport="NHL",
-                data_type="player_stats",
-                data=[{"players": player_stats}],
-                timestamp=datetime.now(),
-                success=True
+            roster, skaters, goalies = tables["roster"], tables["skaters"], tables["goalies"]
+
+            for table in (roster, skaters, goalies):
+                for row in table:
+                    row['team'] = team_name
+                    row['season'] = '2024-25'
+            # ScrapeResult data stays plain row dicts; the compact payload only shrinks the page transfer
+            roster, skaters, goalies = roster.to_dicts(), skaters.to_dicts(), goalies.to_dicts()
+
+            logger.info(f"✅ NHL team page successful for {team_name}: {len(roster)} roster, {len(skaters)} skaters, {len(goalies)} goalies")
+            return (
+                ScrapeResult(
+                    sport="NHL",
+                    data_type="team_stats",
+                    data=[{"roster": roster, "skaters": skaters, "goalies": goalies}],
+                    timestamp=datetime.now(),
+                    success=True
+                ),
+                ScrapeResult(
+                    sport="NHL",
+                    data_type="player_stats",
+                    data=[{"players": skaters}],
+                    timestamp=datetime.now(),
+                    success=True
+                )
             )
 
         except Exception as e:
             error_msg = str(e)
             if "timeout" in error_msg.lower():
-                logger.warning(f"NHL player stats timeout for {team_url}: {e}")
+                logger.warning(f"NHL team page timeout for {team_url}: {e}")
             else:
-                logger.error(f"NHL player stats error for {team_url}: {e}")
+                logger.error(f"NHL team page error for {team_url}: {e}")
 
-            return ScrapeResult(
-                sport="NHL",
-                data_type="player_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
+            return tuple(
+                ScrapeResult(sport="NHL", data_type=data_type, data=[], timestamp=datetime.now(), success=False, error_message=error_msg)
+                for data_type in ("team_stats", "player_stats")
             )
 
+    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 0)
+
+    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 1)
+
 class MLBScraper(BaseScraper):
     def __init__(self, rate_limiter: RateLimiter, headless: bool = True):
         super().__init__(rate_limiter, headless)
@@ -264,8 +179,10 @@ class MLBScraper(BaseScraper):
             full_url = f"{self.base_url}{self.league_url}"
             await self.navigate_to_url(full_url, wait_for_selector="table#teams_standard_batting")
 
-            batting_stats = await self.extract_table_data("table#teams_standard_batting")
-            pitching_stats = await self.extract_table_data("table#teams_standard_pitching")
+            tables = await self.extract_tables(
+                {"batting": "table#teams_standard_batting", "pitching": "table#teams_standard_pitching"}
+            )
+            batting_stats, pitching_stats = tables["batting"], tables["pitching"]
             team_links = await self.extract_links(self.config["css_selectors"]["team_links"], self.base_url)
 
             return ScrapeResult(
@@ -277,96 +194,54 @@ class MLBScraper(BaseScraper):
             logger.error(f"MLB standings error: {e}")
             return ScrapeResult(sport="MLB", data_type="standings", data=[], timestamp=datetime.now(), success=False, error_message=str(e))
 
-    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+    async def scrape_team_page(self, team_url: str):
+        """Team and player stats both come from team_batting/team_pitching - load the page once"""
         try:
             await self.navigate_to_url(team_url, wait_for_selector="table")
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            batting = await self.extract_table_data("table#team_batting")
-            pitching = await self.extract_table_data("table#team_pitching")
-
-            for row in batting:
-                row['team'] = team_name
-                row['season'] = '2024'
-            for row in pitching:
-                row['team'] = team_name
-                row['season'] = '2024'
-
-            logger.info(f"✅ MLB team stats successful for {team_name}: {len(batting)} batting, {len(pitching)} pitching")
-            return ScrapeResult(
-                sport="MLB",
-                data_type="team_stats",
-                data=[{"batting": batting, "pitching": pitching}],
-                timestamp=datetime.now(),
-                success=True
+            team_name = await self.get_team_name()
+
+            tables = await self.extract_tables({"batting": "table#team_batting", "pitching": "table#team_pitching"}, payload="records")
+            batting, pitching = tables["batting"], tables["pitching"]
+
+            for table in (batting, pitching):
+                for row in table:
+                    row['team'] = team_name
+                    row['season'] = '2024'
+            # ScrapeResult data stays plain row dicts; the compact payload only shrinks the page transfer
+            batting, pitching = batting.to_dicts(), pitching.to_dicts()
+
+            logger.info(f"✅ MLB team page successful for {team_name}: {len(batting)} batting, {len(pitching)} pitching")
+            return (
+                ScrapeResult(
+                    sport="MLB",
+                    data_type="team_stats",
+                    data=[{"batting": batting, "pitching": pitching}],
+                    timestamp=datetime.now(),
+                    success=True
+                ),
+                ScrapeResult(
+                    sport="MLB",
+                    data_type="player_stats",
+                    data=[{"batters": batting, "pitchers": pitching}],
+                    timestamp=datetime.now(),
+                    success=True
+                )
             )
 
         except Exception as e:
             error_msg = str(e)
             if "timeout" in error_msg.lower():
-                logger.warning(f"MLB team stats timeout for {team_url}: {e}")
+                logger.warning(f"MLB team page timeout for {team_url}: {e}")
             else:
-                logger.error(f"MLB team stats error for {team_url}: {e}")
-
-            return ScrapeResult(
-                sport="MLB",
-                data_type="team_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
-            )
+                logger.error(f"MLB team page error for {team_url}: {e}")
 
-    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
-        try:
-            await self.navigate_to_url(team_url, wait_for_selector="table#team_batting")
-            await asyncio.sleep(2)
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            batters = await self.extract_table_data("table#team_batting")
-            pitchers = await self.extract_table_data("table#team_pitching")
-
-            for player in batters:
-                player['team'] = team_name
-                player['season'] = '2024'
-            for player in pitchers:
-                player['team'] = team_name
-                player['season'] = '2024'
-
-            logger.info(f"✅ MLB player stats successful for {team_name}: {len(batters)} batters, {len(pitchers)} pitchers")
-            return ScrapeResult(
-                sport="MLB",
-                data_type="player_stats",
-                data=[{"batters": batters, "pitchers": pitchers}],
-                timestamp=datetime.now(),
-                success=True
+            return tuple(
+                ScrapeResult(sport="MLB", data_type=data_type, data=[], timestamp=datetime.now(), success=False, error_message=error_msg)
+                for data_type in ("team_stats", "player_stats")
             )
 
-        except Exception as e:
-            error_msg = str(e)
-            if "timeout" in error_msg.lower():
-                logger.warning(f"MLB player stats timeout for {team_url}: {e}")
-            else:
-                logger.error(f"MLB player stats error for {team_url}: {e}")
+    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 0)
 
-            return ScrapeResult(
-                sport="MLB",
-                data_type="player_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=error_msg
-            )
\ No newline at end of file
+    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 1)
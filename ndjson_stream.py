@@ -0,0 +1,123 @@
+"""
+NDJSON Stream - Ergebnisse als JSON-Zeilen, sobald sie entstehen
+Schreibt jeden Match-Datensatz bzw. jedes ScrapeResult sofort als eine Zeile nach stdout oder in eine
+Datei (flush pro Zeile), damit nachgelagerte Loader parallel zum Crawl arbeiten können.
+
+Schema (schema_version 1), ein JSON-Objekt pro Zeile, unterschieden über "type":
+    {"type": "start", "seq": 1, "schema_version": 1, "source": "main_match_scraper", "started_at": "...", ...}
+    {"type": "match", "seq": 2, "emitted_at": "...", "match": {match_id, matchday, date, home_team, away_team,
+        home_score, away_score, home_team_position, away_team_position, home_team_stats, away_team_stats, ...}}
+    {"type": "result", "seq": 3, "emitted_at": "...", "name": "nfl", "result": {sport, data_type, data,
+        timestamp, success, error_message}}
+    {"type": "end", "seq": 4, "finished_at": "...", "records": 2, "success": true, ...}
+Zeitstempel sind ISO 8601, NaN/Infinity werden als null geschrieben.
+"""
+
+import json
+import math
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Optional, Any
+from base_scraper import ScrapeResult
+from extraction import TableRecords
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, TableRecords):
+        return value.to_dicts()
+    if isinstance(value, Mapping):
+        # RowView, TeamStats and other dict-like records
+        return dict(value)
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _clean_floats(value: Any) -> Any:
+    """
+    One pass over the message before json.dumps: NaN/inf are not valid JSON and become null,
+    records and other containers become plain dicts/lists via _json_default.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, dict):
+        return {k: _clean_floats(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clean_floats(v) for v in value]
+    return _clean_floats(_json_default(value))
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(_clean_floats(message), ensure_ascii=False, allow_nan=False) + '\n').encode('utf-8')
+
+def result_to_dict(result: ScrapeResult) -> Dict[str, Any]:
+    return {
+        'sport': result.sport,
+        'data_type': result.data_type,
+        'data': result.data,
+        'timestamp': result.timestamp,
+        'success': result.success,
+        'error_message': result.error_message
+    }
+
+def result_from_dict(data: Dict[str, Any]) -> ScrapeResult:
+    return ScrapeResult(
+        sport=data['sport'],
+        data_type=data['data_type'],
+        data=data.get('data') or [],
+        timestamp=datetime.fromisoformat(data['timestamp']) if data.get('timestamp') else datetime.now(),
+        success=data.get('success', False),
+        error_message=data.get('error_message')
+    )
+
+class NdjsonWriter:
+    """
+    Writes the stream described above to a file or, with path None or "-", to stdout (logs go to
+    stderr). Every record is flushed on its own. If the reader goes away (broken pipe), the writer
+    stops streaming and the run continues with its other outputs.
+    """
+
+    def __init__(self, path: Optional[str] = None, source: str = "scraper"):
+        self.path = path if path and path != '-' else None
+        self.source = source
+        self.stream = open(self.path, 'wb') if self.path else sys.stdout.buffer
+        self.seq = 0
+        self.records = 0
+        self.closed = False
+
+    def _write(self, message: Dict[str, Any]):
+        if self.closed:
+            return
+        self.seq += 1
+        try:
+            self.stream.write(encode_message({'type': message.pop('type'), 'seq': self.seq, **message}))
+            self.stream.flush()
+        except BrokenPipeError:
+            logger.warning("NDJSON reader closed the stream, no further records are written")
+            self.closed = True
+
+    def start(self, **info):
+        self._write({'type': 'start', 'schema_version': SCHEMA_VERSION, 'source': self.source,
+                     'started_at': datetime.now(), **info})
+
+    def write_match(self, match: Dict[str, Any]):
+        self.records += 1
+        self._write({'type': 'match', 'emitted_at': datetime.now(), 'match': match})
+
+    def write_result(self, result: ScrapeResult, name: Optional[str] = None):
+        self.records += 1
+        self._write({'type': 'result', 'emitted_at': datetime.now(), 'name': name, 'result': result_to_dict(result)})
+
+    def finish(self, success: bool = True, **summary):
+        self._write({'type': 'end', 'finished_at': datetime.now(), 'records': self.records, 'success': success,
+                     **summary})
+        if self.path and not self.stream.closed:
+            self.stream.close()
+        self.closed = True
@@ -24,8 +24,8 @@ class NFLScraper(BaseScraper):
             full_url = f"{self.base_url}{self.league_url}"
             await self.navigate_to_url(full_url, wait_for_selector="table#AFC")
 
-            afc_standings = await self.extract_table_data("table#AFC")
-            nfc_standings = await self.extract_table_data("table#NFC")
+            tables = await self.extract_tables({"afc": "table#AFC", "nfc": "table#NFC"})
+            afc_standings, nfc_standings = tables["afc"], tables["nfc"]
 
             team_links = await self.extract_links(
                 self.config["css_selectors"]["team_links"],
@@ -58,108 +58,74 @@ class NFLScraper(BaseScraper):
                 error_message=str(e)
             )
 
-    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
-        logger.info(f"Scraping NFL team stats from: {team_url}")
+    async def scrape_team_page(self, team_url: str):
+        """Team and player stats share passing/rushing_and_receiving - load the team page once for both"""
+        logger.info(f"Scraping NFL team page: {team_url}")
 
         try:
             await self.navigate_to_url(team_url, wait_for_selector="table#team_stats")
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            team_stats = await self.extract_table_data("table#team_stats")
-            passing_stats = await self.extract_table_data("table#passing")
-            rushing_stats = await self.extract_table_data("table#rushing_and_receiving")
-            defense_stats = await self.extract_table_data("table#defense")
-
-            for row in team_stats:
-                row['team'] = team_name
-                row['season'] = '2024'
-            for row in passing_stats:
-                row['team'] = team_name
-                row['season'] = '2024'
-            for row in rushing_stats:
-                row['team'] = team_name
-                row['season'] = '2024'
-            for row in defense_stats:
-                row['team'] = team_name
-                row['season'] = '2024'
-
-            result_data = [{
-                "team_url": team_url,
-                "team_stats": team_stats,
-                "passing_stats": passing_stats,
-                "rushing_stats": rushing_stats,
-                "defense_stats": defense_stats
-            }]
-
-            return ScrapeResult(
-                sport="NFL",
-                data_type="team_stats",
-                data=result_data,
-                timestamp=datetime.now(),
-                success=True
+            team_name = await self.get_team_name()
+
+            tables = await self.extract_tables({
+                "team_stats": "table#team_stats",
+                "passing": "table#passing",
+                "rushing": "table#rushing_and_receiving",
+                "defense": "table#defense"
+            }, payload="records")
+            team_stats, passing_stats = tables["team_stats"], tables["passing"]
+            rushing_stats, defense_stats = tables["rushing"], tables["defense"]
+
+            for table in (team_stats, passing_stats, rushing_stats, defense_stats):
+                for row in table:
+                    row['team'] = team_name
+                    row['season'] = '2024'
+            # ScrapeResult data stays plain row dicts; the compact payload only shrinks the page transfer
+            team_stats, passing_stats = team_stats.to_dicts(), passing_stats.to_dicts()
+            rushing_stats, defense_stats = rushing_stats.to_dicts(), defense_stats.to_dicts()
+
+            return (
+                ScrapeResult(
+                    sport="NFL",
+                    data_type="team_stats",
+                    data=[{
+                        "team_url": team_url,
+                        "team_stats": team_stats,
+                        "passing_stats": passing_stats,
+                        "rushing_stats": rushing_stats,
+                        "defense_stats": defense_stats
+                    }],
+                    timestamp=datetime.now(),
+                    success=True
+                ),
+                ScrapeResult(
+                    sport="NFL",
+                    data_type="player_stats",
+                    data=[{
+                        "team_url": team_url,
+                        "passing_players": passing_stats,
+                        "rushing_players": rushing_stats
+                    }],
+                    timestamp=datetime.now(),
+                    success=True
+                )
             )
 
         except Exception as e:
-            logger.error(f"Error scraping NFL team stats: {e}", exc_info=True)
-            return ScrapeResult(
-                sport="NFL",
-                data_type="team_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=str(e)
+            logger.error(f"Error scraping NFL team page: {e}", exc_info=True)
+            return tuple(
+                ScrapeResult(
+                    sport="NFL",
+                    data_type=data_type,
+                    data=[],
+                    timestamp=datetime.now(),
+                    success=False,
+                    error_message=str(e)
+                )
+                for data_type in ("team_stats", "player_stats")
             )
 
-    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
-        logger.info(f"Scraping NFL player stats from: {team_url}")
-
-        try:
-            await self.navigate_to_url(team_url, wait_for_selector="table#passing")
-
-            team_name = await self.page.evaluate("""
-                () => {
-                    const title = document.querySelector('h1')?.textContent || '';
-                    return title.split(' 2024')[0].trim();
-                }
-            """)
-
-            passing_players = await self.extract_table_data("table#passing")
-            rushing_players = await self.extract_table_data("table#rushing_and_receiving")
-
-            for player in passing_players:
-                player['team'] = team_name
-                player['season'] = '2024'
-            for player in rushing_players:
-                player['team'] = team_name
-                player['season'] = '2024'
-
-            result_data = [{
-                "team_url": team_url,
-                "passing_players": passing_players,
-                "rushing_players": rushing_players
-            }]
-
-            return ScrapeResult(
-                sport="NFL",
-                data_type="player_stats",
-                data=result_data,
-                timestamp=datetime.now(),
-                success=True
-            )
+    async def scrape_team_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 0)
 
-        except Exception as e:
-            logger.error(f"Error scraping NFL player stats: {e}", exc_info=True)
-            return ScrapeResult(
-                sport="NFL",
-                data_type="player_stats",
-                data=[],
-                timestamp=datetime.now(),
-                success=False,
-                error_message=str(e)
-            )
\ No newline at end of file
+    async def scrape_player_stats(self, team_url: str) -> ScrapeResult:
+        return await self.team_page_part(team_url, 1)
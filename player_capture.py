@@ -0,0 +1,95 @@
+"""
+Player Capture - Spielerdaten aus den bereits geladenen Match-Seiten
+Sammelt alle Spielerzeilen der 6 Stat-Tabellen + Torwart-Tabellen ohne zusätzliche Requests
+"""
+
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from extraction import CELL_PARSER_JS
+
+logger = logging.getLogger(__name__)
+
+# Extracts every player row of the given tables in one evaluate call; args: {tableIds, textStats, typed}
+PLAYER_ROWS_SCRIPT = '''
+    ({tableIds, textStats, typed}) => {''' + CELL_PARSER_JS + '''
+        const result = {};
+        tableIds.forEach(tableId => {
+            const table = document.getElementById(tableId);
+            if (!table) return;
+
+            result[tableId] = Array.from(table.querySelectorAll('tbody tr'))
+                .filter(row => !row.classList.contains('thead') && row.querySelector('[data-stat="player"]'))
+                .map(row => {
+                    const playerCell = row.querySelector('[data-stat="player"]');
+                    const link = playerCell.querySelector('a');
+                    const idMatch = link ? (link.getAttribute('href') || '').match(/\\/players\\/([a-f0-9]+)/) : null;
+                    const rowData = {
+                        player_id: playerCell.getAttribute('data-append-csv') || (idMatch ? idMatch[1] : null),
+                        player: playerCell.textContent.trim()
+                    };
+                    row.querySelectorAll('td[data-stat]').forEach(cell => {
+                        const stat = cell.getAttribute('data-stat');
+                        const value = parseCell(cell.textContent, stat);
+                        if (value !== null) rowData[stat] = value;
+                    });
+                    return rowData;
+                });
+        });
+        return result;
+    }
+'''
+
+class PlayerMatchDataset:
+    """
+    Player rows of one match, merged across all stat tables by fbref player ID and stored
+    columnar: one list per stat, aligned with 'player_id'. Missing values are None.
+    """
+
+    def __init__(self, match_id: str, url: str = None):
+        self.match_id = match_id
+        self.url = url
+        self._players: Dict[str, Dict[str, Any]] = {}
+
+    def add_table(self, team_id: str, side: str, rows: List[Dict[str, Any]]):
+        for row in rows:
+            player_id = row.get('player_id') or f"{team_id}:{row.get('player')}"
+            record = self._players.setdefault(player_id, {'team_id': team_id, 'side': side, 'player': row.get('player')})
+            for stat, value in row.items():
+                # Same rule as the team totals: first table wins for duplicate stat names
+                if stat not in ('player_id', 'player') and stat not in record:
+                    record[stat] = value
+
+    def __len__(self):
+        return len(self._players)
+
+    def to_columns(self) -> Dict[str, Any]:
+        player_ids = list(self._players)
+        stats = []
+        for record in self._players.values():
+            for stat in record:
+                if stat not in stats:
+                    stats.append(stat)
+
+        return {
+            'match_id': self.match_id,
+            'url': self.url,
+            'player_id': player_ids,
+            'columns': {stat: [self._players[pid].get(stat) for pid in player_ids] for stat in stats}
+        }
+
+    def save(self, directory: str) -> Optional[str]:
+        if not self._players:
+            return None
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        file_path = path / f"{self.match_id}.json.gz"
+        with gzip.open(file_path, 'wt', encoding='utf-8') as f:
+            json.dump(self.to_columns(), f, ensure_ascii=False, separators=(',', ':'))
+        return str(file_path)
+
+def load_player_dataset(file_path: str) -> Dict[str, Any]:
+    with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,117 @@
+"""
+Revalidation - nachträgliche Stat-Korrekturen von FBRef erkennen
+Prüft gespielte Partien nach 1, 3 und 7 Tagen erneut: bedingter Request (ETag/Last-Modified),
+sonst Vergleich eines Hashes pro Stat-Spalte. Nur bei Änderungen wird die Partie neu extrahiert.
+"""
+
+import hashlib
+import json
+import re
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+from bs4 import BeautifulSoup, Comment
+from match_index import MatchIndex, STATUS_SCRAPED
+
+logger = logging.getLogger(__name__)
+
+REVALIDATION_DAYS = (1, 3, 7)
+
+# Player/keeper stat tables of a match page: stats_<team>_summary, keeper_stats_<team>, ...
+STATS_TABLE_ID = re.compile(r'^(keeper_)?stats_')
+
+def _stats_tables(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    tables = soup.find_all('table', id=STATS_TABLE_ID)
+    # Some tables only exist inside HTML comments until the page script unpacks them
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment) and '<table' in text):
+        tables.extend(BeautifulSoup(comment, 'html.parser').find_all('table', id=STATS_TABLE_ID))
+    return tables
+
+def stats_digest(html: str) -> Dict[str, Dict[str, str]]:
+    """Short hash per table and data-stat column (body rows and totals) of a match page."""
+    digest = {}
+    for table in _stats_tables(html):
+        columns: Dict[str, List[str]] = {}
+        for cell in table.select('tbody [data-stat], tfoot [data-stat]'):
+            columns.setdefault(cell['data-stat'], []).append(cell.get_text(strip=True))
+        digest[table['id']] = {
+            stat: hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()[:10]
+            for stat, values in columns.items()
+        }
+    return digest
+
+def content_hash(digest: Dict[str, Dict[str, str]]) -> str:
+    return hashlib.sha1(json.dumps(digest, sort_keys=True).encode('utf-8')).hexdigest()
+
+def changed_stats(old: Optional[Dict[str, Dict[str, str]]], new: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
+    """{table_id: [stats whose values differ]}; empty if nothing moved or there is no baseline."""
+    if not old:
+        return {}
+    changes = {}
+    for table_id in sorted(set(old) | set(new)):
+        old_columns = old.get(table_id, {})
+        new_columns = new.get(table_id, {})
+        stats = sorted(stat for stat in set(old_columns) | set(new_columns)
+                       if old_columns.get(stat) != new_columns.get(stat))
+        if stats:
+            changes[table_id] = stats
+    return changes
+
+class RevalidationScheduler:
+    """
+    Decides which scraped matches are due for a re-check. The n-th check of a match is due
+    REVALIDATION_DAYS[n] days after the match date; after the last one the match is left alone.
+    Checks that fell due before the match was (last) scraped count as done - the scrape already
+    saw that version - so a historic crawl does not make the whole season due at once.
+    State lives in the match index entries ('revalidation_step', 'last_checked_at', 'last_scraped_at').
+    """
+
+    def __init__(self, match_index: MatchIndex, days=REVALIDATION_DAYS):
+        self.match_index = match_index
+        self.days = tuple(days)
+
+    @staticmethod
+    def _played_at(entry: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return datetime.strptime(entry.get('date') or '', '%Y-%m-%d')
+        except ValueError:
+            return None
+
+    def _step(self, entry: Dict[str, Any]) -> int:
+        """Checks done so far, including those already covered by the last scrape"""
+        step = entry.get('revalidation_step', 0)
+        played_at = self._played_at(entry)
+        try:
+            scraped_at = datetime.fromisoformat(entry['last_scraped_at']) if entry.get('last_scraped_at') else None
+        except ValueError:
+            scraped_at = None
+        if played_at is not None and scraped_at is not None:
+            step = max(step, sum(1 for days in self.days if played_at + timedelta(days=days) <= scraped_at))
+        return step
+
+    def next_check(self, entry: Dict[str, Any]) -> Optional[datetime]:
+        played_at = self._played_at(entry)
+        step = self._step(entry)
+        if played_at is None or step >= len(self.days):
+            return None
+        return played_at + timedelta(days=self.days[step])
+
+    def due(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        now = now or datetime.now()
+        return [
+            entry for entry in self.match_index.matches()
+            if entry.get('scrape_status') == STATUS_SCRAPED
+            and self.next_check(entry) is not None and self.next_check(entry) <= now
+        ]
+
+    def record_check(self, match_id: str, now: Optional[datetime] = None):
+        entry = self.match_index.entries.get(match_id)
+        if entry is None:
+            return
+        now = now or datetime.now()
+        played_at = self._played_at(entry)
+        # A late run covers every check that has come due in the meantime
+        passed = sum(1 for days in self.days if played_at + timedelta(days=days) <= now)
+        entry['revalidation_step'] = max(self._step(entry) + 1, passed)
+        entry['last_checked_at'] = now.isoformat()
@@ -0,0 +1,207 @@
+"""
+Standings Engine - Bundesliga-Tabelle aus Spielergebnissen
+Berechnet die Tabellenplätze vor jedem Spieltag lokal aus dem FBRef-Spielplan (ersetzt Kicker.de)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+SCORE_PATTERN = re.compile(r'(\d+)\s*[–\-:]\s*(\d+)')
+
+@dataclass
+class TeamRecord:
+    team: str
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    away_goals: int = 0
+
+    @property
+    def points(self) -> int:
+        return 3 * self.won + self.drawn
+
+    @property
+    def goal_difference(self) -> int:
+        return self.goals_for - self.goals_against
+
+def parse_score(score_text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse an fbref score like '2–1' into (home_goals, away_goals); None if not played yet."""
+    if not score_text:
+        return None
+    # Penalty shoot-out markers like "(4) 1–1 (3)" only appear in cup games, strip them anyway
+    match = SCORE_PATTERN.search(re.sub(r'\(\d+\)', '', score_text))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+class StandingsEngine:
+    """
+    Incremental league table with the Bundesliga tie-breakers:
+    points, goal difference, goals scored, then head-to-head (points, goal difference,
+    away goals) and total away goals.
+    """
+
+    def __init__(self, teams: Iterable[str] = ()):
+        self.records: Dict[str, TeamRecord] = {}
+        self.results: List[Tuple[str, str, int, int]] = []
+        for team in teams:
+            self._record(team)
+
+    def _record(self, team: str) -> TeamRecord:
+        if team not in self.records:
+            self.records[team] = TeamRecord(team)
+        return self.records[team]
+
+    def add_result(self, home_team: str, away_team: str, home_goals: int, away_goals: int):
+        home = self._record(home_team)
+        away = self._record(away_team)
+        self.results.append((home_team, away_team, home_goals, away_goals))
+
+        home.played += 1
+        away.played += 1
+        home.goals_for += home_goals
+        home.goals_against += away_goals
+        away.goals_for += away_goals
+        away.goals_against += home_goals
+        away.away_goals += away_goals
+
+        if home_goals > away_goals:
+            home.won += 1
+            away.lost += 1
+        elif home_goals < away_goals:
+            away.won += 1
+            home.lost += 1
+        else:
+            home.drawn += 1
+            away.drawn += 1
+
+    def _head_to_head(self, teams: List[str]) -> Dict[str, TeamRecord]:
+        """Mini table containing only the games between the tied teams."""
+        tied = set(teams)
+        mini = StandingsEngine(teams)
+        for home_team, away_team, home_goals, away_goals in self.results:
+            if home_team in tied and away_team in tied:
+                mini.add_result(home_team, away_team, home_goals, away_goals)
+        return mini.records
+
+    def ranking(self) -> List[TeamRecord]:
+        ordered = sorted(
+            self.records.values(),
+            key=lambda r: (-r.points, -r.goal_difference, -r.goals_for, r.team)
+        )
+
+        # Resolve groups still level on points/goal difference/goals with head-to-head criteria
+        ranked = []
+        i = 0
+        while i < len(ordered):
+            j = i + 1
+            primary = (ordered[i].points, ordered[i].goal_difference, ordered[i].goals_for)
+            while j < len(ordered) and (ordered[j].points, ordered[j].goal_difference, ordered[j].goals_for) == primary:
+                j += 1
+
+            group = ordered[i:j]
+            if len(group) > 1:
+                h2h = self._head_to_head([r.team for r in group])
+                group.sort(key=lambda r: (
+                    -h2h[r.team].points,
+                    -h2h[r.team].goal_difference,
+                    -h2h[r.team].away_goals,
+                    -r.away_goals,
+                    r.team
+                ))
+            ranked.extend(group)
+            i = j
+
+        return ranked
+
+    def positions(self) -> Dict[str, int]:
+        """Current table positions. Before the first game every team is listed at position 1."""
+        if not self.results:
+            return {team: 1 for team in self.records}
+        return {record.team: position for position, record in enumerate(self.ranking(), 1)}
+
+    def table(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "position": position,
+                "team": r.team,
+                "played": r.played,
+                "won": r.won,
+                "drawn": r.drawn,
+                "lost": r.lost,
+                "goals_for": r.goals_for,
+                "goals_against": r.goals_against,
+                "goal_difference": r.goal_difference,
+                "points": r.points
+            }
+            for position, r in enumerate(self.ranking(), 1)
+        ]
+
+def positions_before_matchdays(matches: List[Dict[str, Any]]) -> Dict[int, Dict[str, int]]:
+    """
+    Table positions before every matchday, computed in one pass over the schedule.
+
+    Each match needs 'matchday', 'home_team', 'away_team' and either 'home_score'/'away_score'
+    or a 'score' string; matches without a result are skipped. With kickoff dates ('date',
+    YYYY-MM-DD) the table before matchday N holds every result played before N's first
+    kickoff, so postponed games count when they were played, not for their nominal matchday.
+    Without dates the results are applied per matchday number.
+    """
+    teams = []
+    for match in matches:
+        for team in (match['home_team'], match['away_team']):
+            if team not in teams:
+                teams.append(team)
+
+    engine = StandingsEngine(teams)
+    by_matchday: Dict[int, List[Dict[str, Any]]] = {}
+    for match in matches:
+        by_matchday.setdefault(match['matchday'], []).append(match)
+
+    starts = _matchday_starts(by_matchday)
+    if starts is None:
+        positions = {}
+        for matchday in sorted(by_matchday):
+            positions[matchday] = engine.positions()
+            for match in by_matchday[matchday]:
+                score = _match_score(match)
+                if score:
+                    engine.add_result(match['home_team'], match['away_team'], *score)
+        return positions
+
+    # Undated matches count as played at their matchday's first kickoff
+    played = sorted(
+        ((match.get('date') or starts[match['matchday']], match) for match in matches if _match_score(match)),
+        key=lambda item: item[0]
+    )
+    positions = {}
+    next_result = 0
+    for matchday in sorted(by_matchday, key=lambda md: (starts[md], md)):
+        while next_result < len(played) and played[next_result][0] < starts[matchday]:
+            match = played[next_result][1]
+            engine.add_result(match['home_team'], match['away_team'], *_match_score(match))
+            next_result += 1
+        positions[matchday] = engine.positions()
+
+    return positions
+
+def _matchday_starts(by_matchday: Dict[int, List[Dict[str, Any]]]) -> Optional[Dict[int, str]]:
+    """First kickoff date per matchday; None unless every matchday has at least one dated match."""
+    starts = {}
+    for matchday, matchday_matches in by_matchday.items():
+        dates = [match['date'] for match in matchday_matches if match.get('date')]
+        if not dates:
+            return None
+        starts[matchday] = min(dates)
+    return starts
+
+def _match_score(match: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    home_score = match.get('home_score')
+    away_score = match.get('away_score')
+    if home_score is not None and away_score is not None:
+        return int(home_score), int(away_score)
+    return parse_score(match.get('score'))
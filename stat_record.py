@@ -0,0 +1,123 @@
+"""
+Stat Records - kompakte Team-Statistiken mit festem Spaltenindex
+Ersetzt die dict-pro-Team Struktur (~180 String-Keys) durch ein float-Array (NaN = fehlt)
+"""
+
+import math
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, List, Optional, Any, Iterable
+
+NAN = float('nan')
+
+class StatSchema:
+    """Registry that assigns every fbref stat name a fixed column index."""
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.register_many(names)
+
+    def register(self, name: str) -> int:
+        idx = self.index.get(name)
+        if idx is None:
+            idx = len(self.names)
+            self.names.append(name)
+            self.index[name] = idx
+        return idx
+
+    def register_many(self, names: Iterable[str]):
+        for name in names:
+            self.register(name)
+
+    def __len__(self):
+        return len(self.names)
+
+# Shared by all team-side records so exporters can work on aligned columns
+TEAM_STATS_SCHEMA = StatSchema()
+
+class TeamStats(MutableMapping):
+    """
+    Stats of one team in one match. Numbers live in a float array indexed by the schema
+    (NaN for missing); the few text values (e.g. keeper nationality) are kept separately.
+    Behaves like the former dict for existing callers (get, items, in, len, ...).
+    """
+
+    __slots__ = ('schema', 'values', 'text')
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, schema: StatSchema = TEAM_STATS_SCHEMA):
+        self.schema = schema
+        self.values = array('d', [NAN]) * len(schema)
+        self.text: Dict[str, str] = {}
+        if data:
+            self.update(data)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.text:
+            return self.text[name]
+        idx = self.schema.index.get(name)
+        if idx is None or idx >= len(self.values) or math.isnan(self.values[idx]):
+            raise KeyError(name)
+        return self.values[idx]
+
+    def __setitem__(self, name: str, value: Any):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.text.pop(name, None)
+            self._set_number(name, float(value))
+        elif value is None:
+            if name in self:
+                del self[name]
+        else:
+            # Text stays out of the shared schema - a slot there would be a NaN column in every record
+            idx = self.schema.index.get(name)
+            if idx is not None and idx < len(self.values):
+                self.values[idx] = NAN
+            self.text[name] = value
+
+    def _set_number(self, name: str, value: float):
+        idx = self.schema.register(name)
+        if idx >= len(self.values):
+            # Schema grew after this record was created
+            self.values.extend([NAN] * (len(self.schema) - len(self.values)))
+        self.values[idx] = value
+
+    def __delitem__(self, name: str):
+        if name in self.text:
+            del self.text[name]
+            return
+        idx = self.schema.index.get(name)
+        if idx is None or idx >= len(self.values) or math.isnan(self.values[idx]):
+            raise KeyError(name)
+        self.values[idx] = NAN
+
+    def __iter__(self):
+        names = self.schema.names
+        for idx, value in enumerate(self.values):
+            if not math.isnan(value):
+                yield names[idx]
+        yield from self.text
+
+    def __len__(self):
+        return sum(1 for value in self.values if not math.isnan(value)) + len(self.text)
+
+    def __repr__(self):
+        return f"TeamStats({dict(self)!r})"
+
+    def numeric_items(self):
+        """(name, value) for numeric stats only - skips the text values without type checks."""
+        names = self.schema.names
+        return [(names[idx], value) for idx, value in enumerate(self.values) if not math.isnan(value)]
+
+def sum_stats(records: List[Any]) -> Dict[str, float]:
+    """Column-wise sum of the numeric stats of several team sides (dicts or TeamStats)."""
+    totals: Dict[str, float] = {}
+    for record in records:
+        if not record:
+            continue
+        items = record.numeric_items() if isinstance(record, TeamStats) else (
+            (name, value) for name, value in record.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        )
+        for name, value in items:
+            totals[name] = totals.get(name, 0.0) + value
+    return totals
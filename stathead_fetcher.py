@@ -0,0 +1,270 @@
+"""
+Stathead Fetcher - alle Ergebnisseiten einer Stathead-Abfrage
+Erkennt die Gesamtzahl der Treffer, lädt die offset-Seiten parallel in der eingeloggten Session
+und cached das zusammengeführte Ergebnis pro aufgelöster Query-URL
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from extraction import CELL_PARSER_JS, js_args
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for queries without a result count (following "Next page" links)
+MAX_PAGES = 200
+
+# Rows of the current result page plus what's needed to plan the rest; args: {textStats, typed}
+QUERY_PAGE_SCRIPT = '''
+    ({textStats, typed}) => {''' + CELL_PARSER_JS + '''
+        const table = document.querySelector('table#stats');
+        if (!table) return null;
+
+        // Repeated header rows inside tbody carry the class "thead"
+        const rows = Array.from(table.querySelectorAll('tbody tr:not(.thead)')).map(row => {
+            const rowData = {};
+            row.querySelectorAll('td, th').forEach(cell => {
+                const stat = cell.getAttribute('data-stat');
+                if (stat) rowData[stat] = parseCell(cell.textContent, stat);
+            });
+            return rowData;
+        }).filter(row => Object.keys(row).length > 0);
+
+        // "1,234 Matching Players" / "Showing 1 to 200 of 1,234"
+        let total = null;
+        const heading = document.querySelector('#stats_sh h2, #stats_sh .section_heading, .section_heading h2');
+        const headingText = heading ? heading.textContent.replace(/,/g, '') : '';
+        const ofMatch = headingText.match(/of\\s+(\\d+)/i) || headingText.match(/^\\s*(\\d+)\\s/);
+        if (ofMatch) total = parseInt(ofMatch[1], 10);
+
+        const next = document.querySelector('a.next, .prevnext a.button2.next');
+        return {rows, total, nextUrl: next ? next.href : null};
+    }
+'''
+
+def strip_offset(url: str) -> str:
+    """Query URL without the offset parameter - the cache key for the whole result."""
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'offset']
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+def offset_url(url: str, offset: int) -> str:
+    parts = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'offset']
+    query.append(('offset', str(offset)))
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+class QueryResultCache:
+    """Merged Stathead results as <directory>/<sha1 of query URL>.json.gz, valid for max_age_hours."""
+
+    def __init__(self, directory: str = "stathead_cache", max_age_hours: float = 12, policy=None):
+        self.directory = Path(directory)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.policy = policy  # optional CachePolicyEngine instead of the fixed max age
+
+    def _path(self, query_url: str) -> Path:
+        return self.directory / f"{hashlib.sha1(query_url.encode('utf-8')).hexdigest()}.json.gz"
+
+    def get(self, query_url: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(query_url)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cached Stathead result {path}: {e}")
+            return None
+        fetched_at = datetime.fromisoformat(data['fetched_at'])
+        if self.policy:
+            if not self.policy.is_fresh(query_url, fetched_at):
+                return None
+        elif datetime.now() - fetched_at > self.max_age:
+            return None
+        return data['rows']
+
+    def put(self, query_url: str, rows: List[Dict[str, Any]], total: Optional[int] = None):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = {'url': query_url, 'fetched_at': datetime.now().isoformat(), 'total': total, 'rows': rows}
+        with gzip.open(self._path(query_url), 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+class TinyUrlCache:
+    """
+    Persistent map of stathead.com/tiny/... links to the query URL they redirect to.
+    Entries older than max_age_days are treated as unknown, so the next fetch follows the
+    short link again and refreshes the target.
+    """
+
+    def __init__(self, path: str = "stathead_tiny_urls.json", max_age_days: float = 7, policy=None):
+        self.path = Path(path)
+        self.max_age = timedelta(days=max_age_days)
+        self.policy = policy  # optional CachePolicyEngine instead of the fixed max age
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read tiny URL cache {self.path}: {e}")
+
+    @staticmethod
+    def is_tiny(url: str) -> bool:
+        return '/tiny/' in urlparse(url).path
+
+    def resolve(self, url: str) -> Optional[str]:
+        entry = self.entries.get(url)
+        if not entry:
+            return None
+        resolved_at = datetime.fromisoformat(entry['resolved_at'])
+        if self.policy:
+            if not self.policy.is_fresh(url, resolved_at):
+                return None
+        elif datetime.now() - resolved_at > self.max_age:
+            return None
+        return entry['target']
+
+    def store(self, url: str, target: str):
+        if self.entries.get(url, {}).get('target') != target:
+            logger.info(f"Resolved {url} -> {target}")
+        self.entries[url] = {'target': target, 'resolved_at': datetime.now().isoformat()}
+        self._save()
+
+    def forget(self, url: str):
+        if self.entries.pop(url, None) is not None:
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+class StatheadFetcher:
+    """
+    Fetches every offset page of a Stathead query for a StatheadScraper.
+
+    Every page is loaded through the scraper's login detection: the first one on the scraper's
+    page, the remaining offsets on extra pages of the same context, as many at once as the rate
+    limiter allows per host. A session that expires mid-query is renewed once and the page reloaded.
+    Without a result count the "Next page" links are followed one by one instead.
+    """
+
+    def __init__(self, scraper, cache: Optional[QueryResultCache] = None, max_pages_in_flight: Optional[int] = None,
+                 tiny_urls: Optional[TinyUrlCache] = None):
+        self.scraper = scraper
+        self.cache = cache
+        self.tiny_urls = tiny_urls
+        self.max_pages_in_flight = max_pages_in_flight or getattr(scraper.rate_limiter, 'max_concurrency', 1)
+
+    async def fetch(self, url: str) -> Tuple[List[Dict[str, Any]], str, bool]:
+        """(rows, resolved query URL, served from cache). Raises instead of returning a partial result."""
+        target = self.tiny_urls.resolve(url) if self.tiny_urls else None
+        if target:
+            # Known short link: the cache key is stable, so a cached result needs no request at all
+            if self.cache:
+                cached = self.cache.get(target)
+                if cached is not None:
+                    logger.info(f"Stathead result served from cache: {len(cached)} rows for {target}")
+                    return cached, target, True
+            try:
+                opened = await self.scraper._open_query(target)
+            except Exception as e:
+                # Target moved - follow the short link again
+                logger.warning(f"Resolved target of {url} failed ({e}), following the short link")
+                self.tiny_urls.forget(url)
+                target = None
+        if not target:
+            opened = await self.scraper._open_query(url)
+        if not opened:
+            raise PermissionError("Stathead authentication failed")
+
+        query_url = strip_offset(self.scraper.page.url)
+        if self.tiny_urls and not target and TinyUrlCache.is_tiny(url):
+            self.tiny_urls.store(url, query_url)
+
+        if self.cache:
+            cached = self.cache.get(query_url)
+            if cached is not None:
+                logger.info(f"Stathead result served from cache: {len(cached)} rows for {query_url}")
+                return cached, query_url, True
+
+        first = await self.scraper.traced_evaluate(self.scraper.page, "stathead_page", QUERY_PAGE_SCRIPT, js_args())
+        if first is None:
+            raise ValueError(f"No results table on {query_url}")
+
+        rows = list(first['rows'])
+        total = first['total']
+        page_size = len(rows)
+        if total is None:
+            # The count comes from the section heading; a layout change silently disables the parallel fetch
+            logger.warning(f"No result count in the heading of {query_url}, following 'Next page' links instead")
+
+        if total and page_size and total > page_size:
+            offsets = list(range(page_size, total, page_size))
+            logger.info(f"Stathead query has {total} rows, fetching {len(offsets)} more pages")
+            pages = await self._fetch_offsets(query_url, offsets)
+            for offset in offsets:
+                rows.extend(pages[offset])
+        elif first['nextUrl']:
+            rows.extend(await self._follow_next(first['nextUrl']))
+
+        if total and len(rows) < total:
+            raise ValueError(f"Stathead query returned {len(rows)} of {total} rows: {query_url}")
+
+        if self.cache:
+            self.cache.put(query_url, rows, total)
+        return rows, query_url, False
+
+    async def _fetch_offsets(self, query_url: str, offsets: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        for offset in offsets:
+            queue.put_nowait(offset)
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+
+        async def worker():
+            page = await self.scraper.new_page()
+            try:
+                while True:
+                    try:
+                        offset = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    if not await self.scraper._load_query_page(offset_url(query_url, offset), page=page):
+                        raise PermissionError("Stathead authentication failed")
+                    result = await self.scraper.traced_evaluate(page, "stathead_page", QUERY_PAGE_SCRIPT, js_args())
+                    if result is None:
+                        raise ValueError(f"No results table at offset {offset}")
+                    pages[offset] = result['rows']
+            finally:
+                await page.close()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_pages_in_flight, len(offsets)))]
+        try:
+            await asyncio.gather(*workers)
+        except Exception:
+            for task in workers:
+                task.cancel()
+            raise
+        return pages
+
+    async def _follow_next(self, next_url: str) -> List[Dict[str, Any]]:
+        rows = []
+        for _ in range(MAX_PAGES):
+            if not await self.scraper._load_query_page(next_url):
+                raise PermissionError("Stathead authentication failed")
+            result = await self.scraper.traced_evaluate(self.scraper.page, "stathead_page", QUERY_PAGE_SCRIPT, js_args())
+            if result is None:
+                raise ValueError(f"No results table at {next_url}")
+            rows.extend(result['rows'])
+            next_url = result['nextUrl']
+            if not next_url:
+                return rows
+        raise ValueError(f"Stathead query exceeded {MAX_PAGES} pages")
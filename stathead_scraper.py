@@ -9,6 +9,9 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from base_scraper import BaseScraper, ScrapeResult, RateLimiter
+from stathead_session import SHARED_SESSION
+from stathead_fetcher import StatheadFetcher, QueryResultCache, TinyUrlCache
+from cache_policy import DEFAULT_POLICY
 import logging
 
 # Load .env file if it exists
@@ -23,18 +26,52 @@ except FileNotFoundError:
 
 logger = logging.getLogger(__name__)
 
+STATS_TABLE = 'table#stats'
+QUERY_CACHE = QueryResultCache("stathead_cache", policy=DEFAULT_POLICY)
+TINY_URLS = TinyUrlCache("stathead_tiny_urls.json", policy=DEFAULT_POLICY)
+LOGIN_FORM = 'input[name="password"]'
+
 class StatheadScraper(BaseScraper):
     def __init__(self, rate_limiter: RateLimiter, headless: bool = True):
         super().__init__(rate_limiter, headless)
         self.base_url = "https://stathead.com"
         self.login_url = f"{self.base_url}/users/login.cgi"
         self.is_authenticated = False
+        self.username = os.getenv('STATHEAD_USERNAME', 'R3dn4x')
+        self.session = SHARED_SESSION
+        self._session_saved_at = None  # which stored login this scraper's context is using
+        self._relogin_lock = asyncio.Lock()  # offset pages that all hit the login form log in once
+        self.fetcher = StatheadFetcher(self, QUERY_CACHE, tiny_urls=TINY_URLS)
+
+    async def initialize_browser(self):
+        # Start from the stored login so restarts and the other Stathead scrapers skip the login form
+        stored = self.session.load(self.username)
+        if stored:
+            self.storage_state = stored
+            self._session_saved_at = self.session.saved_at
+        await super().initialize_browser()
+        # Only assumed valid - the first query page shows whether the server still accepts it
+        self.is_authenticated = stored is not None
 
     async def authenticate(self) -> bool:
+        async with self.session.lock:
+            # Another Stathead scraper may have logged in while we waited for the lock
+            stored = self.session.load(self.username)
+            if stored and self.session.saved_at != self._session_saved_at:
+                await self.context.add_cookies(stored['cookies'])
+                self._session_saved_at = self.session.saved_at
+                self.is_authenticated = True
+                logger.info("Reusing Stathead session from another scraper")
+                return True
+
+            self.session.invalidate()
+            return await self._login()
+
+    async def _login(self) -> bool:
         try:
             await self.navigate_to_url(self.login_url)
 
-            username = os.getenv('STATHEAD_USERNAME', 'R3dn4x')
+            username = self.username
             password = os.getenv('STATHEAD_PASSWORD', 'BenScrape5r')
 
             if not username or not password:
@@ -51,6 +88,9 @@ class StatheadScraper(BaseScraper):
 
             if "Welcome" in await self.page.content():
                 self.is_authenticated = True
+                self.storage_state = await self.context.storage_state()
+                self.session.save(self.storage_state, username)
+                self._session_saved_at = self.session.saved_at
                 logger.info("Successfully authenticated with Stathead")
                 return True
             else:
@@ -61,50 +101,40 @@ class StatheadScraper(BaseScraper):
             logger.error(f"Error during Stathead authentication: {e}")
             return False
 
+    async def _open_query(self, url: str) -> bool:
+        """Load a query page; logs in again only if the stored session was rejected."""
+        if not self.is_authenticated and not await self.authenticate():
+            return False
+        return await self._load_query_page(url)
+
+    async def _load_query_page(self, url: str, page=None) -> bool:
+        """
+        Load a query or offset page on page (default: the scraper's page). If Stathead shows the
+        login form instead of the results, log in again once and reload; False if that fails.
+        """
+        page = page or self.page
+        session_used = self._session_saved_at
+        # Wait for either the results or the login form instead of timing out on an expired session
+        await self.navigate_to_url(url, wait_for_selector=f"{STATS_TABLE}, {LOGIN_FORM}", page=page)
+        if await page.query_selector(STATS_TABLE):
+            return True
+
+        async with self._relogin_lock:
+            # Another page of this scraper may have logged in again while this one loaded
+            if self._session_saved_at == session_used:
+                logger.info("Stathead session expired, logging in again")
+                self.is_authenticated = False
+                if not await self.authenticate():
+                    return False
+        await self.navigate_to_url(url, wait_for_selector=STATS_TABLE, page=page)
+        return True
+
     async def extract_stathead_table_data(self, url: str, sport: str, data_type: str) -> ScrapeResult:
         try:
-            if not self.is_authenticated:
-                auth_result = await self.authenticate()
-                if not auth_result:
-                    return ScrapeResult(
-                        sport=sport,
-                        data_type=data_type,
-                        data=[],
-                        timestamp=datetime.now(),
-                        success=False,
-                        error_message="Authentication failed"
-                    )
-
-            await self.navigate_to_url(url, wait_for_selector="table#stats")
-
-            table_data = await self.page.evaluate("""
-                () => {
-                    const table = document.querySelector('table#stats');
-                    if (!table) return [];
-
-                    const headers = Array.from(table.querySelectorAll('thead th')).map(th => {
-                        return th.getAttribute('data-stat') || th.textContent.trim();
-                    });
-
-                    const rows = Array.from(table.querySelectorAll('tbody tr')).map(row => {
-                        const cells = Array.from(row.querySelectorAll('td, th'));
-                        const rowData = {};
-
-                        cells.forEach((cell) => {
-                            const stat = cell.getAttribute('data-stat');
-                            if (stat) {
-                                rowData[stat] = cell.textContent.trim();
-                            }
-                        });
-
-                        return rowData;
-                    });
-
-                    return rows.filter(row => Object.keys(row).length > 0);
-                }
-            """)
-
-            logger.info(f"Extracted {len(table_data)} rows from Stathead {sport} {data_type}")
+            table_data, query_url, from_cache = await self.fetcher.fetch(url)
+
+            logger.info(f"Extracted {len(table_data)} rows from Stathead {sport} {data_type}"
+                        f"{' (cached)' if from_cache else ''}")
 
             return ScrapeResult(
                 sport=f"Stathead {sport}",
@@ -114,6 +144,15 @@ class StatheadScraper(BaseScraper):
                 success=True
             )
 
+        except PermissionError:
+            return ScrapeResult(
+                sport=f"Stathead {sport}",
+                data_type=data_type,
+                data=[],
+                timestamp=datetime.now(),
+                success=False,
+                error_message="Authentication failed"
+            )
         except Exception as e:
             logger.error(f"Error extracting Stathead data: {e}")
             return ScrapeResult(
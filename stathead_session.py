@@ -0,0 +1,85 @@
+"""
+Stathead Session - gespeicherter Login für alle Stathead Scraper
+Hält den Playwright storage_state nach erfolgreichem Login auf der Platte, damit Neustarts und
+weitere Scraper-Klassen ohne erneuten Login auskommen
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+SESSION_DOMAIN = "stathead.com"
+
+class StatheadSession:
+    """
+    Authenticated Stathead storage state (cookies + localStorage) in a JSON file.
+
+    load() only hands out a state that belongs to the same user, is younger than max_age_hours
+    and still has unexpired stathead.com cookies - everything else means a full login.
+    The lock serializes logins so scrapers running side by side log in once and share the result.
+    """
+
+    def __init__(self, path: str = "stathead_session.json", max_age_hours: float = 24):
+        self.path = Path(path)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.lock = asyncio.Lock()
+        self.saved_at: Optional[datetime] = None
+
+    def load(self, username: str) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read Stathead session {self.path}: {e}")
+            return None
+
+        saved_at = datetime.fromisoformat(data['saved_at']) if data.get('saved_at') else None
+        if data.get('username') != username or not saved_at or datetime.now() - saved_at > self.max_age:
+            return None
+
+        state = data.get('storage_state')
+        if not self.has_valid_cookies(state):
+            return None
+
+        self.saved_at = saved_at
+        return state
+
+    def save(self, storage_state: Dict[str, Any], username: str):
+        self.saved_at = datetime.now()
+        data = {'username': username, 'saved_at': self.saved_at.isoformat(), 'storage_state': storage_state}
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        logger.info(f"Saved Stathead session to {self.path}")
+
+    def invalidate(self):
+        self.saved_at = None
+        try:
+            self.path.unlink()
+            logger.info("Stathead session expired, removed stored state")
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def has_valid_cookies(storage_state: Optional[Dict[str, Any]]) -> bool:
+        """Offline check: at least one stathead.com cookie that hasn't expired (-1 = session cookie)."""
+        if not storage_state:
+            return False
+        now = time.time()
+        return any(
+            SESSION_DOMAIN in cookie.get('domain', '') and (cookie.get('expires', -1) == -1 or cookie['expires'] > now)
+            for cookie in storage_state.get('cookies', [])
+        )
+
+# One session for every Stathead scraper in the process
+SHARED_SESSION = StatheadSession()
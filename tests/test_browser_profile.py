@@ -0,0 +1,74 @@
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from browser_profile import BrowserProfile, LOCK_FILES
+
+KB = 1024
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def lock(profile, owner):
+    os.symlink(owner, os.path.join(profile.path, 'SingletonLock'))
+    for name in LOCK_FILES[1:]:
+        with open(os.path.join(profile.path, name), 'w'):
+            pass
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or sys.platform == 'win32', reason="Chromium locks are symlinks on POSIX")
+@pytest.mark.parametrize("owner", [
+    lambda: f"{socket.gethostname()}-{dead_pid()}",
+    lambda: f"other-machine-{os.getpid()}",
+    lambda: "garbage"
+])
+def test_stale_locks_are_removed(tmp_path, owner):
+    profile = BrowserProfile(str(tmp_path / 'profile'))
+    os.makedirs(profile.path)
+    lock(profile, owner())
+    profile.prepare()
+    assert not any(os.path.lexists(os.path.join(profile.path, name)) for name in LOCK_FILES)
+
+@pytest.mark.skipif(not hasattr(os, 'symlink') or sys.platform == 'win32', reason="Chromium locks are symlinks on POSIX")
+def test_lock_of_a_running_browser_is_kept(tmp_path):
+    profile = BrowserProfile(str(tmp_path / 'profile'))
+    os.makedirs(profile.path)
+    lock(profile, f"{socket.gethostname()}-{os.getpid()}")
+    with pytest.raises(RuntimeError, match="in use"):
+        profile.prepare()
+    assert all(os.path.lexists(os.path.join(profile.path, name)) for name in LOCK_FILES)
+
+def write(root, relative, size, age):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'x' * size)
+    timestamp = 1_700_000_000 - age
+    os.utime(path, (timestamp, timestamp))
+    return path
+
+def test_enforce_limits_trims_oldest_cache_files_only(tmp_path):
+    root = tmp_path / 'profile'
+    profile = BrowserProfile(str(root), max_profile_mb=1)
+    # Older than every cache file, but not a cache: cookies and preferences must survive
+    cookies = write(root, 'Default/Cookies', 300 * KB, age=1000)
+    cache = [write(root, relative, 300 * KB, age)
+             for relative, age in (('DiskCache/f_1', 400), ('Default/Code Cache/js/f_2', 300),
+                                   ('GrShaderCache/f_3', 200), ('DiskCache/f_4', 100))]
+
+    profile.enforce_limits()
+
+    # 1.5 MB is trimmed to at most 80% of 1 MB: the three oldest cache files go
+    assert cookies.exists()
+    assert [path.exists() for path in cache] == [False, False, False, True]
+    assert profile.size_bytes() == 600 * KB
+
+def test_enforce_limits_leaves_small_profiles_alone(tmp_path):
+    root = tmp_path / 'profile'
+    profile = BrowserProfile(str(root), max_profile_mb=1)
+    cache = write(root, 'DiskCache/f_1', 500 * KB, age=10_000)
+    profile.enforce_limits()
+    assert cache.exists()
@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+# browser_service imports main.py and with it the multi-sport Excel exporter
+browser_service = pytest.importorskip("browser_service")
+
+from base_scraper import ScrapeResult
+from browser_service import BrowserService, submit_job
+
+TOKEN = 'secret'
+
+def result(sport, index):
+    return ScrapeResult(sport=sport, data_type="team_stats", data=[{'team': f"Team {index}", 'wins': index}],
+                        timestamp=datetime(2024, 9, 1, 12), success=True)
+
+async def serve(service):
+    async def no_browser():
+        pass
+
+    # No Chromium: the fake sports below never touch the shared browser
+    service._ensure_browser = no_browser
+    service.server = await asyncio.start_server(service._handle_client, '127.0.0.1', 0)
+    service.port = service.server.sockets[0].getsockname()[1]
+    return service
+
+def fake_sport(events):
+    async def scrape_sport(scraper_class, rate_limiter, headless, browser=None, storage_states=None, on_result=None):
+        sport = scraper_class.__name__
+        results = []
+        try:
+            for index in range(3):
+                results.append(result(sport, index))
+                await on_result(results[-1])
+                await asyncio.sleep(0.01 if sport == 'NFLScraper' else 0.2)
+        except asyncio.CancelledError:
+            events.append(f"{sport} cancelled")
+            raise
+        events.append(f"{sport} done")
+        return results
+    return scrape_sport
+
+def test_non_loopback_host_requires_a_token():
+    with pytest.raises(ValueError):
+        BrowserService(host='0.0.0.0')
+    assert BrowserService(host='0.0.0.0', token=TOKEN).token == TOKEN
+    assert BrowserService(host='127.0.0.1').token is None
+
+def test_wrong_token_is_rejected(monkeypatch):
+    events = []
+    monkeypatch.setattr(browser_service, 'scrape_sport', fake_sport(events))
+
+    async def run():
+        service = await serve(BrowserService(token=TOKEN))
+        async with service.server:
+            for token in ('wrong', ''):
+                with pytest.raises(RuntimeError, match="token"):
+                    async for _ in submit_job(['nfl'], host='127.0.0.1', port=service.port, token=token):
+                        pass
+
+    asyncio.run(run())
+    assert events == []
+
+def test_results_are_streamed_back(monkeypatch):
+    events = []
+    monkeypatch.setattr(browser_service, 'scrape_sport', fake_sport(events))
+
+    async def run():
+        service = await serve(BrowserService(token=TOKEN))
+        async with service.server:
+            return [item async for item in submit_job(['nfl', 'nba'], host='127.0.0.1', port=service.port,
+                                                      token=TOKEN)]
+
+    received = asyncio.run(run())
+    assert len(received) == 6
+    names = [name for name, _ in received]
+    assert sorted(names) == ['nba'] * 3 + ['nfl'] * 3
+    # NFL is the fast fake sport - its results come back while NBA is still running
+    assert names.index('nba') < len(names) - 1 - names[::-1].index('nfl') < len(names) - 1
+    name, first = received[0]
+    assert first.success and first.data == [{'team': "Team 0", 'wins': 0}]
+    assert first.timestamp == datetime(2024, 9, 1, 12)
+    assert sorted(events) == ['NBAScraper done', 'NFLScraper done']
+
+def test_client_disconnect_cancels_the_job(monkeypatch):
+    events = []
+    monkeypatch.setattr(browser_service, 'scrape_sport', fake_sport(events))
+
+    async def run():
+        service = await serve(BrowserService(token=TOKEN))
+        async with service.server:
+            async for _ in submit_job(['nfl', 'nba'], host='127.0.0.1', port=service.port, token=TOKEN):
+                break
+            # Give the service time to hit the closed socket and cancel the slow sport
+            for _ in range(50):
+                if 'NBAScraper cancelled' in events:
+                    break
+                await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert 'NBAScraper cancelled' in events
+    assert 'NBAScraper done' not in events
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from cache_policy import (
+    CachePolicyEngine, ResultCache, STATE_FINAL, STATE_RECENT, STATE_UPCOMING, STATE_CURRENT,
+    KIND_FIXTURES, KIND_MATCH, KIND_STANDINGS, KIND_TEAM, KIND_STATHEAD_QUERY, KIND_TINY_URL, KIND_OTHER
+)
+from match_index import MatchIndex
+
+NOW = datetime(2026, 10, 19, 12)
+SCHEDULE = 'https://fbref.com/en/comps/20/2024-2025/schedule/2024-2025-Bundesliga-Scores-and-Fixtures'
+MATCH = 'https://fbref.com/en/matches/aa01/Bayern-Munich-Wolfsburg-August-25-2024-Bundesliga'
+KICKER = 'https://www.kicker.de/bundesliga/tabelle/2024-25/3'
+
+def engine():
+    return CachePolicyEngine(now_fn=lambda: NOW)
+
+def test_kind_of():
+    assert CachePolicyEngine.kind_of(SCHEDULE) == KIND_FIXTURES
+    assert CachePolicyEngine.kind_of(MATCH) == KIND_MATCH
+    assert CachePolicyEngine.kind_of(KICKER) == KIND_STANDINGS
+    assert CachePolicyEngine.kind_of('https://fbref.com/en/squads/054efa67/Bayern-Munich-Stats') == KIND_TEAM
+    assert CachePolicyEngine.kind_of('https://stathead.com/basketball/player-game-finder.cgi?x=1') == KIND_STATHEAD_QUERY
+    assert CachePolicyEngine.kind_of('https://stathead.com/tiny/abc') == KIND_TINY_URL
+    assert CachePolicyEngine.kind_of('https://example.com/') == KIND_OTHER
+
+def test_old_season_url_alone_is_not_final():
+    # 2024-25 lies in the past, but without a complete schedule the page still expires
+    policy = engine().classify(SCHEDULE)
+    assert policy.state == STATE_CURRENT
+    assert not policy.is_fresh(NOW - timedelta(hours=13), NOW)
+    assert engine().classify(SCHEDULE, complete=True).state == STATE_FINAL
+
+def test_match_states():
+    assert engine().classify(MATCH, finished=False).state == STATE_UPCOMING
+    assert engine().classify(MATCH).state == STATE_UPCOMING
+    assert engine().classify(MATCH, finished=True).state == STATE_RECENT
+    assert engine().classify(MATCH, finished=True, played_at=NOW - timedelta(days=2)).state == STATE_RECENT
+    final = engine().classify(MATCH, finished=True, played_at=NOW - timedelta(days=8))
+    assert final.state == STATE_FINAL and final.immutable
+    assert final.is_fresh(datetime(2000, 1, 1), NOW)
+
+def test_result_cache_uses_state_from_fetch_time(tmp_path):
+    cache = ResultCache(str(tmp_path), CachePolicyEngine())
+    cache.put('kicker_3', KICKER, {'Bayern': 1}, complete=False)
+    cache.put('kicker_4', KICKER.replace('/3', '/4'), {'Bayern': 2}, complete=True)
+    cache.put('match_aa01', MATCH, {'home_score': 2}, finished=True, played_at=datetime.now() - timedelta(days=30))
+    assert cache.get('kicker_3', KICKER) == {'Bayern': 1}
+    assert cache.get('missing', KICKER) is None
+
+    # Six hours later the incomplete table expired, the complete one and the old match did not
+    later = ResultCache(str(tmp_path), CachePolicyEngine(now_fn=lambda: datetime.now() + timedelta(hours=7)))
+    assert later.get('kicker_3', KICKER) is None
+    assert later.get('kicker_4', KICKER.replace('/3', '/4')) == {'Bayern': 2}
+    assert later.get('match_aa01', MATCH) == {'home_score': 2}
+
+def test_match_index_freshness_from_schedule_at_fetch(tmp_path):
+    rows = [{'url': 'https://fbref.com/en/matches/aa01/A-B', 'matchday': 1, 'score': '2–1'},
+            {'url': 'https://fbref.com/en/matches/aa02/C-D', 'matchday': 1, 'score': ''}]
+    path = str(tmp_path / 'index.json')
+    MatchIndex(path).update_from_schedule(rows, SCHEDULE)
+
+    stale = CachePolicyEngine(now_fn=lambda: datetime.now() + timedelta(days=1))
+    assert not MatchIndex(path, policy=stale).is_fresh(SCHEDULE)
+
+    rows[1]['score'] = '0–0'
+    MatchIndex(path).update_from_schedule(rows, SCHEDULE)
+    assert MatchIndex(path, policy=stale).is_fresh(SCHEDULE)
@@ -0,0 +1,102 @@
+import pytest
+
+from extraction import (
+    parse_cell, extract_rows_from_html, extract_tables_from_html, extract_links_from_html, TableRecords
+)
+
+TABLE_HTML = '''
+<table id="stats">
+  <thead><tr><th data-stat="player">Player</th><th data-stat="goals">Gls</th></tr></thead>
+  <tbody>
+    <tr><th data-stat="player"> Müller </th><td data-stat="goals">1,234</td><td data-stat="age">29-120</td></tr>
+    <tr><th data-stat="player">Kane</th><td data-stat="goals"></td><td data-stat="pct">45.2%</td></tr>
+  </tbody>
+</table>
+<!--
+<table id="hidden"><tbody><tr><td data-stat="plus_minus">−3</td></tr></tbody></table>
+-->
+<a class="team" href="/en/squads/abc/Bayern">Bayern</a>
+'''
+
+@pytest.mark.parametrize('text, stat, expected', [
+    ('1,234', None, 1234.0),
+    (' 45.2% ', None, 45.2),
+    ('−3', None, -3.0),
+    ('+1.5', None, 1.5),
+    ('.5', None, 0.5),
+    ('0', None, 0.0),
+    ('', None, None),
+    ('   ', None, None),
+    ('abc', None, 'abc'),
+    ('29-120', 'age', '29-120'),
+    ('2024-08-23', 'date', '2024-08-23'),
+    ('12', 'gameweek', '12'),
+])
+def test_parse_cell_typed(text, stat, expected):
+    assert parse_cell(text, stat) == expected
+
+def test_parse_cell_untyped_keeps_text():
+    assert parse_cell(' 1,234 ', 'goals', typed=False) == '1,234'
+    assert parse_cell('', 'goals', typed=False) == ''
+    assert parse_cell('12', None, typed=False) == '12'
+
+def test_parse_cell_passes_through_values():
+    assert parse_cell(None) is None
+    assert parse_cell(3) == 3
+    assert parse_cell(2.5, typed=False) == 2.5
+
+def test_offline_rows_default_to_text():
+    rows = extract_rows_from_html(TABLE_HTML, 'table#stats')
+    assert rows == [
+        {'player': 'Müller', 'goals': '1,234', 'age': '29-120'},
+        {'player': 'Kane', 'goals': '', 'pct': '45.2%'},
+    ]
+
+def test_offline_rows_typed():
+    rows = extract_rows_from_html(TABLE_HTML, 'table#stats', typed=True)
+    assert rows[0] == {'player': 'Müller', 'goals': 1234.0, 'age': '29-120'}
+    assert rows[1] == {'player': 'Kane', 'goals': None, 'pct': 45.2}
+
+def test_offline_tables_compact_and_commented():
+    result = extract_tables_from_html(TABLE_HTML, ['table#stats', 'table#hidden', 'table#missing'],
+                                      compact=True, typed=True)
+    assert result['table#stats']['header'] == ['player', 'goals', 'age', 'pct']
+    assert result['table#stats']['rows'] == [['Müller', 1234.0, '29-120'], ['Kane', None, None, 45.2]]
+    # Kane's row has no age cell - a hole, unlike his blank goals cell
+    assert result['table#stats']['missing'] == [[1, 2]]
+    # sports-reference ships secondary tables inside HTML comments
+    assert result['table#hidden']['rows'] == [[-3.0]]
+    assert result['table#missing'] is None
+
+def _records(typed=False):
+    data = extract_tables_from_html(TABLE_HTML, ['table#stats'], compact=True, typed=typed)['table#stats']
+    return TableRecords(data['header'], data['rows'], data['missing'])
+
+@pytest.mark.parametrize('typed', [False, True])
+def test_records_rows_match_row_dicts(typed):
+    records = _records(typed)
+    assert records.to_dicts() == extract_rows_from_html(TABLE_HTML, 'table#stats', typed=typed)
+
+def test_record_row_only_has_its_own_cells():
+    kane = _records(typed=True)[1]
+    assert len(kane) == 3
+    assert list(kane) == ['player', 'goals', 'pct']
+    assert 'age' not in kane
+    assert kane['goals'] is None
+    assert kane.get('age', 'n/a') == 'n/a'
+    with pytest.raises(KeyError):
+        kane['age']
+
+def test_record_row_assignment_adds_column():
+    records = _records()
+    for row in records:
+        row['team'] = 'Bayern'
+    records[0]['note'] = 'captain'
+    assert records.header[-2:] == ['team', 'note']
+    assert records.to_dicts()[1] == {'player': 'Kane', 'goals': '', 'pct': '45.2%', 'team': 'Bayern'}
+    assert 'note' not in records[1]
+    assert records.column('note') == ['captain', None]
+    assert records.column('age') == ['29-120', None]
+
+def test_offline_links():
+    assert extract_links_from_html(TABLE_HTML, 'a.team', 'https://fbref.com') == ['https://fbref.com/en/squads/abc/Bayern']
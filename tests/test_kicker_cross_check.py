@@ -0,0 +1,40 @@
+import asyncio
+import logging
+
+from base_scraper import RateLimiter
+from bundesliga_match_scraper import BundesligaMatchScraper
+
+# fbref schedule names -> Kicker.de table after get_kicker_table_positions() mapped it to short names
+FBREF_POSITIONS = {'Bayern Munich': 1, 'Eint Frankfurt': 2, 'Mainz 05': 3, 'RB Leipzig': 4, 'Gladbach': 5}
+KICKER_POSITIONS = {'Bayern Munich': 1, 'Frankfurt': 2, 'Mainz': 3, 'Leipzig': 4, 'Gladbach': 5}
+
+class KickerStub(BundesligaMatchScraper):
+    def __init__(self, kicker_positions):
+        super().__init__(RateLimiter())
+        self.kicker_positions = kicker_positions
+
+    async def get_kicker_table_positions(self, matchday):
+        return self.kicker_positions
+
+def cross_check(kicker_positions, caplog):
+    with caplog.at_level(logging.INFO, logger='bundesliga_match_scraper'):
+        asyncio.run(KickerStub(kicker_positions)._cross_check_with_kicker(5, FBREF_POSITIONS))
+    return [record for record in caplog.records if record.name == 'bundesliga_match_scraper']
+
+def test_fbref_names_are_matched_with_kicker(caplog):
+    records = cross_check(KICKER_POSITIONS, caplog)
+    assert [record.levelname for record in records] == ['INFO']
+    assert 'match Kicker.de' in records[0].getMessage()
+
+def test_differences_are_reported_under_the_fbref_name(caplog):
+    records = cross_check({**KICKER_POSITIONS, 'Frankfurt': 3, 'Mainz': 2}, caplog)
+    assert len(records) == 1 and records[0].levelname == 'WARNING'
+    assert 'Eint Frankfurt: 2 (Kicker: 3)' in records[0].getMessage()
+    assert 'Mainz 05: 3 (Kicker: 2)' in records[0].getMessage()
+
+def test_unknown_names_are_not_counted_as_a_match(caplog):
+    kicker_positions = dict(KICKER_POSITIONS)
+    del kicker_positions['Gladbach']
+    records = cross_check(kicker_positions, caplog)
+    assert [record.levelname for record in records] == ['WARNING']
+    assert 'No Kicker.de position for Gladbach' in records[0].getMessage()
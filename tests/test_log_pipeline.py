@@ -0,0 +1,75 @@
+import atexit
+import json
+import logging
+
+import log_pipeline
+from log_pipeline import SamplingFilter, RateLimitFilter, DEFAULT_SAMPLE_RATES, TextFormatter, setup_logging
+
+def record(name, level=logging.INFO, msg='message', args=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+def test_only_mapping_messages_are_sampled():
+    sampling = SamplingFilter(DEFAULT_SAMPLE_RATES)
+    kept = [sampling.filter(record('match_excel_exporter.mapping')) for _ in range(20)]
+    assert kept.count(True) == 2
+    assert all(sampling.filter(record('match_excel_exporter')) for _ in range(20))
+
+def test_warnings_always_pass():
+    sampling = SamplingFilter({'noisy': 0.1})
+    assert all(sampling.filter(record('noisy', logging.WARNING)) for _ in range(5))
+
+def test_rate_limit_per_message_template():
+    limit = RateLimitFilter(max_records=3, window=60)
+    # Numbers and fbref IDs are masked, so these are all the same message
+    kept = [limit.filter(record('scraper', msg=f"Extracted {n} rows for 054efa{n:02d}")) for n in range(10)]
+    assert kept == [True] * 3 + [False] * 7
+    assert limit.filter(record('scraper', msg="Other message"))
+    assert limit.filter(record('other_logger', msg="Extracted 1 rows for 054efa01"))
+    assert limit.filter(record('scraper', logging.WARNING, msg="Extracted 1 rows for 054efa01"))
+
+def test_errors_are_never_rate_limited():
+    limit = RateLimitFilter(max_records=1, window=60)
+    assert all(limit.filter(record('scraper', logging.ERROR, msg="Failed")) for _ in range(5))
+
+def test_next_window_reports_the_suppressed_count(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(log_pipeline.time, 'monotonic', lambda: now[0])
+    limit = RateLimitFilter(max_records=2, window=60)
+    for n in range(5):
+        limit.filter(record('scraper', msg=f"Page {n} loaded"))
+
+    now[0] += 61
+    first = record('scraper', msg="Page 6 loaded")
+    assert limit.filter(first)
+    assert first.suppressed == 3
+    assert TextFormatter().format(first).endswith("Page 6 loaded (+3 similar messages suppressed)")
+    second = record('scraper', msg="Page 7 loaded")
+    assert limit.filter(second) and not hasattr(second, 'suppressed')
+
+def test_queue_pipeline_writes_sampled_and_limited_json_lines(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    log_file = tmp_path / 'scraper.log'
+    try:
+        listener = setup_logging(log_file=str(log_file), rate_limit=(5, 60.0))
+        for n in range(30):
+            logging.getLogger('scraper').info("Match %d done", n, extra={'match_id': f"aa{n:02d}"})
+            logging.getLogger('match_excel_exporter.mapping').info("Mapped %d stats", n)
+        logging.getLogger('scraper').error("Failed once")
+        atexit.unregister(listener.stop)
+        listener.stop()
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    lines = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+    matches = [line for line in lines if line['message'].startswith('Match')]
+    assert [line['match_id'] for line in matches] == ['aa00', 'aa01', 'aa02', 'aa03', 'aa04']
+    # Every 10th mapping message passes the sampling: 0, 10, 20
+    assert [line['message'] for line in lines if line['logger'] == 'match_excel_exporter.mapping'] == [
+        'Mapped 0 stats', 'Mapped 10 stats', 'Mapped 20 stats'
+    ]
+    assert lines[-1]['level'] == 'ERROR' and lines[-1]['message'] == 'Failed once'
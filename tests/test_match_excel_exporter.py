@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from match_excel_exporter import MatchExcelExporter, IncrementalMatchExport
+from tracing import TRACER
+
+TEMPLATE = str(Path(__file__).resolve().parent.parent / 'Vorlage-Scrapen.xlsx')
+
+PARAMETERS = ['goals', 'table_position_before_match', 'opponent', 'opponent_position', 'venue']
+
+def match(**positions):
+    return {'matchday': 5, 'date': '2024-09-28', 'home_team': 'Bayern München', 'away_team': 'VfB Stuttgart',
+            'home_team_stats': {'goals': 2.0}, 'away_team_stats': {'goals': 1.0}, **positions}
+
+def test_known_positions_are_written():
+    exporter = MatchExcelExporter()
+    _, cells = exporter._team_column('Stuttgart', PARAMETERS, match(home_team_position=3, away_team_position=7))
+    assert cells['table_position_before_match'] == 7
+    assert cells['opponent_position'] == 3
+    assert cells['opponent'] == 'Bayern Munich'
+    assert cells['venue'] == 'Away'
+
+def test_unknown_positions_stay_blank():
+    exporter = MatchExcelExporter()
+    side = exporter._team_side('Bayern Munich', match())
+    assert side['team_position'] is None and side['opponent_position'] is None
+    _, cells = exporter._team_column('Bayern Munich', PARAMETERS, match(away_team_position=4))
+    assert cells['table_position_before_match'] is None
+    assert cells['opponent_position'] == 4
+
+def test_export_thread_traces_on_its_own_lane(monkeypatch):
+    monkeypatch.setattr(TRACER, 'enabled', True)
+    monkeypatch.setattr(TRACER, 'events', [])
+    export = IncrementalMatchExport(MatchExcelExporter(template_path=TEMPLATE))
+    try:
+        export.add(match(match_id='aa01'))
+        export._wait()
+    finally:
+        export.close()
+
+    ingest = [event for event in TRACER.events if event['name'] == 'ingest_match']
+    assert len(ingest) == 1
+    assert ingest[0]['args'] == {'lane': 'excel-export', 'match_id': 'aa01', 'matchday': 5}
+    assert {event['args']['lane'] for event in TRACER.events} == {'excel-export'}
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from match_index import MatchIndex, STATUS_PENDING, STATUS_SCRAPED, STATUS_FAILED
+
+def schedule_row(match_id, matchday, score, date='2024-08-23'):
+    return {'url': f'https://fbref.com/en/matches/{match_id}/A-B', 'matchday': matchday, 'date': date,
+            'home_team': 'A', 'away_team': 'B', 'score': score, 'columns': {'venue': 'Stadion', 'score': score}}
+
+def test_match_id_from_url():
+    assert MatchIndex.match_id_from_url('https://fbref.com/en/matches/a1b2c3d4/Bayern-Munich') == 'a1b2c3d4'
+    assert MatchIndex.match_id_from_url('https://fbref.com/en/comps/20/schedule') is None
+    assert MatchIndex.match_id_from_url(None) is None
+
+def test_update_keeps_all_columns_and_persists(tmp_path):
+    path = tmp_path / 'index.json'
+    index = MatchIndex(str(path))
+    index.update_from_schedule([schedule_row('aa01', 1, '2–1'), schedule_row('aa02', 2, '')], 'https://fbref.com/s')
+
+    reloaded = MatchIndex(str(path))
+    assert set(reloaded.entries) == {'aa01', 'aa02'}
+    assert reloaded.entries['aa01']['columns']['venue'] == 'Stadion'
+    assert reloaded.entries['aa01']['scrape_status'] == STATUS_PENDING
+    assert reloaded.is_fresh('https://fbref.com/s')
+    assert not reloaded.is_fresh('https://fbref.com/other')
+
+def test_pending_follows_scrape_status(tmp_path):
+    index = MatchIndex(str(tmp_path / 'index.json'))
+    index.update_from_schedule([schedule_row('aa01', 1, '2–1'), schedule_row('aa02', 1, '0–0'),
+                                schedule_row('aa03', 2, '1–1')], 'https://fbref.com/s')
+    index.mark_scraped('aa01')
+    index.mark_failed('aa02', 'timeout')
+
+    assert [m['match_id'] for m in index.pending()] == ['aa02', 'aa03']
+    assert index.entries['aa01']['last_scraped_at']
+    assert index.entries['aa02']['scrape_status'] == STATUS_FAILED
+    assert index.entries['aa02']['error'] == 'timeout'
+
+def test_changed_result_resets_status(tmp_path):
+    index = MatchIndex(str(tmp_path / 'index.json'))
+    index.update_from_schedule([schedule_row('aa01', 1, '2–1'), schedule_row('aa02', 1, '0–0')], 'https://fbref.com/s')
+    index.mark_scraped('aa01')
+    index.mark_scraped('aa02')
+
+    index.update_from_schedule([schedule_row('aa01', 1, '2–1'), schedule_row('aa02', 1, '1–0')], 'https://fbref.com/s')
+    assert index.entries['aa01']['scrape_status'] == STATUS_SCRAPED
+    assert index.entries['aa02']['scrape_status'] == STATUS_PENDING
+
+def test_completeness_and_expiry(tmp_path):
+    index = MatchIndex(str(tmp_path / 'index.json'), max_age_hours=1)
+    index.update_from_schedule([schedule_row('aa01', 1, '2–1'), schedule_row('aa02', 2, '')], 'https://fbref.com/s')
+    assert index.matchday_complete(1)
+    assert not index.matchday_complete(2)
+    assert not index.matchday_complete(3)
+    assert not index.season_complete()
+
+    index.updated_at = datetime.now() - timedelta(hours=2)
+    assert not index.is_fresh()
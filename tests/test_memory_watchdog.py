@@ -0,0 +1,63 @@
+import json
+import os
+
+import memory_watchdog
+from memory_watchdog import MemoryWatchdog, MB, process_memory
+
+def watchdog(**kwargs):
+    return MemoryWatchdog(report_path=None, browser_rss_limit_mb=1500, **kwargs)
+
+def test_recycle_only_above_the_browser_limit():
+    dog = watchdog()
+    assert not dog.needs_recycle({'browser_rss': None})
+    assert not dog.needs_recycle({'browser_rss': 1500 * MB})
+    assert dog.needs_recycle({'browser_rss': 1500 * MB + 1})
+
+def test_recycles_are_spaced_by_the_minimum_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(memory_watchdog.time, 'monotonic', lambda: now[0])
+    dog = watchdog(min_recycle_interval=60)
+    dog.samples.append({'phase': 'match_10'})
+    dog.record_recycle('BundesligaMatchScraper')
+    assert dog.samples[-1]['action'] == 'recycle_context'
+
+    over = {'browser_rss': 2000 * MB}
+    now[0] += 59
+    assert not dog.needs_recycle(over)
+    now[0] += 2
+    assert dog.needs_recycle(over)
+    assert dog.report()['recycles'] == 1
+
+def test_heap_over_the_limit_triggers_gc_and_report(tmp_path):
+    report_path = tmp_path / 'memory_report.json'
+    dog = MemoryWatchdog(str(report_path), python_limit_mb=0).start()
+    try:
+        sample = dog.sample('schedule', matches=306)
+        second = dog.sample('match_10')
+    finally:
+        dog.stop()
+
+    assert sample['action'].startswith('gc')
+    assert sample['info'] == {'matches': 306}
+    assert 'growth' not in sample and 'growth' in second
+    report = json.loads(report_path.read_text())
+    assert [s['phase'] for s in report['samples']] == ['schedule', 'match_10']
+    assert report['limits']['python_heap'] == 0
+
+def test_browser_processes_are_split_from_the_driver(monkeypatch):
+    pid = os.getpid()
+    table = {
+        pid: {'ppid': 1, 'name': 'python', 'rss': 100 * MB},
+        2001: {'ppid': pid, 'name': 'node', 'rss': 50 * MB},               # Playwright driver
+        2002: {'ppid': 2001, 'name': 'chrome', 'rss': 300 * MB},
+        2003: {'ppid': 2002, 'name': 'chrome_crashpad', 'rss': 10 * MB},
+        2004: {'ppid': 2001, 'name': 'headless_shell', 'rss': 200 * MB},
+        3000: {'ppid': 1, 'name': 'chrome', 'rss': 999 * MB},              # someone else's browser
+    }
+    monkeypatch.setattr(memory_watchdog, '_process_table', lambda: table)
+    assert process_memory() == {
+        'python_rss': 100 * MB, 'browser_rss': 510 * MB, 'driver_rss': 50 * MB, 'browser_processes': 3
+    }
+
+    monkeypatch.setattr(memory_watchdog, '_process_table', lambda: {})
+    assert process_memory()['browser_rss'] is None
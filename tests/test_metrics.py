@@ -0,0 +1,73 @@
+import urllib.request
+
+from metrics import MetricsRegistry, ThroughputMeter, CONTENT_TYPE, serve_http, start_exporters
+
+def registry_with_samples():
+    registry = MetricsRegistry()
+    pages = registry.counter('pages_total', 'Pages by host', ('host', 'status'))
+    pages.inc(host='fbref.com', status=200)
+    pages.inc(2, host='fbref.com', status=200)
+    pages.inc(host='kicker.de', status=429)
+    registry.gauge('queue_depth', 'Waiting matches').set(7)
+    load = registry.histogram('load_seconds', 'Load time', ('host',), buckets=(1, 5))
+    load.observe(0.5, host='fbref.com')
+    load.observe(3.25, host='fbref.com')
+    return registry
+
+def test_exposition_format():
+    assert registry_with_samples().render() == '\n'.join([
+        '# HELP pages_total Pages by host',
+        '# TYPE pages_total counter',
+        'pages_total{host="fbref.com",status="200"} 3',
+        'pages_total{host="kicker.de",status="429"} 1',
+        '# HELP queue_depth Waiting matches',
+        '# TYPE queue_depth gauge',
+        'queue_depth 7',
+        '# HELP load_seconds Load time',
+        '# TYPE load_seconds histogram',
+        'load_seconds_bucket{host="fbref.com",le="1"} 1',
+        'load_seconds_bucket{host="fbref.com",le="5"} 2',
+        'load_seconds_bucket{host="fbref.com",le="+Inf"} 2',
+        'load_seconds_sum{host="fbref.com"} 3.75',
+        'load_seconds_count{host="fbref.com"} 2',
+    ]) + '\n'
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter('errors_total', 'Errors', ('operation',)).inc(operation='a"b\\c\nd')
+    assert registry.render().splitlines()[-1] == r'errors_total{operation="a\"b\\c\nd"} 1'
+
+def test_registering_twice_returns_the_same_metric():
+    registry = MetricsRegistry()
+    counter = registry.counter('pages_total', 'Pages')
+    assert registry.counter('pages_total', 'Pages') is counter
+    assert registry.render().count('# TYPE pages_total counter') == 1
+
+def test_throughput_meter_counts_per_minute(monkeypatch):
+    import metrics
+    now = [0.0]
+    monkeypatch.setattr(metrics.time, 'monotonic', lambda: now[0])
+    registry = MetricsRegistry()
+    meter = ThroughputMeter(registry.gauge('matches_per_minute', 'Matches per minute', ('scraper',)), window=300)
+    for second in range(0, 120, 10):
+        now[0] = float(second)
+        meter.mark(scraper='match')
+    # 12 matches over 110 s
+    assert meter.gauge.value(scraper='match') == round(12 * 60 / 110, 2)
+
+def test_textfile_and_http_endpoint(tmp_path):
+    registry = registry_with_samples()
+    textfile = tmp_path / 'scraper.prom'
+    stop = start_exporters(registry, textfile=str(textfile), interval=3600)
+    stop()
+    assert textfile.read_text(encoding='utf-8') == registry.render()
+    assert not list(tmp_path.glob('*.tmp'))
+
+    server = serve_http(registry, 0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.headers['Content-Type'] == CONTENT_TYPE
+            assert response.read().decode('utf-8') == registry.render()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime
+
+from base_scraper import ScrapeResult
+from extraction import extract_tables_from_html, TableRecords
+from ndjson_stream import NdjsonWriter, encode_message, result_to_dict, result_from_dict, SCHEMA_VERSION
+from stat_record import TeamStats
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_stream_schema_and_sequence(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    writer = NdjsonWriter(path, source='test')
+    writer.start(season='2024-25')
+    writer.write_match({'match_id': 'aa01', 'attendance': float('nan'), 'home_team_stats': TeamStats({'goals': 2.0})})
+    writer.write_result(ScrapeResult(sport='NFL', data_type='team_stats', data=[{'team': 'KC'}],
+                                     timestamp=datetime(2024, 9, 1, 12), success=True), 'nfl')
+    writer.finish(success=True, matches=1)
+
+    start, match, result, end = read_lines(path)
+    assert start['type'] == 'start' and start['schema_version'] == SCHEMA_VERSION and start['season'] == '2024-25'
+    assert [line['seq'] for line in (start, match, result, end)] == [1, 2, 3, 4]
+    # NaN is not valid JSON - written as null
+    assert match['match']['attendance'] is None
+    assert match['match']['home_team_stats'] == {'goals': 2.0}
+    assert result['name'] == 'nfl' and result['result']['timestamp'] == '2024-09-01T12:00:00'
+    assert end == {**end, 'type': 'end', 'records': 2, 'success': True, 'matches': 1}
+
+def test_writer_stops_after_finish(tmp_path):
+    path = str(tmp_path / 'out.ndjson')
+    writer = NdjsonWriter(path)
+    writer.finish(success=False)
+    writer.write_match({'match_id': 'late'})
+    assert [line['type'] for line in read_lines(path)] == ['end']
+
+def test_result_round_trip_with_records():
+    data = extract_tables_from_html('<table id="t"><tbody><tr><td data-stat="a">1</td></tr></tbody></table>',
+                                    ['table#t'], compact=True)['table#t']
+    records = TableRecords(data['header'], data['rows'], data['missing'])
+    result = ScrapeResult(sport='NBA', data_type='player_stats', data=[{'players': records}],
+                          timestamp=datetime(2024, 1, 2), success=True)
+
+    message = json.loads(encode_message({'type': 'result', 'result': result_to_dict(result)}))
+    restored = result_from_dict(message['result'])
+    assert restored.data == [{'players': [{'a': '1'}]}]
+    assert restored.timestamp == datetime(2024, 1, 2) and restored.success
+
+def test_non_finite_floats_inside_records_become_null():
+    class Record(dict):
+        pass
+
+    message = {'type': 'match', 'values': (float('inf'), 1.5, True, None), 'nested': Record(xg=float('-inf')),
+               'seen': {float('nan')}}
+    assert json.loads(encode_message(message)) == {
+        'type': 'match', 'values': [None, 1.5, True, None], 'nested': {'xg': None}, 'seen': [None]
+    }
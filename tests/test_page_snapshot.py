@@ -0,0 +1,84 @@
+import asyncio
+
+from base_scraper import RateLimiter
+from nba_nhl_mlb_scrapers import NBAScraper
+
+TEAM_URL = 'https://www.basketball-reference.com/teams/BOS/2025.html'
+OTHER_URL = 'https://www.basketball-reference.com/teams/LAL/2025.html'
+
+TEAM_HTML = '''
+<h1>Boston Celtics</h1>
+<table id="roster"><tbody><tr><td data-stat="player"><a href="/players/t/tatumja01.html">Jayson Tatum</a></td></tr></tbody></table>
+'''
+
+class FakePage:
+    def __init__(self, html):
+        self.html = html
+
+    async def content(self):
+        return self.html
+
+class SnapshotScraper(NBAScraper):
+    """NBA scraper whose navigation swaps in a fake page and whose live extraction is counted."""
+
+    def __init__(self):
+        super().__init__(RateLimiter())
+        self.navigations = []
+        self.live_extractions = 0
+
+    async def navigate_to_url(self, url, wait_for_selector=None, page=None):
+        self.navigations.append(url)
+        self.page = FakePage(TEAM_HTML if url == TEAM_URL else '<p>other</p>')
+        self.current_url = url
+        return True
+
+    async def extract_tables(self, selectors, timeout=10000, payload="rows", typed=False):
+        self.live_extractions += 1
+        return {selector: [] for selector in selectors}
+
+def test_live_page_is_reused():
+    scraper = SnapshotScraper()
+
+    async def run():
+        first = await scraper.load_page(TEAM_URL)
+        second = await scraper.load_page(TEAM_URL)
+        await second.extract_table('table#roster')
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert scraper.navigations == [TEAM_URL]
+    assert scraper.live_extractions == 1
+
+def test_page_without_html_is_loaded_again_after_navigating_away():
+    scraper = SnapshotScraper()
+
+    async def run():
+        snapshot = await scraper.load_page(TEAM_URL)
+        await scraper.navigate_to_url(OTHER_URL)
+        assert not snapshot.is_live()
+        # Neither live DOM nor HTML left - the snapshot reloads before extracting
+        await snapshot.extract_table('table#roster')
+        return snapshot
+
+    snapshot = asyncio.run(run())
+    assert scraper.navigations == [TEAM_URL, OTHER_URL, TEAM_URL]
+    assert snapshot.is_live() and scraper.live_extractions == 1
+
+def test_kept_html_serves_extractors_after_navigating_away():
+    scraper = SnapshotScraper()
+
+    async def run():
+        snapshot = await scraper.load_page(TEAM_URL, keep_html=True)
+        await scraper.navigate_to_url(OTHER_URL)
+        again = await scraper.load_page(TEAM_URL)
+        roster = await again.extract_table('table#roster')
+        links = await again.extract_links('table#roster a', 'https://www.basketball-reference.com')
+        return snapshot, again, roster, links
+
+    snapshot, again, roster, links = asyncio.run(run())
+    assert again is snapshot
+    assert scraper.navigations == [TEAM_URL, OTHER_URL]
+    assert scraper.live_extractions == 0
+    assert roster == [{'player': 'Jayson Tatum'}]
+    assert links == ['https://www.basketball-reference.com/players/t/tatumja01.html']
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+
+from base_scraper import AdaptiveRateLimiter
+
+FBREF = 'https://fbref.com/en/matches/aa01/Bayern-Munich-Wolfsburg'
+KICKER = 'https://www.kicker.de/bundesliga/tabelle/2024-25/3'
+
+def limiter(**kwargs):
+    options = dict(requests_per_minute=30, max_requests_per_minute=60, initial_concurrency=4, max_concurrency=4)
+    options.update(kwargs)
+    return AdaptiveRateLimiter(**options)
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttle_halves_rate_and_concurrency(status):
+    rate_limiter = limiter()
+    budget = rate_limiter._budget(FBREF)
+    asyncio.run(rate_limiter.release(FBREF, status=status))
+    assert budget.rate == pytest.approx(0.25)
+    assert budget.concurrency == 2.0
+    assert budget.throttled == 1
+    assert rate_limiter.concurrency_limit(FBREF) == 2
+
+def test_decrease_keeps_one_worker_and_the_minimum_rate():
+    rate_limiter = limiter(requests_per_minute=1, initial_concurrency=1)
+    budget = rate_limiter._budget(FBREF)
+    for _ in range(5):
+        asyncio.run(rate_limiter.release(FBREF, status=429))
+    assert budget.limit == 1
+    assert budget.rate == pytest.approx(rate_limiter.min_rate)
+
+def test_retry_after_blocks_the_host():
+    rate_limiter = limiter()
+    budget = rate_limiter._budget(FBREF)
+    asyncio.run(rate_limiter.release(FBREF, status=429, retry_after="120"))
+    assert budget.blocked_until - time.monotonic() == pytest.approx(120, abs=1)
+    assert rate_limiter.snapshot()['fbref.com']['blocked_for'] == pytest.approx(120, abs=1)
+
+def test_retry_after_http_date():
+    assert AdaptiveRateLimiter._parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert AdaptiveRateLimiter._parse_retry_after("soon") is None
+
+def test_successes_increase_additively_up_to_the_maximum():
+    rate_limiter = limiter(requests_per_minute=10, initial_concurrency=1)
+    budget = rate_limiter._budget(FBREF)
+    asyncio.run(rate_limiter.release(FBREF, status=200, latency=1.0))
+    assert budget.rate * 60 == pytest.approx(11)
+    assert budget.concurrency == pytest.approx(1.25)
+
+    for _ in range(200):
+        asyncio.run(rate_limiter.release(FBREF, status=200, latency=1.0))
+    assert budget.rate * 60 == pytest.approx(60)
+    assert budget.concurrency == pytest.approx(4)
+
+def test_slow_answer_backs_off():
+    rate_limiter = limiter()
+    budget = rate_limiter._budget(FBREF)
+    asyncio.run(rate_limiter.release(FBREF, status=200, latency=30.0))
+    assert budget.concurrency == 2.0
+    assert budget.successes == 1
+
+def test_budgets_are_per_host():
+    rate_limiter = limiter()
+    asyncio.run(rate_limiter.release(FBREF, status=429, retry_after="60"))
+    kicker = rate_limiter._budget(KICKER)
+    assert kicker.concurrency == 4
+    assert kicker.blocked_until == 0.0
+    assert rate_limiter.concurrency_limit(KICKER) == 4
+    assert set(rate_limiter.snapshot()) == {'fbref.com', 'www.kicker.de'}
+
+def test_acquire_waits_for_a_free_slot():
+    rate_limiter = limiter(requests_per_minute=6000, max_requests_per_minute=6000, initial_concurrency=1)
+
+    async def run():
+        await rate_limiter.acquire(FBREF)
+        second = asyncio.create_task(rate_limiter.acquire(FBREF))
+        await asyncio.sleep(0.05)
+        assert not second.done()
+        await rate_limiter.release(FBREF, status=200)
+        await asyncio.wait_for(second, 1)
+
+    asyncio.run(run())
+    assert rate_limiter._budget(FBREF).in_flight == 1
+
+def test_cancel_while_pacing_gives_the_slot_back():
+    rate_limiter = limiter()
+    budget = rate_limiter._budget(FBREF)
+
+    async def run():
+        budget.blocked_until = time.monotonic() + 60
+        task = asyncio.create_task(rate_limiter.acquire(FBREF))
+        await asyncio.sleep(0.05)
+        assert budget.in_flight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert budget.in_flight == 0
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from match_index import MatchIndex
+from revalidation import RevalidationScheduler, stats_digest, changed_stats, content_hash
+
+MATCH_HTML = '''
+<table id="stats_abc_summary">
+  <tbody><tr><td data-stat="player">Kane</td><td data-stat="xg">0.8</td></tr></tbody>
+  <tfoot><tr><td data-stat="xg">1.9</td></tr></tfoot>
+</table>
+<table id="shots_all"><tbody><tr><td data-stat="xg">0.8</td></tr></tbody></table>
+<!--
+<table id="keeper_stats_abc"><tbody><tr><td data-stat="saves">3</td></tr></tbody></table>
+-->
+'''
+
+def test_digest_covers_stat_tables_only():
+    digest = stats_digest(MATCH_HTML)
+    assert set(digest) == {'stats_abc_summary', 'keeper_stats_abc'}
+    assert set(digest['stats_abc_summary']) == {'player', 'xg'}
+
+def test_changed_stats_names_moved_columns():
+    old = stats_digest(MATCH_HTML)
+    new = stats_digest(MATCH_HTML.replace('1.9', '2.1'))
+    assert changed_stats(old, new) == {'stats_abc_summary': ['xg']}
+    assert changed_stats(old, stats_digest(MATCH_HTML)) == {}
+    assert changed_stats(None, new) == {}
+    assert content_hash(old) != content_hash(new)
+
+def _index(tmp_path):
+    index = MatchIndex(str(tmp_path / 'index.json'))
+    index.update_from_schedule([
+        {'url': 'https://fbref.com/en/matches/aa01/A-B', 'matchday': 1, 'date': '2024-08-23', 'score': '2–1'},
+        {'url': 'https://fbref.com/en/matches/aa02/C-D', 'matchday': 1, 'date': '2024-08-24', 'score': '0–0'},
+    ], 'https://fbref.com/s')
+    index.mark_scraped('aa01')
+    # Scraped on match day, right after the final whistle
+    index.entries['aa01']['last_scraped_at'] = datetime(2024, 8, 23, 22).isoformat()
+    return index
+
+def test_only_scraped_matches_are_due(tmp_path):
+    scheduler = RevalidationScheduler(_index(tmp_path))
+    assert scheduler.due(datetime(2024, 8, 23, 12)) == []
+    assert [m['match_id'] for m in scheduler.due(datetime(2024, 8, 24, 0))] == ['aa01']
+
+def test_checks_follow_the_day_steps(tmp_path):
+    index = _index(tmp_path)
+    scheduler = RevalidationScheduler(index)
+
+    scheduler.record_check('aa01', datetime(2024, 8, 24, 6))
+    assert scheduler.next_check(index.entries['aa01']) == datetime(2024, 8, 26)
+
+    # A late run covers every check due in the meantime
+    scheduler.record_check('aa01', datetime(2024, 8, 28))
+    assert scheduler.next_check(index.entries['aa01']) == datetime(2024, 8, 30)
+
+    scheduler.record_check('aa01', datetime(2024, 8, 30, 1))
+    assert scheduler.next_check(index.entries['aa01']) is None
+    assert scheduler.due(datetime(2024, 12, 1)) == []
+
+def test_match_scraped_long_after_kickoff_is_not_due(tmp_path):
+    index = _index(tmp_path)
+    # Historic crawl: scraped months after the match - every check day lies before the scrape
+    index.entries['aa01']['last_scraped_at'] = datetime(2025, 1, 10).isoformat()
+    scheduler = RevalidationScheduler(index)
+    assert scheduler.next_check(index.entries['aa01']) is None
+    assert scheduler.due(datetime(2025, 1, 11)) == []
+
+def test_scrape_between_checks_skips_the_covered_ones(tmp_path):
+    index = _index(tmp_path)
+    index.entries['aa01']['last_scraped_at'] = datetime(2024, 8, 27).isoformat()
+    scheduler = RevalidationScheduler(index)
+    # Day 1 and day 3 checks were covered by the scrape on day 4, only day 7 is left
+    assert scheduler.next_check(index.entries['aa01']) == datetime(2024, 8, 30)
+    scheduler.record_check('aa01', datetime(2024, 8, 30, 1))
+    assert scheduler.next_check(index.entries['aa01']) is None
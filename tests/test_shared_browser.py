@@ -0,0 +1,93 @@
+import asyncio
+
+from base_scraper import RateLimiter
+from nba_nhl_mlb_scrapers import NBAScraper, NHLScraper
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    async def add_init_script(self, script):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self, storage_state):
+        self.storage_state_in = storage_state
+        self.closed = False
+
+    async def new_page(self):
+        return FakePage()
+
+    async def storage_state(self):
+        return {'cookies': [{'name': 'consent', 'value': str(id(self))}], 'origins': []}
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    """Stands in for the Chromium that main.py launches once for all sports."""
+
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    async def new_context(self, storage_state=None, **options):
+        self.contexts.append(FakeContext(storage_state))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.closed = True
+
+def test_each_sport_gets_its_own_context_on_the_shared_browser():
+    browser = FakeBrowser()
+    nba, nhl = NBAScraper(RateLimiter()), NHLScraper(RateLimiter())
+
+    async def run():
+        for scraper in (nba, nhl):
+            scraper.use_shared_browser(browser)
+            await scraper.initialize_browser()
+
+    asyncio.run(run())
+    assert len(browser.contexts) == 2
+    assert nba.context is not nhl.context
+    assert (nba.browser, nhl.browser) == (browser, browser)
+    # No own Playwright driver or Chromium for orchestrated scrapers
+    assert nba.playwright is None and nhl.playwright is None
+
+def test_closing_a_sport_keeps_the_browser_and_its_cookies():
+    browser = FakeBrowser()
+    nba, nhl = NBAScraper(RateLimiter()), NHLScraper(RateLimiter())
+
+    async def run():
+        for scraper in (nba, nhl):
+            scraper.use_shared_browser(browser)
+            await scraper.initialize_browser()
+        nba_context = nba.context
+        await nba.close_browser()
+        return nba_context
+
+    nba_context = asyncio.run(run())
+    assert nba_context.closed and not nhl.context.closed
+    assert not browser.closed
+    assert nba.storage_state == {'cookies': [{'name': 'consent', 'value': str(id(nba_context))}], 'origins': []}
+
+def test_next_context_starts_from_the_stored_cookies():
+    browser = FakeBrowser()
+    scraper = NBAScraper(RateLimiter())
+    scraper.use_shared_browser(browser)
+
+    async def run():
+        await scraper.initialize_browser()
+        await scraper.close_browser()
+        await scraper.initialize_browser()
+
+    asyncio.run(run())
+    first, second = browser.contexts
+    assert first.storage_state_in is None
+    assert second.storage_state_in == scraper.storage_state
@@ -0,0 +1,84 @@
+from standings import StandingsEngine, parse_score, positions_before_matchdays
+
+def match(matchday, home, away, score, date=None):
+    return {'matchday': matchday, 'home_team': home, 'away_team': away, 'score': score, 'date': date}
+
+def test_parse_score():
+    assert parse_score('2–1') == (2, 1)
+    assert parse_score('0-0') == (0, 0)
+    assert parse_score('(4) 1–1 (3)') == (1, 1)
+    assert parse_score('') is None
+    assert parse_score(None) is None
+    assert parse_score('Match Postponed') is None
+
+def test_points_then_goal_difference_then_goals():
+    engine = StandingsEngine()
+    engine.add_result('A', 'X', 3, 0)   # A: 3 pts, +3, 3 goals
+    engine.add_result('B', 'Y', 4, 1)   # B: 3 pts, +3, 4 goals
+    engine.add_result('C', 'Z', 1, 0)   # C: 3 pts, +1
+    engine.add_result('D', 'W', 1, 1)   # D: 1 pt
+    assert [r.team for r in engine.ranking()][:3] == ['B', 'A', 'C']
+
+def test_head_to_head_breaks_tie_on_points_goal_difference_and_goals():
+    engine = StandingsEngine()
+    # A and B both end on 3 points, goal difference 0 and 3 goals - A won the direct game
+    engine.add_result('A', 'B', 2, 1)
+    engine.add_result('B', 'C', 1, 0)
+    engine.add_result('C', 'A', 1, 0)
+    engine.add_result('D', 'A', 1, 1)
+    engine.add_result('B', 'D', 1, 1)
+    a, b = engine.records['A'], engine.records['B']
+    assert (a.points, a.goal_difference, a.goals_for) == (4, 0, 3)
+    assert (b.points, b.goal_difference, b.goals_for) == (4, 0, 3)
+    ranking = [r.team for r in engine.ranking()]
+    assert ranking.index('A') < ranking.index('B')
+
+def test_head_to_head_away_goals():
+    engine = StandingsEngine()
+    # Level overall and level on head-to-head points/difference: B scored more away goals against A
+    engine.add_result('A', 'B', 1, 2)
+    engine.add_result('B', 'A', 0, 1)
+    a, b = engine.records['A'], engine.records['B']
+    assert (a.points, a.goal_difference, a.goals_for) == (b.points, b.goal_difference, b.goals_for)
+    assert [r.team for r in engine.ranking()] == ['B', 'A']
+
+def test_positions_before_first_game_are_all_one():
+    positions = positions_before_matchdays([match(1, 'A', 'B', '', '2024-08-23')])
+    assert positions == {1: {'A': 1, 'B': 1}}
+
+def test_positions_before_matchdays_in_one_pass():
+    positions = positions_before_matchdays([
+        match(1, 'A', 'B', '2–0', '2024-08-23'),
+        match(1, 'C', 'D', '1–1', '2024-08-24'),
+        match(2, 'B', 'C', '0–3', '2024-08-30'),
+        match(2, 'D', 'A', '', '2024-08-31'),
+    ])
+    assert positions[1] == {'A': 1, 'B': 1, 'C': 1, 'D': 1}
+    # C and D are level and drew each other - D's away goal puts it ahead
+    assert positions[2] == {'A': 1, 'D': 2, 'C': 3, 'B': 4}
+
+def test_postponed_game_counts_when_it_was_played():
+    schedule = [
+        match(1, 'A', 'B', '0–1', '2024-08-23'),
+        match(1, 'C', 'D', '3–0', '2024-10-02'),  # postponed from matchday 1, played after matchday 3 started
+        match(2, 'B', 'C', '1–1', '2024-08-30'),
+        match(2, 'D', 'A', '0–0', '2024-08-31'),
+        match(3, 'A', 'C', '1–0', '2024-09-14'),
+        match(3, 'B', 'D', '0–2', '2024-09-14'),
+        match(4, 'C', 'A', '', '2024-10-05'),
+        match(4, 'D', 'B', '', '2024-10-05'),
+    ]
+    positions = positions_before_matchdays(schedule)
+    # Before matchday 2 only B's win counts; C/D's game was not played yet
+    assert positions[2]['B'] == 1 and positions[2]['A'] == 4
+    # Before matchday 3: B 4 pts, C 1 pt (1 goal), D 1 pt (0 goals), A 1 pt (-1)
+    assert positions[3] == {'B': 1, 'C': 2, 'D': 3, 'A': 4}
+    # Before matchday 4 the postponed 3-0 has been played and lifts C to the top
+    assert positions[4]['C'] == 1
+
+def test_undated_schedule_groups_by_matchday():
+    positions = positions_before_matchdays([
+        match(1, 'A', 'B', '1–0'),
+        match(2, 'B', 'A', '2–0'),
+    ])
+    assert positions[2] == {'A': 1, 'B': 2}
@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from stat_record import StatSchema, TeamStats, sum_stats
+
+def test_numbers_get_fixed_slots_and_missing_stays_nan():
+    schema = StatSchema(['goals', 'shots'])
+    stats = TeamStats({'shots': 12, 'xg': 1.4}, schema=schema)
+    assert schema.names == ['goals', 'shots', 'xg']
+    assert math.isnan(stats.values[0]) and list(stats.values[1:]) == [12.0, 1.4]
+    assert 'goals' not in stats and stats.get('goals') is None
+    assert dict(stats) == {'shots': 12.0, 'xg': 1.4}
+
+    del stats['shots']
+    assert math.isnan(stats.values[1]) and len(stats) == 1
+    with pytest.raises(KeyError):
+        stats['shots']
+
+def test_record_created_before_the_schema_grew():
+    schema = StatSchema(['goals'])
+    old = TeamStats({'goals': 1}, schema=schema)
+    TeamStats({'corners': 5}, schema=schema)
+    old['corners'] = 3
+    assert dict(old) == {'goals': 1.0, 'corners': 3.0}
+
+def test_text_values_stay_out_of_the_schema():
+    schema = StatSchema(['goals'])
+    stats = TeamStats({'goals': 2, 'keeper_nationality': 'GER'}, schema=schema)
+    assert schema.names == ['goals']
+    assert len(stats.values) == 1
+    assert stats['keeper_nationality'] == 'GER'
+    assert dict(stats) == {'goals': 2.0, 'keeper_nationality': 'GER'}
+
+    # Switching a stat between text and number keeps a single value
+    stats['goals'] = 'n/a'
+    assert stats['goals'] == 'n/a' and math.isnan(stats.values[0])
+    stats['goals'] = 3
+    assert stats['goals'] == 3.0 and 'goals' not in stats.text
+
+    stats['keeper_nationality'] = None
+    assert 'keeper_nationality' not in stats
+
+def test_none_and_bool_are_not_numbers():
+    schema = StatSchema()
+    stats = TeamStats({'goals': None, 'home': True}, schema=schema)
+    assert 'goals' not in stats
+    assert stats['home'] is True and schema.names == []
+
+def test_sum_stats_adds_numeric_columns_only():
+    schema = StatSchema()
+    records = [
+        TeamStats({'goals': 2, 'xg': 1.5, 'keeper_nationality': 'GER'}, schema=schema),
+        {'goals': 1, 'xg': 0.5, 'formation': '4-4-2', 'captain': True},
+        None,
+        TeamStats({'corners': 4}, schema=schema)
+    ]
+    assert sum_stats(records) == {'goals': 3.0, 'xg': 2.0, 'corners': 4.0}
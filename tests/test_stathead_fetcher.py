@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+
+from cache_policy import CachePolicyEngine
+from stathead_fetcher import StatheadFetcher, QueryResultCache, TinyUrlCache, strip_offset, offset_url
+
+QUERY = 'https://stathead.com/basketball/player-game-finder.cgi?request=1&order_by=pts&offset=200'
+
+def test_strip_offset_keeps_other_parameters():
+    assert strip_offset(QUERY) == 'https://stathead.com/basketball/player-game-finder.cgi?request=1&order_by=pts'
+    assert strip_offset('https://stathead.com/x.cgi') == 'https://stathead.com/x.cgi'
+
+def test_offset_url_replaces_offset():
+    query = dict(parse_qsl(urlparse(offset_url(QUERY, 400)).query))
+    assert query == {'request': '1', 'order_by': 'pts', 'offset': '400'}
+    assert strip_offset(offset_url(strip_offset(QUERY), 200)) == strip_offset(QUERY)
+
+def test_query_cache_round_trip_and_expiry(tmp_path):
+    cache = QueryResultCache(str(tmp_path), max_age_hours=12)
+    key = strip_offset(QUERY)
+    assert cache.get(key) is None
+    cache.put(key, [{'player': 'A', 'pts': '30'}], total=1)
+    assert cache.get(key) == [{'player': 'A', 'pts': '30'}]
+
+    expired = QueryResultCache(str(tmp_path), max_age_hours=0)
+    assert expired.get(key) is None
+    later = QueryResultCache(str(tmp_path), policy=CachePolicyEngine(now_fn=lambda: datetime.now() + timedelta(hours=13)))
+    assert later.get(key) is None
+
+def test_tiny_url_cache(tmp_path):
+    path = str(tmp_path / 'tiny.json')
+    tiny = TinyUrlCache(path)
+    assert TinyUrlCache.is_tiny('https://stathead.com/tiny/AbC12')
+    assert not TinyUrlCache.is_tiny(QUERY)
+    tiny.store('https://stathead.com/tiny/AbC12', strip_offset(QUERY))
+    assert TinyUrlCache(path).resolve('https://stathead.com/tiny/AbC12') == strip_offset(QUERY)
+    tiny.forget('https://stathead.com/tiny/AbC12')
+    assert TinyUrlCache(path).resolve('https://stathead.com/tiny/AbC12') is None
+
+class FakeScraper:
+    """Serves QUERY_PAGE_SCRIPT results by URL instead of loading pages."""
+
+    class rate_limiter:
+        max_concurrency = 1
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.page = None
+        self.url = None
+
+    async def _open_query(self, url):
+        self.url = url
+        self.page = type('Page', (), {'url': url})()
+        return True
+
+    async def _load_query_page(self, url, page=None):
+        self.url = url
+        return self.pages.get(url) != 'login'
+
+    async def new_page(self):
+        return type('Page', (), {'close': lambda self: asyncio.sleep(0)})()
+
+    async def traced_evaluate(self, page, name, script, args):
+        return self.pages[self.url]
+
+def test_follow_next_collects_all_pages():
+    scraper = FakeScraper({
+        'p2': {'rows': [{'n': 2}], 'total': None, 'nextUrl': 'p3'},
+        'p3': {'rows': [{'n': 3}], 'total': None, 'nextUrl': None},
+    })
+    assert asyncio.run(StatheadFetcher(scraper)._follow_next('p2')) == [{'n': 2}, {'n': 3}]
+
+def test_follow_next_reports_missing_table():
+    scraper = FakeScraper({'p2': {'rows': [{'n': 2}], 'total': None, 'nextUrl': 'p3'}, 'p3': None})
+    with pytest.raises(ValueError, match='No results table at p3'):
+        asyncio.run(StatheadFetcher(scraper)._follow_next('p2'))
+
+def test_missing_result_count_is_logged(caplog):
+    scraper = FakeScraper({
+        QUERY: {'rows': [{'n': 1}], 'total': None, 'nextUrl': 'p2'},
+        'p2': {'rows': [{'n': 2}], 'total': None, 'nextUrl': None},
+    })
+    with caplog.at_level(logging.WARNING, logger='stathead_fetcher'):
+        rows, query_url, cached = asyncio.run(StatheadFetcher(scraper).fetch(QUERY))
+    assert rows == [{'n': 1}, {'n': 2}]
+    assert (query_url, cached) == (strip_offset(QUERY), False)
+    assert 'No result count' in caplog.text
+
+def test_offset_pages_fail_when_the_login_is_not_renewed():
+    scraper = FakeScraper({
+        QUERY: {'rows': [{'n': 1}], 'total': 3, 'nextUrl': None},
+        offset_url(QUERY, 1): {'rows': [{'n': 2}], 'total': 3, 'nextUrl': None},
+        offset_url(QUERY, 2): 'login',
+    })
+    with pytest.raises(PermissionError):
+        asyncio.run(StatheadFetcher(scraper).fetch(QUERY))
+
+class LoginPage:
+    """Shows the login form if it was loaded before the scraper logged in."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.logged_in = False
+
+    async def query_selector(self, selector):
+        return 'table' if self.logged_in else None
+
+def stathead_scraper(login_succeeds=True):
+    from base_scraper import RateLimiter
+    from stathead_scraper import StatheadBasketballScraper
+
+    scraper = StatheadBasketballScraper(RateLimiter())
+    scraper.logins = 0
+    scraper.loads = []
+
+    async def navigate_to_url(url, wait_for_selector=None, page=None):
+        scraper.loads.append((url, wait_for_selector))
+        page.logged_in = scraper.logins > 0
+        await asyncio.sleep(0.01)
+
+    async def authenticate():
+        if login_succeeds:
+            scraper.logins += 1
+            scraper._session_saved_at = scraper.logins
+        return login_succeeds
+
+    scraper.navigate_to_url = navigate_to_url
+    scraper.authenticate = authenticate
+    scraper.page = LoginPage(scraper)
+    return scraper
+
+def test_expired_session_on_offset_pages_logs_in_once():
+    scraper = stathead_scraper()
+    pages = [LoginPage(scraper) for _ in range(3)]
+
+    async def run():
+        return await asyncio.gather(*(scraper._load_query_page(f"offset-{i}", page=page)
+                                      for i, page in enumerate(pages)))
+
+    assert asyncio.run(run()) == [True, True, True]
+    assert scraper.logins == 1
+    # Every page was loaded again after the login
+    assert sorted(url for url, selector in scraper.loads if selector == 'table#stats') == ['offset-0', 'offset-1', 'offset-2']
+
+def test_failed_login_is_reported():
+    scraper = stathead_scraper(login_succeeds=False)
+    assert asyncio.run(scraper._load_query_page("offset-0")) is False
+    assert not scraper.is_authenticated
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from stathead_session import StatheadSession
+
+def state(expires=-1, domain='.stathead.com'):
+    return {'cookies': [{'name': 'sr_session', 'value': 'abc', 'domain': domain, 'expires': expires}], 'origins': []}
+
+def test_saved_session_is_loaded_for_the_same_user(tmp_path):
+    session = StatheadSession(str(tmp_path / 'session.json'))
+    assert session.load('ben') is None
+    session.save(state(), 'ben')
+
+    other = StatheadSession(str(tmp_path / 'session.json'))
+    assert other.load('ben') == state()
+    assert other.saved_at == session.saved_at
+    assert other.load('someone-else') is None
+
+def test_old_sessions_expire(tmp_path):
+    path = tmp_path / 'session.json'
+    StatheadSession(str(path)).save(state(), 'ben')
+    data = json.loads(path.read_text())
+    data['saved_at'] = (datetime.now() - timedelta(hours=25)).isoformat()
+    path.write_text(json.dumps(data))
+
+    assert StatheadSession(str(path), max_age_hours=24).load('ben') is None
+    assert StatheadSession(str(path), max_age_hours=48).load('ben') == state()
+
+def test_expired_or_foreign_cookies_are_not_a_session(tmp_path):
+    session = StatheadSession(str(tmp_path / 'session.json'))
+    session.save(state(expires=time.time() - 60), 'ben')
+    assert session.load('ben') is None
+    session.save(state(domain='.sports-reference.com'), 'ben')
+    assert session.load('ben') is None
+    session.save(state(expires=time.time() + 3600), 'ben')
+    assert session.load('ben') is not None
+
+def test_invalidate_removes_the_stored_state(tmp_path):
+    path = tmp_path / 'session.json'
+    session = StatheadSession(str(path))
+    session.save(state(), 'ben')
+    session.invalidate()
+    assert not path.exists() and session.saved_at is None
+    assert session.load('ben') is None
+    session.invalidate()  # nothing stored - no error
+
+def test_unreadable_file_means_no_session(tmp_path):
+    path = tmp_path / 'session.json'
+    path.write_text('{not json')
+    assert StatheadSession(str(path)).load('ben') is None
+
+class FakeContext:
+    def __init__(self):
+        self.cookies = []
+
+    async def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+def test_login_of_another_scraper_is_reused(tmp_path):
+    from base_scraper import RateLimiter
+    from stathead_scraper import StatheadBasketballScraper, StatheadNHLScraper
+
+    session = StatheadSession(str(tmp_path / 'session.json'))
+    first, second = StatheadBasketballScraper(RateLimiter()), StatheadNHLScraper(RateLimiter())
+    logins = []
+
+    async def login():
+        logins.append(first)
+        session.save(state(), first.username)
+        first._session_saved_at = session.saved_at
+        return True
+
+    for scraper in (first, second):
+        scraper.session = session
+        scraper.context = FakeContext()
+    first._login = login
+
+    async def run():
+        return await first.authenticate(), await second.authenticate()
+
+    assert asyncio.run(run()) == (True, True)
+    assert logins == [first]
+    assert second.context.cookies == state()['cookies']
+    assert second.is_authenticated
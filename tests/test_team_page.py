@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+
+from base_scraper import RateLimiter, ScrapeResult
+from nba_nhl_mlb_scrapers import NBAScraper
+
+class CountingScraper(NBAScraper):
+    """NBA scraper whose team page load is replaced by a counter."""
+
+    def __init__(self, success=True):
+        super().__init__(RateLimiter())
+        self.loads = []
+        self.success = success
+
+    async def scrape_team_page(self, team_url):
+        self.loads.append(team_url)
+        return tuple(
+            ScrapeResult(sport="NBA", data_type=data_type, data=[{"url": team_url, "load": len(self.loads)}],
+                         timestamp=datetime.now(), success=self.success)
+            for data_type in ("team_stats", "player_stats")
+        )
+
+def test_team_and_player_stats_share_one_load():
+    scraper = CountingScraper()
+
+    async def run():
+        return await scraper.scrape_team_stats("/teams/BOS"), await scraper.scrape_player_stats("/teams/BOS")
+
+    team_stats, player_stats = asyncio.run(run())
+    assert scraper.loads == ["/teams/BOS"]
+    assert (team_stats.data_type, player_stats.data_type) == ("team_stats", "player_stats")
+    assert scraper.team_page_rest is None
+
+def test_kept_result_is_handed_out_once():
+    scraper = CountingScraper()
+
+    async def run():
+        await scraper.scrape_player_stats("/teams/BOS")
+        await scraper.scrape_team_stats("/teams/BOS")
+        # Both halves were used - the next request loads the page again
+        return await scraper.scrape_team_stats("/teams/BOS")
+
+    again = asyncio.run(run())
+    assert scraper.loads == ["/teams/BOS", "/teams/BOS"]
+    assert again.data[0]["load"] == 2
+
+def test_other_team_or_failed_load_is_not_reused():
+    scraper = CountingScraper()
+
+    async def run():
+        await scraper.scrape_team_stats("/teams/BOS")
+        await scraper.scrape_player_stats("/teams/LAL")
+
+    asyncio.run(run())
+    assert scraper.loads == ["/teams/BOS", "/teams/LAL"]
+
+    failing = CountingScraper(success=False)
+
+    async def run_failing():
+        await failing.scrape_team_stats("/teams/BOS")
+        await failing.scrape_player_stats("/teams/BOS")
+
+    asyncio.run(run_failing())
+    assert failing.loads == ["/teams/BOS", "/teams/BOS"]
+
+class SharedRowsScraper(CountingScraper):
+    """Team and player results built from the same row list, like the real team pages."""
+
+    async def scrape_team_page(self, team_url):
+        self.loads.append(team_url)
+        per_game = [{"player": "Tatum", "pts": 26.9}]
+        return (
+            ScrapeResult(sport="NBA", data_type="team_stats", data=[{"stats": per_game}],
+                         timestamp=datetime.now(), success=True),
+            ScrapeResult(sport="NBA", data_type="player_stats", data=[{"players": per_game}],
+                         timestamp=datetime.now(), success=True)
+        )
+
+def test_results_do_not_share_rows():
+    scraper = SharedRowsScraper()
+
+    async def run():
+        return await scraper.scrape_team_stats("/teams/BOS"), await scraper.scrape_player_stats("/teams/BOS")
+
+    team_stats, player_stats = asyncio.run(run())
+    team_stats.data[0]["stats"][0]["pts"] = 0
+    team_stats.data[0]["stats"].append({"player": "Team Totals"})
+    assert player_stats.data == [{"players": [{"player": "Tatum", "pts": 26.9}]}]
@@ -0,0 +1,119 @@
+"""
+Tracing - Laufzeit-Spans im Chrome Trace-Event-Format
+Zeichnet Spans (Navigation, Consent, evaluate-Aufrufe, Kicker, Export) pro Worker auf und schreibt
+eine JSON-Datei, die sich in Perfetto (ui.perfetto.dev) oder chrome://tracing öffnen lässt.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Lane (trace "thread") of the current asyncio task, e.g. "worker-2"
+_lane: contextvars.ContextVar[str] = contextvars.ContextVar('trace_lane', default='main')
+
+class Tracer:
+    """
+    Collects complete events ("ph": "X") with microsecond timestamps. Each asyncio task can pick its
+    own lane via set_lane(), so concurrent workers show up as separate tracks. Disabled tracers
+    skip all bookkeeping; span() then costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self.lanes: Dict[str, int] = {}
+        self.pid = os.getpid()
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
+
+    def _tid(self, lane: str) -> int:
+        tid = self.lanes.get(lane)
+        if tid is None:
+            with self._lock:
+                tid = self.lanes.setdefault(lane, len(self.lanes) + 1)
+        return tid
+
+    @staticmethod
+    def set_lane(name: str):
+        _lane.set(name)
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'scrape', **args):
+        if not self.enabled:
+            yield
+            return
+        lane = _lane.get()
+        start = self._now_us()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            event = {'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': self._now_us() - start,
+                     'pid': self.pid, 'tid': self._tid(lane), 'args': {'lane': lane, **args}}
+            if error:
+                event['args']['error'] = error
+            self.events.append(event)
+
+    def instant(self, name: str, cat: str = 'scrape', **args):
+        if self.enabled:
+            self.events.append({'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': self._now_us(),
+                                'pid': self.pid, 'tid': self._tid(_lane.get()), 'args': args})
+
+    def counter(self, name: str, **values):
+        """Counter track (e.g. queue depth), drawn as a graph above the lanes."""
+        if self.enabled:
+            self.events.append({'name': name, 'ph': 'C', 'ts': self._now_us(), 'pid': self.pid, 'args': values})
+
+    def save(self, path: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': 'scraper'}}]
+        metadata += [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': lane}}
+            for lane, tid in self.lanes.items()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f, default=str)
+        logger.info(f"Trace with {len(self.events)} events written to {path}")
+        return path
+
+def traced(name: str, cat: str = 'scrape', arg_names: tuple = ()):
+    """Decorator for async methods: one span per call, with the named keyword/positional arguments."""
+    def decorator(func):
+        code = func.__code__
+        positional = code.co_varnames[:code.co_argcount]
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return await func(*args, **kwargs)
+            span_args = {}
+            for arg_name in arg_names:
+                if arg_name in kwargs:
+                    span_args[arg_name] = kwargs[arg_name]
+                elif arg_name in positional and positional.index(arg_name) < len(args):
+                    span_args[arg_name] = args[positional.index(arg_name)]
+            with TRACER.span(name, cat, **span_args):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Process-wide tracer, enabled by the entry points when a trace file is requested
+TRACER = Tracer()